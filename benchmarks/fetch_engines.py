@@ -0,0 +1,120 @@
+"""
+Compares the sync and async fetch engines against the local fake eBay server.
+
+    uv run python benchmarks/fetch_engines.py --categories 8 --latency-seconds 0.05
+
+Every run starts from an empty temporary DB, so each engine inserts the same items.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import typer
+
+from ebay_watchlist.cli import main as cli_main
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.repositories import CategoryRepository, SellerRepository
+from ebay_watchlist.db.utils import create_tables
+from ebay_watchlist.ebay.fake_server import (
+    FAKE_CATEGORIES,
+    FakeEbayConfig,
+    FakeEbayServer,
+)
+
+
+def _run_engine(
+    db_path: Path,
+    engine: str,
+    categories: int,
+    sellers: int,
+    limit: int,
+    max_pages: int,
+    concurrency: int,
+    max_in_flight: int,
+) -> tuple[float, int]:
+    database.init(str(db_path))
+    database.connect(reuse_if_open=True)
+    create_tables()
+    for seller_index in range(sellers):
+        SellerRepository.add_seller(f"bench_seller_{seller_index}")
+    category_ids = [category[0] for category in FAKE_CATEGORIES]
+    for category_index in range(categories):
+        # Unknown ids are fine, the fake server names them generically.
+        category_id = (
+            category_ids[category_index]
+            if category_index < len(category_ids)
+            else 900_000 + category_index
+        )
+        CategoryRepository.add_category(category_id)
+
+    # Rendering thousands of new rows as a rich table would dwarf the fetch itself.
+    cli_main.display_db_items = lambda items: None
+    started_at = perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        new_items_by_category = cli_main.fetch_updates(
+            limit=limit,
+            concurrency=concurrency,
+            max_pages=max_pages,
+            engine=engine,
+            max_in_flight=max_in_flight,
+        )
+    elapsed_seconds = perf_counter() - started_at
+    database.close()
+    return elapsed_seconds, sum(new_items_by_category.values())
+
+
+def main(
+    categories: int = 8,
+    sellers: int = 120,
+    items_per_seller: int = 20,
+    limit: int = 100,
+    max_pages: int = 10,
+    latency_seconds: float = 0.05,
+    concurrency: int = 4,
+    max_in_flight: int = 16,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+):
+    config = FakeEbayConfig(
+        latency_seconds=latency_seconds,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+        retry_after_seconds=0,
+        items_per_seller=items_per_seller,
+    )
+    with FakeEbayServer(config) as server, tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.update(
+            {
+                "EBAY_CLIENT_ID": "bench-client",
+                "EBAY_CLIENT_SECRET": "bench-secret",
+                "EBAY_API_BASE_URL": server.base_url,
+                "ENABLE_NOTIFICATIONS": "0",
+            }
+        )
+        typer.echo(
+            f"{categories} categories, {sellers} sellers, {items_per_seller} items per "
+            f"seller, {latency_seconds * 1000:.0f}ms latency"
+        )
+        for engine in (cli_main.FETCH_ENGINE_SYNC, cli_main.FETCH_ENGINE_ASYNC):
+            elapsed_seconds, inserted = _run_engine(
+                Path(tmp_dir) / f"{engine}.sqlite3",
+                engine,
+                categories,
+                sellers,
+                limit,
+                max_pages,
+                concurrency,
+                max_in_flight,
+            )
+            typer.echo(
+                f"{engine:>5}: {elapsed_seconds:6.2f}s, {inserted} items inserted, "
+                f"{inserted / elapsed_seconds:8.1f} items/s"
+            )
+
+
+if __name__ == "__main__":
+    typer.run(main)
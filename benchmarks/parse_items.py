@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of the model and fast item parsers.
+
+    uv run python benchmarks/parse_items.py --items 10000
+    uv run python benchmarks/parse_items.py --summaries-file recorded_summaries.json
+
+Without a file the summaries come from the fake eBay catalog. A recorded file is
+a JSON list of `itemSummaries` entries, e.g. concatenated search responses.
+"""
+
+import json
+import timeit
+from pathlib import Path
+
+import typer
+
+from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.ebay.api import EbayAPI
+from ebay_watchlist.ebay.fake_server import FakeEbayCatalog
+
+
+def _synthetic_summaries(count: int) -> list[dict]:
+    catalog = FakeEbayCatalog(items_per_seller=count)
+    sellers = [f"seller_{idx}" for idx in range(20)]
+    summaries, _ = catalog.search(619, sellers, offset=0, limit=count)
+    return summaries
+
+
+def _best_seconds(statement, repeat: int) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main(
+    items: int = 10_000,
+    repeat: int = 5,
+    summaries_file: Path | None = None,
+):
+    summaries = (
+        json.loads(summaries_file.read_text())
+        if summaries_file
+        else _synthetic_summaries(items)
+    )
+    # Search pages hold at most 200 summaries, parse them the way fetches do.
+    pages = [summaries[start : start + 200] for start in range(0, len(summaries), 200)]
+
+    results = {
+        "model": _best_seconds(
+            lambda: [EbayAPI.parse_items(page) for page in pages], repeat
+        ),
+        "fast": _best_seconds(
+            lambda: [EbayAPI.parse_items_fast(page) for page in pages], repeat
+        ),
+        "model + rows": _best_seconds(
+            lambda: [
+                ItemRepository._build_item_row(item, 619)
+                for page in pages
+                for item in EbayAPI.parse_items(page)
+            ],
+            repeat,
+        ),
+        "fast + rows": _best_seconds(
+            lambda: [
+                ItemRepository._build_item_row(item, 619)
+                for page in pages
+                for item in EbayAPI.parse_items_fast(page)
+            ],
+            repeat,
+        ),
+    }
+
+    typer.echo(f"{len(summaries)} summaries in {len(pages)} pages, best of {repeat}")
+    for name, seconds in results.items():
+        typer.echo(
+            f"{name:>13}: {seconds * 1000:8.1f}ms "
+            f"({seconds / len(summaries) * 1e6:6.1f}us per item)"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,126 @@
+"""
+Title search latency: LIKE '%q%' scan vs the FTS5 trigram and word indexes.
+
+    uv run python benchmarks/title_search.py --sizes 100000,1000000
+
+Each size gets its own temporary DB of synthetic listings. Timings cover what
+GET /api/v1/items runs for a search: the total count plus the first page.
+"""
+
+import random
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import typer
+
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.models import Category, Item, Seller
+from ebay_watchlist.db.repositories import (
+    SEARCH_MODE_SUBSTRING,
+    SEARCH_MODE_WORDS,
+    ItemRepository,
+)
+from ebay_watchlist.db.utils import create_tables
+
+BRANDS = ["Fender", "Gibson", "Yamaha", "Roland", "Korg", "Moog", "Ibanez", "Epiphone"]
+MODELS = ["Telecaster", "Stratocaster", "Les Paul", "Juno-106", "MS-20", "DX7", "SG"]
+WORDS = ["vintage", "used", "boxed", "spares", "repair", "mint", "with", "case", "bundle"]
+KINDS = ["guitar", "synth", "keyboard", "amp", "pedal", "bass", "drum machine"]
+INSERT_BATCH_SIZE = 5000
+QUERIES = ["juno", "fender tele", "ms-20", "drum mach", "xyzzy"]
+PAGE_SIZE = 100
+
+
+def _title(rng: random.Random) -> str:
+    parts = [rng.choice(BRANDS), rng.choice(MODELS), rng.choice(KINDS)]
+    parts += rng.sample(WORDS, k=rng.randint(1, 4))
+    return " ".join(parts)
+
+
+def _populate(db_path: Path, size: int, seed: int) -> float:
+    database.init(str(db_path))
+    database.connect(reuse_if_open=True)
+    create_tables()
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    seller_keys = ItemRepository.get_dimension_keys(
+        Seller, {f"seller_{index}" for index in range(200)}
+    )
+    category_keys = ItemRepository.get_dimension_keys(Category, {"Electric Guitars"})
+    started_at = perf_counter()
+    for start in range(0, size, INSERT_BATCH_SIZE):
+        rows = [
+            {
+                "item_id": str(index),
+                "title": _title(rng),
+                "scraped_category_id": 619,
+                "category_id": 33034,
+                "category": category_keys["Electric Guitars"],
+                "seller": seller_keys[f"seller_{index % 200}"],
+                "web_url": f"https://www.ebay.com/itm/{index}",
+                "origin_date": now,
+                "creation_date": now - timedelta(seconds=index),
+                "end_date": now + timedelta(days=7),
+            }
+            for index in range(start, min(start + INSERT_BATCH_SIZE, size))
+        ]
+        with database.atomic():
+            Item.insert_many(rows).execute()
+    return perf_counter() - started_at
+
+
+def _like_search(query: str, reference_time: datetime) -> int:
+    base = Item.select().where(Item.title.contains(query), Item.end_date >= reference_time)
+    _ = list(base.order_by(Item.creation_date.desc()).limit(PAGE_SIZE))
+    return base.count()
+
+
+def _fts_search(query: str, search_mode: str, sort: str, reference_time: datetime) -> int:
+    _ = list(
+        ItemRepository.get_filtered_items(
+            search_query=query,
+            search_mode=search_mode,
+            sort=sort,
+            reference_time=reference_time,
+            limit=PAGE_SIZE,
+        )
+    )
+    return ItemRepository.count_filtered_items(
+        search_query=query, search_mode=search_mode, reference_time=reference_time
+    )
+
+
+def main(sizes: str = "100000,1000000", repeat: int = 5, seed: int = 0):
+    reference_time = datetime(2026, 1, 1)
+    strategies = {
+        "like": lambda query: _like_search(query, reference_time),
+        "trigram": lambda query: _fts_search(
+            query, SEARCH_MODE_SUBSTRING, "newest", reference_time
+        ),
+        "words+bm25": lambda query: _fts_search(
+            query, SEARCH_MODE_WORDS, "relevance", reference_time
+        ),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in (int(value) for value in sizes.split(",")):
+            insert_seconds = _populate(Path(tmp_dir) / f"{size}.sqlite3", size, seed)
+            typer.echo(f"\n{size} items (inserted with triggers in {insert_seconds:.1f}s)")
+            typer.echo(f"{'query':>12} " + " ".join(f"{name:>16}" for name in strategies))
+            for query in QUERIES:
+                cells = []
+                for search in strategies.values():
+                    matches = search(query)
+                    seconds = min(
+                        timeit.repeat(lambda: search(query), number=1, repeat=repeat)
+                    )
+                    cells.append(f"{seconds * 1000:7.1f}ms {matches:>6}")
+                typer.echo(f"{query:>12} " + " ".join(f"{cell:>16}" for cell in cells))
+            database.close()
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -219,6 +219,18 @@ export default function ItemsPage({ itemsQuery, onMenuActionsChange }: ItemsPage
     updateQuery({ page });
   }
 
+  function onNextPage() {
+    if (data?.next_cursor) {
+      updateQuery({ page: data.page + 1, cursor: data.next_cursor });
+    }
+  }
+
+  function onPrevPage() {
+    if (data?.prev_cursor) {
+      updateQuery({ page: data.page - 1, cursor: data.prev_cursor });
+    }
+  }
+
   function appendFilterValue(field: FilterField, value: string) {
     const normalized = value.trim();
     if (!normalized) {
@@ -247,7 +259,7 @@ export default function ItemsPage({ itemsQuery, onMenuActionsChange }: ItemsPage
   return (
     <div>
       <ItemsToolbar
-        total={data?.total ?? 0}
+        total={data ? data.total : 0}
         sort={query.sort}
         view={query.view}
         onSortChange={onSortChange}
@@ -314,6 +326,8 @@ export default function ItemsPage({ itemsQuery, onMenuActionsChange }: ItemsPage
           hasPrev={data.has_prev}
           hasNext={data.has_next}
           onPageChange={onPageChange}
+          onNext={data.next_cursor ? onNextPage : undefined}
+          onPrev={data.prev_cursor ? onPrevPage : undefined}
         />
       )}
 
@@ -6,10 +6,12 @@ import {
   fetchAnalyticsSnapshot,
   fetchCategorySuggestions,
   fetchItems,
+  fetchItemsCount,
   fetchSellerSuggestions,
   fetchWatchlist,
   fetchWatchlistCategorySuggestions,
   refreshItem,
+  refreshItems,
   removeWatchedCategory,
   removeWatchedSeller,
   toggleFavorite,
@@ -58,6 +60,16 @@ describe("items api contract success paths", () => {
     expect(result).toEqual(payload);
   });
 
+  test("fetchItemsCount asks the count endpoint with the same query string", async () => {
+    const payload = { total: 420, total_pages: 5 };
+    mockFetchOk(payload);
+
+    const result = await fetchItemsCount("q=guitar");
+
+    expect(fetch).toHaveBeenCalledWith("/api/v1/items/count?q=guitar");
+    expect(result).toEqual(payload);
+  });
+
   test("fetch suggestions endpoints encode query parameters", async () => {
     const payload = { items: [{ value: "alice", label: "alice" }] };
     mockFetchOk(payload);
@@ -98,6 +110,16 @@ describe("items api contract success paths", () => {
     expect(fetch).toHaveBeenCalledWith("/api/v1/items/abc/refresh", { method: "POST" });
     expect(refreshedItem).toEqual(refreshed.item);
 
+    const bulkRefreshed = { items: [{ item_id: "abc" }], errors: { def: "item not found" } };
+    mockFetchOk(bulkRefreshed);
+    const bulkResponse = await refreshItems(["abc", "def"]);
+    expect(fetch).toHaveBeenCalledWith("/api/v1/items/refresh", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ item_ids: ["abc", "def"] }),
+    });
+    expect(bulkResponse).toEqual(bulkRefreshed);
+
     const notePayload = {
       item_id: "abc",
       note_text: "max 100",
@@ -212,6 +234,7 @@ describe("items api contract error paths", () => {
   test("throws readable errors for all endpoints when response is not ok", async () => {
     mockFetchError(500);
     await expectApiError(() => fetchItems(""), "items fetch failed: 500");
+    await expectApiError(() => fetchItemsCount(""), "items count failed: 500");
 
     mockFetchError(501);
     await expectApiError(() => fetchSellerSuggestions("alice"), "seller suggestions failed: 501");
@@ -230,6 +253,7 @@ describe("items api contract error paths", () => {
 
     mockFetchError(505);
     await expectApiError(() => refreshItem("1"), "refresh failed: 505");
+    await expectApiError(() => refreshItems(["1"]), "bulk refresh failed: 505");
 
     mockFetchError(506);
     await expectApiError(() => updateItemNote("1", "note"), "note update failed: 506");
@@ -30,13 +30,26 @@ export interface ItemsResponse {
   items: ItemRow[];
   page: number;
   page_size: number;
-  total: number;
-  total_pages: number;
+  // null when requested with include_total=0, see fetchItemsCount.
+  total: number | null;
+  total_pages: number | null;
   has_next: boolean;
   has_prev: boolean;
+  next_cursor: string | null;
+  prev_cursor: string | null;
   sort: ItemsSort;
 }
 
+export interface ItemsCountResponse {
+  total: number;
+  total_pages: number;
+}
+
+export interface RefreshItemsResponse {
+  items: ItemRow[];
+  errors: Record<string, string>;
+}
+
 export interface Suggestion {
   value: string;
   label: string;
@@ -114,6 +127,14 @@ export async function fetchItems(queryString: string): Promise<ItemsResponse> {
   return (await response.json()) as ItemsResponse;
 }
 
+export async function fetchItemsCount(queryString: string): Promise<ItemsCountResponse> {
+  const response = await fetch(`/api/v1/items/count${queryString ? `?${queryString}` : ""}`);
+  if (!response.ok) {
+    throw new Error(`items count failed: ${response.status}`);
+  }
+  return (await response.json()) as ItemsCountResponse;
+}
+
 export async function fetchSellerSuggestions(query: string): Promise<SuggestionsResponse> {
   const response = await fetch(`/api/v1/suggestions/sellers?q=${encodeURIComponent(query)}`);
   if (!response.ok) {
@@ -176,6 +197,20 @@ export async function refreshItem(itemId: string): Promise<ItemRow> {
   return payload.item;
 }
 
+export async function refreshItems(itemIds: string[]): Promise<RefreshItemsResponse> {
+  const response = await fetch("/api/v1/items/refresh", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ item_ids: itemIds }),
+  });
+
+  if (!response.ok) {
+    throw new Error(`bulk refresh failed: ${response.status}`);
+  }
+
+  return (await response.json()) as RefreshItemsResponse;
+}
+
 export async function updateItemNote(
   itemId: string,
   noteText: string
@@ -1,7 +1,7 @@
 import type { ItemsSort, ItemsView } from "../api";
 
 interface ItemsToolbarProps {
-  total: number;
+  total: number | null;
   sort: ItemsSort;
   view: ItemsView;
   onSortChange: (sort: ItemsSort) => void;
@@ -46,7 +46,9 @@ export default function ItemsToolbar({
       data-testid="items-toolbar"
       className="mb-4 flex flex-wrap items-center justify-between gap-3 rounded-xl border border-slate-200 bg-slate-50 p-3 dark:border-slate-700 dark:bg-slate-900 dark:text-slate-100"
     >
-      <p className="text-sm font-medium text-slate-700 dark:text-slate-200">{total} items</p>
+      <p className="text-sm font-medium text-slate-700 dark:text-slate-200">
+        {total === null ? "Counting items..." : `${total} items`}
+      </p>
 
       <div className="flex items-center gap-2">
         <label className="sr-only" htmlFor="sort-select">
@@ -1,9 +1,12 @@
 interface PaginationControlsProps {
   page: number;
-  totalPages: number;
+  // null while the total is still being counted.
+  totalPages: number | null;
   hasPrev: boolean;
   hasNext: boolean;
   onPageChange: (page: number) => void;
+  onNext?: () => void;
+  onPrev?: () => void;
 }
 
 type PageToken = number | "...";
@@ -39,8 +42,14 @@ export default function PaginationControls({
   hasPrev,
   hasNext,
   onPageChange,
+  onNext,
+  onPrev,
 }: PaginationControlsProps) {
-  const normalizedTotalPages = Math.max(totalPages, 1);
+  const totalKnown = totalPages !== null;
+  // Until the total arrives, the last page known to exist is the next one.
+  const normalizedTotalPages = totalKnown
+    ? Math.max(totalPages, 1)
+    : Math.max(page, 1) + (hasNext ? 1 : 0);
   const normalizedPage = Math.min(Math.max(page, 1), normalizedTotalPages);
   const pageTokens = buildPageTokens(normalizedPage, normalizedTotalPages);
   const canGoPrev = hasPrev && normalizedPage > 1;
@@ -58,7 +67,9 @@ export default function PaginationControls({
       aria-label="Pagination"
       className="mt-4 flex flex-wrap items-center justify-between gap-3 rounded-xl border border-slate-200 bg-slate-50 px-3 py-2 dark:border-slate-700 dark:bg-slate-900"
     >
-      <p className="text-sm text-slate-600 dark:text-slate-300">Page {normalizedPage} of {normalizedTotalPages}</p>
+      <p className="text-sm text-slate-600 dark:text-slate-300">
+        {totalKnown ? `Page ${normalizedPage} of ${normalizedTotalPages}` : `Page ${normalizedPage}`}
+      </p>
 
       <div className="flex items-center gap-1">
         <button
@@ -71,7 +82,7 @@ export default function PaginationControls({
         </button>
         <button
           type="button"
-          onClick={() => jump(normalizedPage - 1)}
+          onClick={() => (onPrev ? onPrev() : jump(normalizedPage - 1))}
           disabled={!canGoPrev}
           className="rounded-md border border-slate-300 px-2 py-1 text-xs font-medium text-slate-700 transition hover:bg-slate-100 disabled:cursor-not-allowed disabled:opacity-50 dark:border-slate-600 dark:text-slate-200 dark:hover:bg-slate-800"
         >
@@ -102,7 +113,7 @@ export default function PaginationControls({
 
         <button
           type="button"
-          onClick={() => jump(normalizedPage + 1)}
+          onClick={() => (onNext ? onNext() : jump(normalizedPage + 1))}
           disabled={!canGoNext}
           className="rounded-md border border-slate-300 px-2 py-1 text-xs font-medium text-slate-700 transition hover:bg-slate-100 disabled:cursor-not-allowed disabled:opacity-50 dark:border-slate-600 dark:text-slate-200 dark:hover:bg-slate-800"
         >
@@ -111,7 +122,7 @@ export default function PaginationControls({
         <button
           type="button"
           onClick={() => jump(normalizedTotalPages)}
-          disabled={!canGoNext}
+          disabled={!canGoNext || !totalKnown}
           className="rounded-md border border-slate-300 px-2 py-1 text-xs font-medium text-slate-700 transition hover:bg-slate-100 disabled:cursor-not-allowed disabled:opacity-50 dark:border-slate-600 dark:text-slate-200 dark:hover:bg-slate-800"
         >
           Last
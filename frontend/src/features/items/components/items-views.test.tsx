@@ -38,6 +38,10 @@ let paginationState = {
   has_next: false,
   has_prev: false,
 };
+let cursors: { next_cursor: string | null; prev_cursor: string | null } = {
+  next_cursor: null,
+  prev_cursor: null,
+};
 const {
   toggleFavoriteMock,
   toggleHiddenMock,
@@ -81,6 +85,8 @@ vi.mock("../useItemsQuery", () => ({
       total_pages: paginationState.total_pages,
       has_next: paginationState.has_next,
       has_prev: paginationState.has_prev,
+      next_cursor: cursors.next_cursor,
+      prev_cursor: cursors.prev_cursor,
       sort: queryState.sort,
     },
     loading: false,
@@ -141,6 +147,7 @@ beforeEach(() => {
     has_next: false,
     has_prev: false,
   };
+  cursors = { next_cursor: null, prev_cursor: null };
   updateQuery.mockClear();
   toggleFavoriteMock.mockReset();
   toggleHiddenMock.mockReset();
@@ -221,6 +228,30 @@ test("pagination controls update query page", async () => {
   expect(queryState.page).toBe(5);
 });
 
+test("previous and next follow the page cursors when the API returns them", async () => {
+  const user = userEvent.setup();
+  paginationState = {
+    page: 2,
+    page_size: 100,
+    total: 420,
+    total_pages: 5,
+    has_next: true,
+    has_prev: true,
+  };
+  cursors = { next_cursor: "after-page-2", prev_cursor: "before-page-2" };
+
+  render(<ItemsPage />);
+
+  await user.click(screen.getByRole("button", { name: "Next" }));
+  expect(updateQuery).toHaveBeenLastCalledWith({ page: 3, cursor: "after-page-2" });
+
+  await user.click(screen.getByRole("button", { name: "Previous" }));
+  expect(updateQuery).toHaveBeenLastCalledWith({ page: 1, cursor: "before-page-2" });
+
+  await user.click(screen.getByRole("button", { name: "4" }));
+  expect(updateQuery).toHaveBeenLastCalledWith({ page: 4 });
+});
+
 test("view switcher supports dense, hybrid, and cards", async () => {
   const user = userEvent.setup();
   const { rerender } = render(<ItemsPage />);
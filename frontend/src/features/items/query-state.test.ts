@@ -53,3 +53,14 @@ test("parses URL params into typed query state", () => {
     page_size: 25,
   });
 });
+
+test("round-trips the page cursor", () => {
+  const state = parseQueryState("?page=4&cursor=eyJzb3J0IjoibmV3ZXN0In0");
+
+  expect(state.page).toBe(4);
+  expect(state.cursor).toBe("eyJzb3J0IjoibmV3ZXN0In0");
+  expect(new URLSearchParams(serializeQueryState(state)).get("cursor")).toBe(
+    "eyJzb3J0IjoibmV3ZXN0In0"
+  );
+  expect(parseQueryState("?page=4").cursor).toBeUndefined();
+});
@@ -13,6 +13,7 @@ export interface ItemsQueryState {
   view: ItemsView;
   page: number;
   page_size: number;
+  cursor?: string;
 }
 
 export const DEFAULT_QUERY_STATE: ItemsQueryState = {
@@ -70,6 +71,7 @@ export function parseQueryState(search: string): ItemsQueryState {
     view: VIEWS.has(parsedView as ItemsView) ? (parsedView as ItemsView) : "table",
     page: parsePositiveInt(params.get("page"), 1),
     page_size: parsePositiveInt(params.get("page_size"), 100),
+    cursor: params.get("cursor") || undefined,
   };
 }
 
@@ -113,6 +115,9 @@ export function serializeQueryState(state: ItemsQueryState): string {
   if (state.page_size !== 100) {
     params.set("page_size", String(state.page_size));
   }
+  if (state.cursor) {
+    params.set("cursor", state.cursor);
+  }
 
   return params.toString();
 }
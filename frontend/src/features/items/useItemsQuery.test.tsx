@@ -11,6 +11,8 @@ const payload = {
   total_pages: 1,
   has_next: false,
   has_prev: false,
+  next_cursor: null,
+  prev_cursor: null,
   sort: "newest",
 };
 
@@ -30,19 +32,27 @@ afterEach(() => {
   vi.unstubAllGlobals();
 });
 
+function fetchedUrls(): string[] {
+  return (fetch as ReturnType<typeof vi.fn>).mock.calls.map((call) => String(call[0]));
+}
+
+function itemPageCalls(): string[] {
+  return fetchedUrls().filter((url) => !url.startsWith("/api/v1/items/count"));
+}
+
 test("changing filter triggers fetch without full page reload", async () => {
   const replaceStateSpy = vi.spyOn(window.history, "replaceState");
   const { result } = renderHook(() => useItemsQuery());
 
-  await waitFor(() => expect(fetch).toHaveBeenCalledTimes(1));
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(1));
 
   await act(async () => {
     result.current.updateQuery({ q: "guitar" });
   });
 
-  await waitFor(() => expect(fetch).toHaveBeenCalledTimes(2));
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(2));
   expect(replaceStateSpy).toHaveBeenCalled();
-  expect((fetch as ReturnType<typeof vi.fn>).mock.calls[1]?.[0]).toContain("q=guitar");
+  expect(itemPageCalls()[1]).toContain("q=guitar");
   expect(window.location.search).toContain("q=guitar");
 });
 
@@ -53,15 +63,60 @@ test("favorites path forces favorite filter when configured", async () => {
     useItemsQuery({ basePath: "/favorites", forceFavorite: true })
   );
 
-  await waitFor(() => expect(fetch).toHaveBeenCalledTimes(1));
-  expect((fetch as ReturnType<typeof vi.fn>).mock.calls[0]?.[0]).toContain("favorite=1");
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(1));
+  expect(itemPageCalls()[0]).toContain("favorite=1");
   expect(window.location.pathname).toBe("/favorites");
 
   await act(async () => {
     result.current.updateQuery({ favorite: false, q: "guitar" });
   });
 
-  await waitFor(() => expect(fetch).toHaveBeenCalledTimes(2));
-  expect((fetch as ReturnType<typeof vi.fn>).mock.calls[1]?.[0]).toContain("favorite=1");
-  expect((fetch as ReturnType<typeof vi.fn>).mock.calls[1]?.[0]).toContain("q=guitar");
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(2));
+  expect(itemPageCalls()[1]).toContain("favorite=1");
+  expect(itemPageCalls()[1]).toContain("q=guitar");
+});
+
+test("a page cursor is sent once and dropped by any other query change", async () => {
+  const { result } = renderHook(() => useItemsQuery());
+
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(1));
+
+  await act(async () => {
+    result.current.updateQuery({ page: 2, cursor: "after-page-1" });
+  });
+
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(2));
+  expect(itemPageCalls()[1]).toContain("cursor=after-page-1");
+
+  await act(async () => {
+    result.current.updateQuery({ sort: "price_low", page: 1 });
+  });
+
+  await waitFor(() => expect(itemPageCalls()).toHaveLength(3));
+  expect(itemPageCalls()[2]).not.toContain("cursor=");
+  expect(result.current.query.cursor).toBeUndefined();
+});
+
+test("pages load without a total and the exact count follows", async () => {
+  vi.stubGlobal(
+    "fetch",
+    vi.fn(async (url: string) => ({
+      ok: true,
+      json: async () =>
+        url.startsWith("/api/v1/items/count")
+          ? { total: 420, total_pages: 5 }
+          : { ...payload, total: null, total_pages: null, has_next: true },
+    }))
+  );
+  window.history.replaceState(null, "", "/?q=synth");
+
+  const { result } = renderHook(() => useItemsQuery());
+
+  await waitFor(() => expect(result.current.data?.total).toBe(420));
+  expect(result.current.data?.total_pages).toBe(5);
+  expect(result.current.data?.has_next).toBe(true);
+  expect(fetchedUrls()).toEqual([
+    "/api/v1/items?q=synth&include_total=0",
+    "/api/v1/items/count?q=synth",
+  ]);
 });
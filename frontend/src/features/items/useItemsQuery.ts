@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useState } from "react";
 
-import { fetchItems, type ItemsResponse } from "./api";
+import { fetchItems, fetchItemsCount, type ItemsResponse } from "./api";
 import {
   DEFAULT_QUERY_STATE,
   parseQueryState,
@@ -57,8 +57,11 @@ export function useItemsQuery(config: UseItemsQueryConfig = {}): UseItemsQueryRe
       setLoading(true);
       setError(null);
 
+      const pageParams = new URLSearchParams(queryString);
+      pageParams.set("include_total", "0");
+
       try {
-        const result = await fetchItems(queryString);
+        const result = await fetchItems(pageParams.toString());
         if (!canceled) {
           setData(result);
         }
@@ -67,11 +70,22 @@ export function useItemsQuery(config: UseItemsQueryConfig = {}): UseItemsQueryRe
           setError(err instanceof Error ? err.message : "Failed to load items");
           setData(null);
         }
+        return;
       } finally {
         if (!canceled) {
           setLoading(false);
         }
       }
+
+      // The page renders first; the exact total is counted afterwards.
+      try {
+        const { total, total_pages } = await fetchItemsCount(queryString);
+        if (!canceled) {
+          setData((prev) => (prev ? { ...prev, total, total_pages } : prev));
+        }
+      } catch {
+        // Pagination keeps working from has_next/has_prev without a total.
+      }
     }
 
     void run();
@@ -87,6 +101,8 @@ export function useItemsQuery(config: UseItemsQueryConfig = {}): UseItemsQueryRe
       const nextQuery = {
         ...prev,
         ...nextPatch,
+        // A cursor only belongs to the page it was issued for; any other change drops it.
+        cursor: nextPatch.cursor,
       };
       if (forceFavorite) {
         nextQuery.favorite = true;
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 import humanize
@@ -6,8 +6,9 @@ from rich import print
 from rich.console import Console
 from rich.table import Table
 
-from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.models import CategorySchedule, Item
 from ebay_watchlist.ebay.dtos import EbayItem
+from ebay_watchlist.ebay.transport import EndpointStats
 
 
 def _format_price(
@@ -79,5 +80,47 @@ def display_items(items: list[EbayItem]):
     console.print(table)
 
 
+def display_category_schedules(schedules: list[CategorySchedule]):
+    console = Console()
+    table = Table(
+        "Category", "Next Poll", "Interval", "New Items/Hour", "Last Polled"
+    )
+    for schedule in schedules:
+        table.add_row(
+            str(schedule.category_id),
+            format_naturaltime(schedule.next_poll_at),
+            humanize.naturaldelta(timedelta(seconds=int(schedule.interval_seconds))),
+            f"{float(schedule.new_items_per_hour):.2f}",
+            format_naturaltime(schedule.last_polled_at),
+        )
+
+    console.print(table)
+
+
+def display_http_stats(endpoint_stats: dict[str, EndpointStats]):
+    console = Console()
+    table = Table(
+        "Endpoint",
+        "Attempts",
+        "Retries",
+        "429s",
+        "5xx",
+        "Connection Errors",
+        "Throttled",
+    )
+    for endpoint, stats in endpoint_stats.items():
+        table.add_row(
+            endpoint,
+            str(stats.attempts),
+            str(stats.retries),
+            str(stats.rate_limited),
+            str(stats.server_errors),
+            str(stats.connection_errors),
+            f"{stats.throttled_seconds:.1f}s",
+        )
+
+    console.print(table)
+
+
 def print_with_timestamp(message: str):
     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] " + message)
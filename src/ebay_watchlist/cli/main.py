@@ -1,23 +1,56 @@
+import asyncio
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from time import sleep
+from time import perf_counter, sleep
 
 import typer
 from dotenv import load_dotenv
 from peewee import OperationalError
 
-from ebay_watchlist.cli.display_utils import display_db_items, print_with_timestamp
+from ebay_watchlist.cli.display_utils import (
+    display_category_schedules,
+    display_db_items,
+    display_http_stats,
+    print_with_timestamp,
+)
 from ebay_watchlist.cli.management import management_app
 from ebay_watchlist.db.config import DATABASE_URL, database
 from ebay_watchlist.db.repositories import (
     CategoryRepository,
+    CategoryScheduleRepository,
     ItemRepository,
+    OAuthTokenRepository,
     SellerRepository,
 )
-from ebay_watchlist.db.utils import ensure_schema_compatibility
-from ebay_watchlist.ebay.api import EbayAPI
+from ebay_watchlist.db.utils import checkpoint_wal, ensure_schema_compatibility
+from ebay_watchlist.ebay.api import (
+    DEFAULT_API_BASE_URL,
+    DEFAULT_SELLER_SHARD_SIZE,
+    PARSE_MODE_MODEL,
+    PARSE_MODES,
+    EbayAPI,
+)
+from ebay_watchlist.ebay.async_api import (
+    DEFAULT_MAX_IN_FLIGHT,
+    AsyncEbayAPI,
+    gather_or_cancel,
+)
+from ebay_watchlist.ebay.dtos import ItemRecord, ParsedItem
+from ebay_watchlist.ebay.fake_server import (
+    DEFAULT_FAKE_EBAY_PORT,
+    DEFAULT_ITEMS_PER_SELLER,
+    FakeEbayConfig,
+    create_fake_ebay_app,
+)
+from ebay_watchlist.ebay.transport import RetryingTransport
 from ebay_watchlist.notifications.service import NotificationService
+from ebay_watchlist.scheduler.service import (
+    DEFAULT_MAX_POLL_INTERVAL_SECONDS,
+    DEFAULT_MIN_POLL_INTERVAL_SECONDS,
+    PollScheduler,
+)
 from ebay_watchlist.web.app import create_app
 
 app = typer.Typer(no_args_is_help=True)
@@ -25,19 +58,243 @@ app.add_typer(management_app, name="config", help="Database configuration comman
 DEFAULT_CLEANUP_RETENTION_DAYS = 180
 DEFAULT_CLEANUP_INTERVAL_MINUTES = 24 * 60
 FETCH_INTERVAL_SECONDS = 600
+DEFAULT_FETCH_CONCURRENCY = 1
+DEFAULT_FETCH_MAX_PAGES = 10
+FETCH_ENGINE_SYNC = "sync"
+FETCH_ENGINE_ASYNC = "async"
+FETCH_ENGINES = {FETCH_ENGINE_SYNC, FETCH_ENGINE_ASYNC}
+# Fetched categories the async engine holds for its writer before fetchers wait.
+ASYNC_WRITE_QUEUE_SIZE = 4
 DEFAULT_GUNICORN_WORKERS = 2
 logger = logging.getLogger(__name__)
 
 
+def _log_fetch_context(category_id: int, watched_sellers: list[str]):
+    logger.info(
+        "Fetch context: database=%s category_id=%s watched_sellers_count=%s watched_sellers=%s",
+        DATABASE_URL,
+        category_id,
+        len(watched_sellers),
+        watched_sellers,
+    )
+
+
+def _fetch_category_items(
+    api: EbayAPI,
+    watched_sellers: list[str],
+    category_id: int,
+    limit: int,
+    known_item_ids: set[str],
+    max_pages: int,
+) -> tuple[list[ParsedItem], float]:
+    """
+    Runs on a worker thread and never writes items; its only DB access is the
+    shared OAuth token cache, read (and saved) when the token needs a refresh.
+    Returns the fetched items and the elapsed seconds for the category.
+    """
+    _log_fetch_context(category_id, watched_sellers)
+    started_at = perf_counter()
+    items = api.get_latest_items_for_sellers(
+        seller_names=watched_sellers,
+        category_id=category_id,
+        limit=limit,
+        known_item_ids=known_item_ids,
+        max_pages=max_pages,
+    )
+    return items, perf_counter() - started_at
+
+
+def _seller_name(item: ParsedItem) -> str | None:
+    if isinstance(item, ItemRecord):
+        return item.seller_name
+    return getattr(getattr(item, "seller", None), "username", None)
+
+
+def _store_category_items(
+    category_id: int, items: list[ParsedItem], elapsed_seconds: float
+) -> tuple[int, int, int]:
+    """
+    The single DB writer shared by both fetch engines.
+    Returns the (inserted, updated, skipped) item counts.
+    """
+    response_sellers = sorted(
+        {seller_name for item in items if (seller_name := _seller_name(item))}
+    )
+    logger.info(
+        "Fetch response: category_id=%s response_items_count=%s unique_sellers_count=%s unique_sellers=%s elapsed_seconds=%.3f",
+        category_id,
+        len(items),
+        len(response_sellers),
+        response_sellers,
+        elapsed_seconds,
+    )
+
+    inserted_ids, updated_ids, skipped_ids = (
+        ItemRepository.upsert_items_from_ebay_item_dtos(items, category_id)
+    )
+    logger.info(
+        "Fetch write: category_id=%s inserted_count=%s updated_count=%s skipped_count=%s",
+        category_id,
+        len(inserted_ids),
+        len(updated_ids),
+        len(skipped_ids),
+    )
+    return len(inserted_ids), len(updated_ids), len(skipped_ids)
+
+
+def _fetch_and_store_threaded(
+    api: EbayAPI,
+    watched_sellers: list[str],
+    enabled_categories: list[int],
+    limit: int,
+    known_item_ids: set[str],
+    max_pages: int,
+    concurrency: int,
+) -> tuple[float, dict[int, tuple[int, int, int]]]:
+    """
+    Fetches categories on a thread pool and writes them from the calling thread.
+    Returns the summed per-category fetch seconds and the write counts per category.
+    """
+    fetch_seconds_total = 0.0
+    write_counts_by_category: dict[int, tuple[int, int, int]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(
+                _fetch_category_items,
+                api,
+                watched_sellers,
+                category_id,
+                limit,
+                known_item_ids,
+                max_pages,
+            ): category_id
+            for category_id in enabled_categories
+        }
+        for future in as_completed(futures):
+            items, elapsed_seconds = future.result()
+            fetch_seconds_total += elapsed_seconds
+            category_id = futures[future]
+            write_counts_by_category[category_id] = _store_category_items(
+                category_id, items, elapsed_seconds
+            )
+
+    return fetch_seconds_total, write_counts_by_category
+
+
+async def _fetch_and_store_async(
+    api: AsyncEbayAPI,
+    watched_sellers: list[str],
+    enabled_categories: list[int],
+    limit: int,
+    known_item_ids: set[str],
+    max_pages: int,
+) -> tuple[float, dict[int, tuple[int, int, int]]]:
+    """
+    Fetches every category on the event loop and feeds the results through a
+    bounded queue to a single writer task, which runs each write on a worker
+    thread so fetching carries on meanwhile. Returns the summed per-category
+    fetch seconds and the write counts per category.
+    """
+    queue: asyncio.Queue[tuple[int, list[ParsedItem], float] | None] = asyncio.Queue(
+        maxsize=ASYNC_WRITE_QUEUE_SIZE
+    )
+
+    async def fetch_category(category_id: int):
+        _log_fetch_context(category_id, watched_sellers)
+        started_at = perf_counter()
+        items = await api.get_latest_items_for_sellers(
+            seller_names=watched_sellers,
+            category_id=category_id,
+            limit=limit,
+            known_item_ids=known_item_ids,
+            max_pages=max_pages,
+        )
+        await queue.put((category_id, items, perf_counter() - started_at))
+
+    async def write_batches() -> tuple[float, dict[int, tuple[int, int, int]]]:
+        fetch_seconds_total = 0.0
+        write_counts_by_category: dict[int, tuple[int, int, int]] = {}
+        while (batch := await queue.get()) is not None:
+            category_id, items, elapsed_seconds = batch
+            fetch_seconds_total += elapsed_seconds
+            write_counts_by_category[category_id] = await asyncio.to_thread(
+                _store_category_items, category_id, items, elapsed_seconds
+            )
+        return fetch_seconds_total, write_counts_by_category
+
+    async with api:
+        writer = asyncio.create_task(write_batches())
+        fetchers = asyncio.ensure_future(
+            gather_or_cancel(
+                *(fetch_category(category_id) for category_id in enabled_categories)
+            )
+        )
+
+        def stop_fetching(_):
+            # A failed write cancels the fetchers and empties the queue, so
+            # neither they nor the end-of-batches marker wait on it forever.
+            fetchers.cancel()
+            while not queue.empty():
+                queue.get_nowait()
+
+        writer.add_done_callback(stop_fetching)
+        try:
+            await fetchers
+        finally:
+            # Let the writer drain whatever was already fetched, even on failure.
+            if not writer.done():
+                await queue.put(None)
+            fetch_result = await writer
+
+    return fetch_result
+
+
 @app.command()
-def fetch_updates(limit: int = 100):
+def fetch_updates(
+    limit: int = 100,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    max_pages: int = DEFAULT_FETCH_MAX_PAGES,
+    seller_shard_size: int = DEFAULT_SELLER_SHARD_SIZE,
+    engine: str = FETCH_ENGINE_SYNC,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    categories: list[int] | None = None,
+    http_stats: bool = False,
+    parser: str = PARSE_MODE_MODEL,
+) -> dict[int, int]:
     """
     Gets the latest items for every configured seller and category.
     Prints the newly inserted items to the terminal
+
+    Pass {categories} to fetch only those category ids instead of every enabled one.
+    Returns the number of new items per fetched category.
+
+    Each category is paged {limit} items at a time until a page holds only
+    items already in the DB, or {max_pages} pages have been read.
+    Watched sellers are searched in concurrent shards of {seller_shard_size}.
+
+    With the default "sync" engine categories are fetched by up to {concurrency}
+    worker threads sharing one eBay session. The "async" engine runs every
+    category on an event loop with at most {max_in_flight} HTTP requests in
+    flight. Either way all DB writes happen on a single writer.
+
+    Throttled, 429 and 5xx requests are retried with backoff; pass {http_stats}
+    to print the per-endpoint attempt and retry counters after the run.
+    {parser} "fast" validates whole search pages at once into slotted records,
+    which is much cheaper on CPU for large pages and backfills.
     """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if max_pages < 1:
+        raise ValueError("max_pages must be at least 1")
+    if engine not in FETCH_ENGINES:
+        raise ValueError(f"engine must be one of {sorted(FETCH_ENGINES)}")
+    if parser not in PARSE_MODES:
+        raise ValueError(f"parser must be one of {sorted(PARSE_MODES)}")
+
     EBAY_CLIENT_ID = os.getenv("EBAY_CLIENT_ID")
     EBAY_CLIENT_SECRET = os.getenv("EBAY_CLIENT_SECRET")
     EBAY_MARKETPLACE_ID = os.getenv("EBAY_MARKETPLACE_ID", "EBAY_GB")
+    EBAY_API_BASE_URL = os.getenv("EBAY_API_BASE_URL", DEFAULT_API_BASE_URL)
     ENABLE_NOTIFICATIONS = os.getenv("ENABLE_NOTIFICATIONS", "False").lower() in (
         "true",
         "1",
@@ -47,41 +304,108 @@ def fetch_updates(limit: int = 100):
         raise ValueError("EBAY_CLIENT_ID and EBAY_CLIENT_SECRET must be set")
 
     run_start_date = datetime.now()
-    api = EbayAPI(EBAY_CLIENT_ID, EBAY_CLIENT_SECRET, EBAY_MARKETPLACE_ID)
+    run_started_at = perf_counter()
     notification_service = NotificationService()
     watched_sellers = SellerRepository.get_enabled_sellers()
-    enabled_categories = CategoryRepository.get_enabled_categories()
+    enabled_categories = (
+        list(categories)
+        if categories
+        else CategoryRepository.get_enabled_categories()
+    )
+    known_item_ids = ItemRepository.get_active_item_ids()
+    transport = RetryingTransport()
 
-    for category_id in enabled_categories:
-        logger.info(
-            "Fetch context: database=%s category_id=%s watched_sellers_count=%s watched_sellers=%s",
-            DATABASE_URL,
-            category_id,
-            len(watched_sellers),
-            watched_sellers,
+    if engine == FETCH_ENGINE_ASYNC:
+        async_api = AsyncEbayAPI(
+            EBAY_CLIENT_ID,
+            EBAY_CLIENT_SECRET,
+            EBAY_MARKETPLACE_ID,
+            max_in_flight=max_in_flight,
+            seller_shard_size=seller_shard_size,
+            token_store=OAuthTokenRepository,
+            transport=transport,
+            base_url=EBAY_API_BASE_URL,
+            parse_mode=parser,
         )
-        items = api.get_latest_items_for_sellers(
-            seller_names=watched_sellers,
-            category_id=category_id,
-            limit=limit,
+        fetch_seconds_total, write_counts_by_category = asyncio.run(
+            _fetch_and_store_async(
+                async_api,
+                watched_sellers,
+                enabled_categories,
+                limit,
+                known_item_ids,
+                max_pages,
+            )
         )
-        response_sellers = sorted(
-            {
-                item.seller.username
-                for item in items
-                if getattr(getattr(item, "seller", None), "username", None)
-            }
+    else:
+        api = EbayAPI(
+            EBAY_CLIENT_ID,
+            EBAY_CLIENT_SECRET,
+            EBAY_MARKETPLACE_ID,
+            seller_shard_size=seller_shard_size,
+            token_store=OAuthTokenRepository,
+            transport=transport,
+            base_url=EBAY_API_BASE_URL,
+            parse_mode=parser,
         )
-        logger.info(
-            "Fetch response: category_id=%s response_items_count=%s unique_sellers_count=%s unique_sellers=%s",
-            category_id,
-            len(items),
-            len(response_sellers),
-            response_sellers,
+        fetch_seconds_total, write_counts_by_category = _fetch_and_store_threaded(
+            api,
+            watched_sellers,
+            enabled_categories,
+            limit,
+            known_item_ids,
+            max_pages,
+            concurrency,
         )
 
-        for item in items:
-            ItemRepository.create_or_update_item_from_ebay_item_dto(item, category_id)
+    wall_clock_seconds = perf_counter() - run_started_at
+    parallelism = (
+        f"max_in_flight={max_in_flight}"
+        if engine == FETCH_ENGINE_ASYNC
+        else f"concurrency={concurrency}"
+    )
+    logger.info(
+        "Fetch run: engine=%s %s categories_count=%s fetch_seconds_total=%.3f wall_clock_seconds=%.3f",
+        engine,
+        parallelism,
+        len(enabled_categories),
+        fetch_seconds_total,
+        wall_clock_seconds,
+    )
+    print_with_timestamp(
+        f"[bold]{len(enabled_categories)}[/bold] categories fetched in "
+        f"{wall_clock_seconds:.1f}s (sequential fetch time {fetch_seconds_total:.1f}s, "
+        f"engine={engine}, {parallelism})"
+    )
+    inserted_total, updated_total, skipped_total = (
+        sum(counts[index] for counts in write_counts_by_category.values())
+        for index in range(3)
+    )
+    print_with_timestamp(
+        f"{inserted_total + updated_total} items written "
+        f"({inserted_total} inserted, {updated_total} updated), "
+        f"{skipped_total} unchanged items skipped"
+    )
+    new_items_by_category = {
+        category_id: counts[0]
+        for category_id, counts in write_counts_by_category.items()
+    }
+
+    endpoint_stats = transport.stats_snapshot()
+    for endpoint, stats in endpoint_stats.items():
+        logger.info(
+            "HTTP endpoint stats: endpoint=%s attempts=%s retries=%s rate_limited=%s "
+            "server_errors=%s connection_errors=%s throttled_seconds=%.3f",
+            endpoint,
+            stats.attempts,
+            stats.retries,
+            stats.rate_limited,
+            stats.server_errors,
+            stats.connection_errors,
+            stats.throttled_seconds,
+        )
+    if http_stats:
+        display_http_stats(endpoint_stats)
 
     created_items = ItemRepository.get_items_created_after_datetime(run_start_date)
     print_with_timestamp(
@@ -93,6 +417,8 @@ def fetch_updates(limit: int = 100):
         if ENABLE_NOTIFICATIONS:
             notification_service.notify_new_items(created_items)
 
+    return new_items_by_category
+
 
 @app.command()
 def show_latest_items(limit: int = 50, category: int | None = None):
@@ -126,22 +452,87 @@ def cleanup_expired_items(retention_days: int = DEFAULT_CLEANUP_RETENTION_DAYS)
     return deleted
 
 
+def _checkpoint_database(mode: str) -> None:
+    """
+    Daemon checkpoint policy: a PASSIVE checkpoint after every fetch cycle keeps
+    the WAL short without waiting on API readers, and a TRUNCATE checkpoint on
+    the cleanup interval shrinks the WAL file back after large deletes.
+    """
+    try:
+        busy, wal_frames, checkpointed_frames = checkpoint_wal(mode)
+    except Exception as exc:
+        logger.warning("WAL checkpoint failed: mode=%s error=%s", mode, exc)
+        return
+
+    logger.info(
+        "WAL checkpoint: mode=%s busy=%s wal_frames=%s checkpointed_frames=%s",
+        mode,
+        busy,
+        wal_frames,
+        checkpointed_frames,
+    )
+
+
+def _run_scheduled_fetch(scheduler: PollScheduler) -> float:
+    """
+    Fetches the categories that are due and records their new-item counts.
+    Returns how long to sleep before checking again.
+    """
+    enabled_categories = CategoryRepository.get_enabled_categories()
+    due_categories = scheduler.due_categories(enabled_categories, datetime.now())
+    if due_categories:
+        new_items_by_category = fetch_updates(categories=due_categories)
+        polled_at = datetime.now()
+        for category_id in due_categories:
+            scheduler.record_poll(
+                category_id,
+                new_items_by_category.get(category_id, 0),
+                polled_at,
+            )
+
+    seconds_until_next_poll = scheduler.seconds_until_next_poll(
+        enabled_categories, datetime.now()
+    )
+    # Wake up at least every min interval so newly enabled categories get picked up.
+    return min(
+        max(1.0, seconds_until_next_poll), float(scheduler.min_interval_seconds)
+    )
+
+
 @app.command()
 def run_loop(
     cleanup_retention_days: int = DEFAULT_CLEANUP_RETENTION_DAYS,
     cleanup_interval_minutes: int = DEFAULT_CLEANUP_INTERVAL_MINUTES,
+    adaptive_schedule: bool = False,
+    min_poll_interval_seconds: int = DEFAULT_MIN_POLL_INTERVAL_SECONDS,
+    max_poll_interval_seconds: int = DEFAULT_MAX_POLL_INTERVAL_SECONDS,
 ):
     """
     Daemon mode. Runs in a loop fetching updates every 10 minutes and
     periodically removes expired items from the DB.
+
+    With --adaptive-schedule each category is polled on its own schedule,
+    between {min_poll_interval_seconds} and {max_poll_interval_seconds}
+    depending on how often it sees new items.
     """
     if cleanup_interval_minutes < 1:
         raise ValueError("cleanup_interval_minutes must be at least 1")
 
+    scheduler: PollScheduler | None = None
+    if adaptive_schedule:
+        scheduler = PollScheduler(
+            min_interval_seconds=min_poll_interval_seconds,
+            max_interval_seconds=max_poll_interval_seconds,
+        )
+
     next_cleanup_at: datetime | None = None
     while True:
         try:
-            fetch_updates()
+            if scheduler is None:
+                fetch_updates()
+                sleep_seconds = FETCH_INTERVAL_SECONDS
+            else:
+                sleep_seconds = _run_scheduled_fetch(scheduler)
 
             now = datetime.now()
             if next_cleanup_at is None or now >= next_cleanup_at:
@@ -153,8 +544,11 @@ def run_loop(
                     )
 
                 next_cleanup_at = now + timedelta(minutes=cleanup_interval_minutes)
+                _checkpoint_database("TRUNCATE")
+            else:
+                _checkpoint_database("PASSIVE")
 
-            sleep(FETCH_INTERVAL_SECONDS)
+            sleep(sleep_seconds)
         except KeyboardInterrupt:
             print_with_timestamp(
                 "[bold yellow]:warning:[/bold yellow] User interrupted."
@@ -163,6 +557,45 @@ def run_loop(
     typer.Exit()
 
 
+@app.command()
+def show_schedule():
+    """
+    Display the adaptive polling schedule of every category.
+    """
+    display_category_schedules(CategoryScheduleRepository.get_all_schedules())
+
+
+@app.command()
+def run_fake_ebay(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_FAKE_EBAY_PORT,
+    latency_seconds: float = 0.0,
+    latency_jitter_seconds: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    retry_after_seconds: int = 1,
+    items_per_seller: int = DEFAULT_ITEMS_PER_SELLER,
+    seed: int = 0,
+):
+    """
+    Serve deterministic fake eBay data for offline load tests.
+
+    Run fetch-updates against it with EBAY_API_BASE_URL=http://{host}:{port}.
+    {error_rate} and {rate_limit_rate} are the share of API requests answered
+    with 500 and 429.
+    """
+    config = FakeEbayConfig(
+        latency_seconds=latency_seconds,
+        latency_jitter_seconds=latency_jitter_seconds,
+        error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate,
+        retry_after_seconds=retry_after_seconds,
+        items_per_seller=items_per_seller,
+        seed=seed,
+    )
+    create_fake_ebay_app(config).run(host=host, port=port, threaded=True)
+
+
 @app.command()
 def run_flask(host: str | None = None, port: int | None = None, debug: bool = False):
     flask_app = create_app()
@@ -1,8 +1,23 @@
+import os
+from time import perf_counter
+
 import typer
 from rich import print
 
-from ebay_watchlist.db.repositories import CategoryRepository, SellerRepository
-from ebay_watchlist.db.utils import create_tables, drop_tables
+from ebay_watchlist.db.repositories import (
+    CategoryRepository,
+    CategoryTreeRepository,
+    OAuthTokenRepository,
+    SellerRepository,
+)
+from ebay_watchlist.db.utils import (
+    create_tables,
+    drop_tables,
+    rebuild_item_rollups,
+    rebuild_item_search_indexes,
+    vacuum_database,
+)
+from ebay_watchlist.ebay.api import DEFAULT_API_BASE_URL, EbayAPI
 from ebay_watchlist.ebay.categories import CATEGORY_MUSICAL_INSTRUMENTS_AND_DJ_EQUIPMENT
 
 management_app = typer.Typer(no_args_is_help=True)
@@ -71,6 +86,86 @@ def add_category(category_id: int):
     )
 
 
+@management_app.command()
+def sync_category_tree(marketplace_id: str | None = None):
+    """
+    Downloads the full eBay category tree of a marketplace into the local DB.
+    Category suggestions and names are then served without calling eBay.
+    """
+    client_id = os.getenv("EBAY_CLIENT_ID")
+    client_secret = os.getenv("EBAY_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        raise ValueError("EBAY_CLIENT_ID and EBAY_CLIENT_SECRET must be set")
+
+    resolved_marketplace_id = marketplace_id or os.getenv(
+        "EBAY_MARKETPLACE_ID", "EBAY_GB"
+    )
+    api = EbayAPI(
+        client_id,
+        client_secret,
+        resolved_marketplace_id,
+        token_store=OAuthTokenRepository,
+        base_url=os.getenv("EBAY_API_BASE_URL", DEFAULT_API_BASE_URL),
+    )
+
+    started_at = perf_counter()
+    tree = api.get_category_tree(marketplace_id=resolved_marketplace_id)
+    category_count = CategoryTreeRepository.replace_tree(
+        marketplace_id=resolved_marketplace_id,
+        category_tree_id=tree["category_tree_id"],
+        category_tree_version=tree["category_tree_version"],
+        categories=tree["categories"],
+    )
+    print(
+        f"[bold green]:heavy_check_mark:[/bold green] synced {category_count} "
+        f"categories of tree {tree['category_tree_id']} "
+        f"(version {tree['category_tree_version']}) for {resolved_marketplace_id} "
+        f"in {perf_counter() - started_at:.1f}s"
+    )
+
+
+@management_app.command()
+def rebuild_rollups():
+    """
+    Recounts the analytics rollup tables from all the stored items.
+    Triggers keep them current afterwards; use this for backfills.
+    """
+    started_at = perf_counter()
+    bucket_count = rebuild_item_rollups()
+    print(
+        f"[bold green]:heavy_check_mark:[/bold green] rebuilt {bucket_count} "
+        f"rollup buckets in {perf_counter() - started_at:.1f}s"
+    )
+
+
+@management_app.command()
+def rebuild_search_indexes():
+    """
+    Rebuilds the title search indexes from the item table. Needed after a
+    restore or any VACUUM run outside the vacuum command.
+    """
+    started_at = perf_counter()
+    rebuild_item_search_indexes()
+    print(
+        "[bold green]:heavy_check_mark:[/bold green] rebuilt the title search "
+        f"indexes in {perf_counter() - started_at:.1f}s"
+    )
+
+
+@management_app.command()
+def vacuum():
+    """
+    VACUUMs the database and rebuilds the title search indexes, whose rows are
+    keyed on item rowids that VACUUM may renumber.
+    """
+    started_at = perf_counter()
+    vacuum_database()
+    print(
+        "[bold green]:heavy_check_mark:[/bold green] vacuumed the database in "
+        f"{perf_counter() - started_at:.1f}s"
+    )
+
+
 @management_app.command()
 def load_defaults():
     """
@@ -1,9 +1,102 @@
 import os
+import sqlite3
+import threading
+from pathlib import Path
 
 from dotenv import load_dotenv
 from playhouse.sqlite_ext import SqliteExtDatabase
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL", ":memory:")
+# Optional snapshot copy of the DB that read-only connections open instead.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
 
-database = SqliteExtDatabase(DATABASE_URL)
+# Applied on every new connection. WAL lets the API workers keep reading while
+# the daemon writes; each value can be overridden with SQLITE_<PRAGMA>.
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,  # milliseconds
+    "cache_size": -64000,  # negative means KiB, so 64MB
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+
+def sqlite_pragmas_from_env() -> dict[str, str | int]:
+    """
+    {DEFAULT_SQLITE_PRAGMAS} with SQLITE_<PRAGMA> environment overrides,
+    e.g. SQLITE_SYNCHRONOUS=full.
+    """
+    return {
+        pragma: os.getenv(f"SQLITE_{pragma.upper()}", default)
+        for pragma, default in DEFAULT_SQLITE_PRAGMAS.items()
+    }
+
+
+class WatchlistDatabase(SqliteExtDatabase):
+    """
+    SQLite database whose per-thread connection can be opened read-only.
+
+    connect(read_only=True) opens the file with mode=ro and PRAGMA query_only,
+    reading {read_database} instead of the main file when one is configured.
+    Models stay bound to this single object either way.
+    """
+
+    def init(self, database, read_database: str | None = None, **kwargs):
+        self.read_database = read_database
+        self._connection_mode = threading.local()
+        super().init(database, **kwargs)
+
+    def connect(self, reuse_if_open: bool = False, read_only: bool = False) -> bool:
+        # Connections and their mode are per thread, no locking needed here.
+        if not self.is_closed():
+            if not reuse_if_open or self.is_read_only() == read_only:
+                return super().connect(reuse_if_open=reuse_if_open)
+            # Same thread, other mode: swap the idle connection.
+            self.close()
+        self._connection_mode.read_only = read_only
+        return super().connect(reuse_if_open=reuse_if_open)
+
+    def is_read_only(self) -> bool:
+        return not self.is_closed() and getattr(
+            self._connection_mode, "read_only", False
+        )
+
+    def _connect(self):
+        path = self.read_database or self.database
+        if not getattr(self._connection_mode, "read_only", False) or path == ":memory:":
+            return super()._connect()
+
+        conn = sqlite3.connect(
+            f"{Path(path).resolve().as_uri()}?mode=ro",
+            uri=True,
+            timeout=self._timeout,
+            isolation_level=None,
+            **self.connect_params,
+        )
+        try:
+            self._add_conn_hooks(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _set_pragmas(self, conn):
+        if not getattr(self._connection_mode, "read_only", False):
+            return super()._set_pragmas(conn)
+
+        # Switching the journal mode is a write; readers use whatever the file has.
+        cursor = conn.cursor()
+        for pragma, value in self._pragmas:
+            if pragma != "journal_mode":
+                cursor.execute(f"PRAGMA {pragma} = {value};")
+        cursor.execute("PRAGMA query_only = 1;")
+        cursor.close()
+
+
+database = WatchlistDatabase(
+    DATABASE_URL,
+    read_database=DATABASE_READ_URL,
+    pragmas=sqlite_pragmas_from_env(),
+)
@@ -3,14 +3,16 @@ from datetime import datetime
 from peewee import (
     BooleanField,
     CharField,
+    CompositeKey,
     DateTimeField,
     DecimalField,
+    FloatField,
     ForeignKeyField,
     IntegerField,
     Model,
     TextField,
 )
-from playhouse.sqlite_ext import JSONField
+from playhouse.sqlite_ext import FTS5Model, JSONField, SearchField
 
 from ebay_watchlist.db.config import database
 
@@ -20,14 +22,34 @@ class BaseModel(Model):
         database = database
 
 
+class Seller(BaseModel):
+    """
+    Distinct seller usernames, referenced by item.seller_key. {item_count} is
+    kept current by triggers (db/utils.py).
+    """
+
+    name = CharField(unique=True)
+    item_count = IntegerField(default=0)
+
+
+class Category(BaseModel):
+    """
+    Distinct item category names, referenced by item.category_key. Not to be
+    confused with CategoryTreeNode, the synced category tree.
+    """
+
+    name = CharField(max_length=512, unique=True)
+    item_count = IntegerField(default=0)
+
+
 class Item(BaseModel):
     item_id = CharField(primary_key=True)
     title = TextField()
     scraped_category_id = IntegerField()
     category_id = IntegerField()
-    category_name = CharField(max_length=512)
+    category = ForeignKeyField(Category, column_name="category_key", backref="items")
     image_url = TextField(null=True)
-    seller_name = CharField()
+    seller = ForeignKeyField(Seller, column_name="seller_key", backref="items")
     condition = TextField(null=True)
     shipping_options = JSONField(null=True)
     buying_options = JSONField(null=True)
@@ -42,6 +64,77 @@ class Item(BaseModel):
     end_date = DateTimeField(index=True)
     db_creation_date = DateTimeField(default=datetime.now, index=True)
     db_update_date = DateTimeField(default=datetime.now)
+    content_fingerprint = CharField(null=True, max_length=32)
+    # Copies of ItemState's flags, kept in sync by triggers in db/utils.py so
+    # listing queries can filter and sort on a single table.
+    hidden = BooleanField(default=False)
+    favorite = BooleanField(default=False)
+
+    # Item queries in ItemRepository join both dimensions in, so these don't
+    # cost a query per item.
+    @property
+    def seller_name(self) -> str:
+        return self.seller.name
+
+    @property
+    def category_name(self) -> str:
+        return self.category.name
+
+
+class ItemTitleIndex(FTS5Model):
+    """
+    Trigram index over Item titles for substring search, kept in sync by the
+    triggers in db/utils.py. Rows are keyed on Item's implicit rowid, so the
+    index must be rebuilt after a VACUUM or restore (see vacuum_database).
+    """
+
+    title = SearchField()
+
+    class Meta:
+        database = database
+        options = {"content": Item, "tokenize": "trigram"}
+
+
+class ItemTitleWordIndex(FTS5Model):
+    """
+    Word index over Item titles for word/prefix search ranked by bm25.
+    """
+
+    title = SearchField()
+
+    class Meta:
+        database = database
+        options = {
+            "content": Item,
+            "prefix": "2 3",
+            "tokenize": "unicode61 remove_diacritics 2",
+        }
+
+
+class TableGeneration(BaseModel):
+    """
+    Write counter per table, bumped by triggers (db/utils.py) so per-process
+    caches notice changes made by any connection, including the daemon's.
+    """
+
+    table_name = CharField(primary_key=True, max_length=64)
+    generation = IntegerField(default=0)
+
+
+class ItemRollup(BaseModel):
+    """
+    Item counts per bucket of a dimension (creation hour, end hour, scraped
+    category and category pair), maintained by triggers (db/utils.py) for the
+    analytics page. Per seller and per category counts are the item_count of
+    Seller and Category.
+    """
+
+    dimension = CharField(max_length=16)
+    bucket = CharField(max_length=512)
+    item_count = IntegerField(default=0)
+
+    class Meta:
+        primary_key = CompositeKey("dimension", "bucket")
 
 
 class ItemState(BaseModel):
@@ -78,3 +171,62 @@ class WatchedSeller(BaseModel):
 class WatchedCategory(BaseModel):
     category_id = IntegerField(unique=True)
     enabled = BooleanField(default=True)
+
+
+class OAuthToken(BaseModel):
+    cache_key = CharField(primary_key=True)
+    access_token = TextField()
+    expires_at = DateTimeField()
+    db_update_date = DateTimeField(default=datetime.now)
+
+
+class CategorySchedule(BaseModel):
+    category_id = IntegerField(primary_key=True)
+    new_items_per_hour = FloatField(default=0.0)
+    interval_seconds = IntegerField()
+    last_polled_at = DateTimeField(null=True)
+    next_poll_at = DateTimeField(index=True)
+    db_update_date = DateTimeField(default=datetime.now)
+
+
+class CategoryTreeSync(BaseModel):
+    marketplace_id = CharField(primary_key=True, max_length=32)
+    category_tree_id = CharField(max_length=32)
+    category_tree_version = CharField(null=True, max_length=32)
+    category_count = IntegerField(default=0)
+    synced_at = DateTimeField(default=datetime.now)
+
+
+class CategoryTreeNode(BaseModel):
+    """
+    One node of the local mirror of a marketplace's eBay category tree.
+    """
+
+    category_id = IntegerField(primary_key=True)
+    name = CharField(max_length=512)
+    parent_id = IntegerField(null=True, index=True)
+    level = IntegerField()
+    leaf = BooleanField(default=False)
+    path = TextField()
+
+    class Meta:
+        # Named before the model was, kept so synced trees survive the rename.
+        table_name = "ebaycategory"
+
+
+class CategoryTreeNodeIndex(FTS5Model):
+    """
+    Full text index over CategoryTreeNode names, rebuilt after every tree sync.
+    """
+
+    name = SearchField()
+
+    class Meta:
+        database = database
+        table_name = "ebaycategoryindex"
+        options = {
+            "content": CategoryTreeNode,
+            "content_rowid": CategoryTreeNode.category_id,
+            "prefix": "2 3",
+            "tokenize": "unicode61",
+        }
@@ -1,15 +1,94 @@
+import fcntl
+import hashlib
+import re
+import threading
+from collections import defaultdict
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
 
-from peewee import DoesNotExist, fn
+from peewee import EXCLUDED, JOIN, SQL, Column, DoesNotExist, Field, fn
 
+from ebay_watchlist.db.config import database
 from ebay_watchlist.db.models import (
+    Category,
+    CategorySchedule,
+    CategoryTreeNode,
+    CategoryTreeNodeIndex,
+    CategoryTreeSync,
     Item,
     ItemNote,
+    ItemRollup,
     ItemState,
+    ItemTitleIndex,
+    ItemTitleWordIndex,
+    OAuthToken,
+    Seller,
+    TableGeneration,
     WatchedCategory,
     WatchedSeller,
 )
-from ebay_watchlist.ebay.dtos import EbayItem
+from ebay_watchlist.db.suggestions import SuggestionIndex
+from ebay_watchlist.ebay.dtos import EbayItem, ItemRecord, ParsedItem
+
+# Conservative default for SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds.
+SQLITE_MAX_VARIABLES = 999
+# Mutable listing fields; a write is skipped when none of them changed.
+FINGERPRINT_FIELDS = (
+    "title",
+    "image_url",
+    "price",
+    "price_currency",
+    "current_bid_price",
+    "current_bid_price_currency",
+    "bid_count",
+    "end_date",
+)
+# Hashed by numeric value, so "10.50" from eBay matches 10.5 read back from the DB.
+FINGERPRINT_DECIMAL_FIELDS = {"price", "current_bid_price"}
+# Columns a manual refresh from a getItem snapshot may change.
+REFRESHED_ITEM_FIELDS = (
+    Item.price,
+    Item.price_currency,
+    Item.current_bid_price,
+    Item.current_bid_price_currency,
+    Item.bid_count,
+    Item.end_date,
+    Item.creation_date,
+    Item.web_url,
+    Item.db_update_date,
+    Item.content_fingerprint,
+)
+# Category tree rows are inserted in chunks that stay under SQLITE_MAX_VARIABLES.
+CATEGORY_TREE_INSERT_BATCH_SIZE = 100
+_SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+# "substring" keeps LIKE '%q%' semantics, "words" matches word prefixes and can
+# be ranked by bm25 with sort="relevance".
+SEARCH_MODE_SUBSTRING = "substring"
+SEARCH_MODE_WORDS = "words"
+SEARCH_MODES = {SEARCH_MODE_SUBSTRING, SEARCH_MODE_WORDS}
+# The trigram tokenizer cannot match anything shorter than one trigram.
+TRIGRAM_MIN_QUERY_LENGTH = 3
+_ITEM_ROWID = Column(Item, "rowid")
+# Generated column, see create_item_effective_price_column in db/utils.py.
+_ITEM_EFFECTIVE_PRICE = Column(Item, "effective_price")
+# ItemRollup dimensions, see ITEM_ROLLUP_DIMENSIONS in db/utils.py.
+ROLLUP_CREATED_HOUR = "created_hour"
+ROLLUP_ENDING_HOUR = "ending_hour"
+ROLLUP_SCRAPED_CATEGORY = "scraped_category"
+ROLLUP_HOUR_FORMAT = "%Y-%m-%d %H:00:00"
+# Per-worker (item generation, seller index, category index), keyed by DB path.
+_suggestion_indexes: dict[str, tuple[int, SuggestionIndex, SuggestionIndex]] = {}
+_suggestion_indexes_lock = threading.Lock()
+# Keyset pagination reads the rows after or before a cursor row's sort key.
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+CURSOR_DIRECTIONS = {CURSOR_NEXT, CURSOR_PREV}
+_SORT_KEY_ALIAS = "sort_key_{}"
+# OAuth refreshes of an in-memory DB can only race within this process.
+OAUTH_REFRESH_LOCK_SUFFIX = ".oauth-refresh.lock"
+_oauth_refresh_lock = threading.Lock()
 
 
 class ItemRepository:
@@ -24,42 +103,97 @@ class ItemRepository:
         include_ended: bool = False,
         only_last_24h: bool = False,
         reference_time: datetime | None = None,
+        search_mode: str = SEARCH_MODE_SUBSTRING,
     ):
         query = Item.select()
         now = reference_time or datetime.now()
 
+        # Names are looked up in the small dimension tables first; an IN list
+        # of keys keeps the planner on the listing indexes.
         if seller_names:
-            query = query.where(Item.seller_name.in_(seller_names))
+            seller_keys = Seller.select(Seller.id).where(Seller.name.in_(seller_names))
+            query = query.where(Item.seller.in_([seller.id for seller in seller_keys]))
 
         if category_names:
-            query = query.where(Item.category_name.in_(category_names))
+            category_keys = Category.select(Category.id).where(
+                Category.name.in_(category_names)
+            )
+            query = query.where(
+                Item.category.in_([category.id for category in category_keys])
+            )
 
         if scraped_category_ids:
             query = query.where(Item.scraped_category_id.in_(scraped_category_ids))
 
         if search_query:
-            query = query.where(Item.title.contains(search_query))
+            query = ItemRepository._apply_title_search(query, search_query, search_mode)
 
         if include_favorites_only:
-            favorite_item_ids = (
-                ItemState.select(ItemState.item_id).where(ItemState.favorite)
-            )
-            query = query.where(Item.item_id.in_(favorite_item_ids))
+            query = query.where(Item.favorite == True)  # noqa: E712
 
         if not include_hidden:
-            hidden_item_ids = (
-                ItemState.select(ItemState.item_id).where(ItemState.hidden)
-            )
-            query = query.where(Item.item_id.not_in(hidden_item_ids))
+            # An equality, not NOT hidden, so the listing indexes can use it.
+            query = query.where(Item.hidden == False)  # noqa: E712
 
         if not include_ended:
-            query = query.where(Item.end_date >= now)
+            # Most stored items are active. Without the hint, SQLite takes the
+            # range for a selective one and seeks the ending index, then sorts.
+            query = query.where(fn.likelihood(Item.end_date >= now, SQL("0.9")))
 
         if only_last_24h:
             query = query.where(Item.creation_date >= now - timedelta(hours=24))
 
         return query
 
+    @staticmethod
+    def _join_dimensions(query):
+        """
+        Adds each item's Seller and Category to {query}, so seller_name and
+        category_name read them without a query per item. LEFT joins keep item
+        the outer loop, walking the listing indexes in order.
+        """
+        return (
+            query.select_extend(Seller, Category)
+            .switch(Item)
+            .join(Seller, JOIN.LEFT_OUTER)
+            .switch(Item)
+            .join(Category, JOIN.LEFT_OUTER)
+            .switch(Item)
+        )
+
+    @staticmethod
+    def _word_search_expression(search_query: str) -> str | None:
+        tokens = _SEARCH_TOKEN_PATTERN.findall(search_query.lower())
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _apply_title_search(query, search_query: str, search_mode: str):
+        """
+        Title search through the FTS5 indexes. Words mode joins the word index so
+        the caller can order by its rank; queries without words fall back to
+        substring search, and substrings shorter than a trigram to LIKE.
+        """
+        if search_mode == SEARCH_MODE_WORDS:
+            match_expression = ItemRepository._word_search_expression(search_query)
+            if match_expression is not None:
+                return query.join(
+                    ItemTitleWordIndex, on=(ItemTitleWordIndex.rowid == _ITEM_ROWID)
+                ).where(ItemTitleWordIndex.match(match_expression))
+
+        if len(search_query) < TRIGRAM_MIN_QUERY_LENGTH:
+            return query.where(Item.title.contains(search_query))
+
+        phrase = '"{}"'.format(search_query.replace('"', '""'))
+        return query.where(
+            _ITEM_ROWID.in_(
+                ItemTitleIndex.select(ItemTitleIndex.rowid).where(
+                    ItemTitleIndex.match(phrase)
+                )
+            )
+        )
+
     @staticmethod
     def get_filtered_items(
         seller_names: list[str] | None = None,
@@ -74,7 +208,15 @@ class ItemRepository:
         reference_time: datetime | None = None,
         limit: int = 50,
         offset: int = 0,
+        search_mode: str = SEARCH_MODE_SUBSTRING,
+        keyset: list | None = None,
+        keyset_direction: str = CURSOR_NEXT,
     ) -> list[Item]:
+        """
+        One page of items. With {keyset} (a get_sort_key value) the page starts
+        right after that row, or ends right before it for CURSOR_PREV, and
+        {offset} is ignored. Pages are always returned in display order.
+        """
         query = ItemRepository._build_filtered_query(
             seller_names=seller_names,
             category_names=category_names,
@@ -85,26 +227,118 @@ class ItemRepository:
             include_ended=include_ended,
             only_last_24h=only_last_24h,
             reference_time=reference_time,
+            search_mode=search_mode,
         )
 
-        if sort in {"ending_soon", "ending_soon_active"}:
-            query = query.order_by(Item.end_date.asc())
-        elif sort == "price_low":
-            query = query.order_by(
-                fn.COALESCE(Item.current_bid_price, Item.price).asc(),
-                Item.creation_date.desc(),
+        sort_keys = ItemRepository._sort_keys(sort, search_query, search_mode)
+        # Previous pages are read backwards from the cursor, then flipped.
+        reverse = keyset_direction == CURSOR_PREV
+        query = ItemRepository._join_dimensions(query).select_extend(
+            *(
+                expression.alias(_SORT_KEY_ALIAS.format(index))
+                for index, (expression, _) in enumerate(sort_keys)
             )
-        elif sort == "price_high":
-            query = query.order_by(
-                fn.COALESCE(Item.current_bid_price, Item.price).desc(),
-                Item.creation_date.desc(),
+        ).order_by(
+            *(
+                expression.desc() if descending != reverse else expression.asc()
+                for expression, descending in sort_keys
             )
-        elif sort == "bids_desc":
-            query = query.order_by(Item.bid_count.desc(), Item.creation_date.desc())
+        )
+        if keyset is None:
+            return query.offset(offset).limit(limit)
+
+        if len(keyset) != len(sort_keys):
+            raise ValueError(f"cursor does not match sort {sort!r}")
+        query = query.where(
+            ItemRepository._keyset_condition(sort_keys, keyset, keyset_direction)
+        ).limit(limit)
+        if keyset_direction == CURSOR_PREV:
+            return list(query)[::-1]
+        return query
+
+    @staticmethod
+    def _sort_keys(sort: str, search_query: str | None, search_mode: str):
+        """
+        (expression, descending) pairs for a sort. The item_id tiebreak gives
+        every row a unique position, which keyset pagination relies on.
+        """
+        ranked_search = (
+            sort == "relevance"
+            and search_mode == SEARCH_MODE_WORDS
+            and bool(search_query)
+            and ItemRepository._word_search_expression(search_query) is not None
+        )
+        price = _ITEM_EFFECTIVE_PRICE
+        if ranked_search:
+            return [
+                (ItemTitleWordIndex.rank(), False),
+                (Item.creation_date, True),
+                (Item.item_id, True),
+            ]
+        if sort in {"ending_soon", "ending_soon_active"}:
+            return [(Item.end_date, False), (Item.item_id, False)]
+        if sort == "price_low":
+            return [(price, False), (Item.creation_date, True), (Item.item_id, True)]
+        if sort == "price_high":
+            return [(price, True), (Item.creation_date, True), (Item.item_id, True)]
+        if sort == "bids_desc":
+            return [
+                (Item.bid_count, True),
+                (Item.creation_date, True),
+                (Item.item_id, True),
+            ]
+        return [(Item.creation_date, True), (Item.item_id, True)]
+
+    @staticmethod
+    def _keyset_condition(sort_keys, keyset: list, direction: str):
+        """
+        Rows strictly after {keyset} in the sort order, or before it for
+        CURSOR_PREV. SQLite sorts NULL below every value, so NULL prices come
+        first ascending and last descending.
+        """
+        reverse = direction == CURSOR_PREV
+        condition = None
+        equal_prefix = None
+        for (expression, descending), value in zip(sort_keys, keyset):
+            nullable = not isinstance(expression, Field) or expression.null
+            if descending != reverse:
+                if value is None:
+                    after = None
+                elif nullable:
+                    after = (expression < value) | expression.is_null()
+                else:
+                    after = expression < value
+            elif value is None:
+                after = expression.is_null(False)
+            else:
+                after = expression > value
+            if after is not None:
+                term = after if equal_prefix is None else equal_prefix & after
+                condition = term if condition is None else condition | term
+            equal = expression.is_null() if value is None else expression == value
+            equal_prefix = equal if equal_prefix is None else equal_prefix & equal
+
+        # Redundant, but unlike the OR chain above a plain range on the leading
+        # key lets SQLite seek into the sort index instead of scanning to it.
+        expression, descending = sort_keys[0]
+        value = keyset[0]
+        if value is None:
+            bound = expression.is_null() if descending != reverse else None
+        elif descending != reverse:
+            bound = expression <= value
+            if not isinstance(expression, Field) or expression.null:
+                bound = bound | expression.is_null()
         else:
-            query = query.order_by(Item.creation_date.desc())
+            bound = expression >= value
+        return condition if bound is None else bound & condition
 
-        return query.offset(offset).limit(limit)
+    @staticmethod
+    def get_sort_key(item: Item) -> list:
+        """Sort key values selected by get_filtered_items, used to build cursors."""
+        values = []
+        while hasattr(item, _SORT_KEY_ALIAS.format(len(values))):
+            values.append(getattr(item, _SORT_KEY_ALIAS.format(len(values))))
+        return values
 
     @staticmethod
     def count_filtered_items(
@@ -118,6 +352,7 @@ class ItemRepository:
         include_ended: bool = False,
         only_last_24h: bool = False,
         reference_time: datetime | None = None,
+        search_mode: str = SEARCH_MODE_SUBSTRING,
     ) -> int:
         query = ItemRepository._build_filtered_query(
             seller_names=seller_names,
@@ -129,173 +364,394 @@ class ItemRepository:
             include_ended=include_ended,
             only_last_24h=only_last_24h,
             reference_time=reference_time,
+            search_mode=search_mode,
         )
         return query.count()
 
+    @staticmethod
+    def get_generation() -> int:
+        """
+        Counter bumped by every item write that can change a filter's matches.
+        """
+        row = TableGeneration.get_or_none(TableGeneration.table_name == "item")
+        return row.generation if row is not None else 0
+
+    @staticmethod
+    def get_dimension_keys(
+        model: type[Seller] | type[Category], names: set[str]
+    ) -> dict[str, int]:
+        """
+        Seller or Category keys of {names}, adding the names not stored yet.
+        """
+        keys: dict[str, int] = {}
+        ordered_names = sorted(names)
+        for start in range(0, len(ordered_names), SQLITE_MAX_VARIABLES):
+            chunk = ordered_names[start : start + SQLITE_MAX_VARIABLES]
+            model.insert_many(
+                [{"name": name} for name in chunk]
+            ).on_conflict_ignore().execute()
+            rows = model.select(model.id, model.name).where(model.name.in_(chunk))
+            keys.update((str(row.name), int(row.id)) for row in rows)
+        return keys
+
+    @staticmethod
+    def _get_category_names_by_key() -> dict[int, str]:
+        return {
+            int(category.id): str(category.name)
+            for category in Category.select(Category.id, Category.name)
+        }
+
+    @staticmethod
+    def _get_scraped_category_rollup() -> list[tuple[int, int, int]]:
+        """
+        (scraped_category_id, category_key, item_count) for every pair with items.
+        """
+        rows = ItemRollup.select(ItemRollup.bucket, ItemRollup.item_count).where(
+            ItemRollup.dimension == ROLLUP_SCRAPED_CATEGORY
+        )
+        rollup = []
+        for row in rows:
+            scraped_category_id, _, category_key = row.bucket.partition(":")
+            rollup.append((int(scraped_category_id), int(category_key), row.item_count))
+        return rollup
+
     @staticmethod
     def get_distinct_seller_names() -> list[str]:
         query = (
-            Item.select(Item.seller_name)
-            .distinct()
-            .order_by(Item.seller_name.asc())
+            Seller.select(Seller.name)
+            .where(Seller.item_count > 0)
+            .order_by(Seller.name.asc())
         )
-        return [str(item.seller_name) for item in query if item.seller_name]
+        return [str(seller.name) for seller in query if seller.name]
 
     @staticmethod
-    def get_seller_suggestions(query: str, limit: int = 15) -> list[str]:
-        normalized = query.strip().lower()
-        if not normalized:
-            return []
+    def get_suggestion_indexes() -> tuple[SuggestionIndex, SuggestionIndex]:
+        """
+        In-memory (seller, category) name indexes, rebuilt from the Seller and
+        Category tables the first time they're needed after the item
+        generation moved.
+        """
+        generation = ItemRepository.get_generation()
+        with _suggestion_indexes_lock:
+            cached = _suggestion_indexes.get(database.database)
+        if cached is not None and cached[0] == generation:
+            return cached[1], cached[2]
+
+        seller_counts: dict[str, dict[int | None, int]] = {
+            str(seller.name): {None: seller.item_count}
+            for seller in Seller.select().where(Seller.item_count > 0)
+        }
+        category_names = ItemRepository._get_category_names_by_key()
+        category_counts: defaultdict[str, dict[int | None, int]] = defaultdict(dict)
+        for scraped_category_id, category_key, item_count in (
+            ItemRepository._get_scraped_category_rollup()
+        ):
+            category_counts[category_names[category_key]][scraped_category_id] = item_count
+
+        indexes = SuggestionIndex(seller_counts), SuggestionIndex(category_counts)
+        with _suggestion_indexes_lock:
+            _suggestion_indexes[database.database] = (generation, *indexes)
+        return indexes
 
-        seller_query = (
-            Item.select(Item.seller_name)
-            .where(fn.LOWER(Item.seller_name).contains(normalized))
-            .distinct()
-            .order_by(Item.seller_name.asc())
-            .limit(limit)
-        )
-        return [str(item.seller_name) for item in seller_query if item.seller_name]
+    @staticmethod
+    def get_seller_suggestions(
+        query: str, limit: int = 15, rank_by_count: bool = False
+    ) -> list[str]:
+        seller_index, _ = ItemRepository.get_suggestion_indexes()
+        return seller_index.search(query, limit=limit, rank_by_count=rank_by_count)
 
     @staticmethod
     def get_distinct_category_names(
         scraped_category_ids: list[int] | None = None,
     ) -> list[str]:
-        query = Item.select(Item.category_name)
-        if scraped_category_ids:
-            query = query.where(Item.scraped_category_id.in_(scraped_category_ids))
-        query = query.distinct().order_by(Item.category_name.asc())
-        return [str(item.category_name) for item in query if item.category_name]
+        if not scraped_category_ids:
+            query = (
+                Category.select(Category.name)
+                .where(Category.item_count > 0)
+                .order_by(Category.name.asc())
+            )
+            return [str(category.name) for category in query if category.name]
+
+        category_names = ItemRepository._get_category_names_by_key()
+        return sorted(
+            {
+                category_names[category_key]
+                for scraped_category_id, category_key, _ in (
+                    ItemRepository._get_scraped_category_rollup()
+                )
+                if scraped_category_id in scraped_category_ids
+            }
+            - {""}
+        )
 
     @staticmethod
     def get_category_suggestions(
         query: str,
         scraped_category_ids: list[int] | None = None,
         limit: int = 15,
+        rank_by_count: bool = False,
     ) -> list[str]:
-        normalized = query.strip().lower()
-        if not normalized:
-            return []
-
-        category_query = Item.select(Item.category_name).where(
-            fn.LOWER(Item.category_name).contains(normalized)
+        _, category_index = ItemRepository.get_suggestion_indexes()
+        return category_index.search(
+            query,
+            limit=limit,
+            scopes=scraped_category_ids or None,
+            rank_by_count=rank_by_count,
         )
-        if scraped_category_ids:
-            category_query = category_query.where(
-                Item.scraped_category_id.in_(scraped_category_ids)
-            )
-        category_query = (
-            category_query.distinct().order_by(Item.category_name.asc()).limit(limit)
-        )
-        return [str(item.category_name) for item in category_query if item.category_name]
 
     @staticmethod
     def get_distinct_scraped_category_ids() -> list[int]:
-        query = (
-            Item.select(Item.scraped_category_id)
-            .distinct()
-            .order_by(Item.scraped_category_id.asc())
-        )
-        return [int(item.scraped_category_id) for item in query]
+        return sorted({row[0] for row in ItemRepository._get_scraped_category_rollup()})
 
     @staticmethod
     def get_scraped_category_suggestions() -> list[tuple[int, str]]:
-        query = (
-            Item.select(
-                Item.scraped_category_id,
-                fn.MIN(Item.category_name).alias("category_label"),
-            )
-            .group_by(Item.scraped_category_id)
-            .order_by(Item.scraped_category_id.asc())
-        )
-        return [
-            (
-                int(item.scraped_category_id),
-                str(getattr(item, "category_label")),
-            )
-            for item in query
-        ]
+        """
+        Names come from the synced category tree; categories it does not know
+        fall back to a label taken from their items.
+        """
+        rollup = ItemRepository._get_scraped_category_rollup()
+        scraped_category_ids = sorted({row[0] for row in rollup})
+        names = CategoryTreeRepository.get_category_names(scraped_category_ids)
+        if len(names) < len(scraped_category_ids):
+            category_names = ItemRepository._get_category_names_by_key()
+            item_labels: defaultdict[int, list[str]] = defaultdict(list)
+            for scraped_category_id, category_key, _ in rollup:
+                item_labels[scraped_category_id].append(category_names[category_key])
+            names = {
+                scraped_category_id: min(labels)
+                for scraped_category_id, labels in item_labels.items()
+            } | names
+
+        return [(category_id, names[category_id]) for category_id in scraped_category_ids]
 
     @staticmethod
     def get_category_name_by_id(category_id: int) -> str | None:
-        item = (
-            Item.select(Item.category_name)
+        category_name = CategoryTreeRepository.get_category_names([category_id]).get(
+            category_id
+        )
+        if category_name is not None:
+            return category_name
+
+        category = (
+            Category.select(Category.name)
+            .join(Item)
             .where(Item.category_id == category_id)
             .order_by(Item.creation_date.desc())
             .first()
         )
-        if item is None:
+        if category is None:
             return None
-        return str(item.category_name)
+        return str(category.name)
 
     @staticmethod
-    def create_or_update_item_from_ebay_item_dto(
-        item_dto: EbayItem, scraped_category_id: int
-    ) -> Item:
-        db_item = Item.get_or_none(item_id=item_dto.item_id)
-
-        force_insert = False
-        if db_item is None:
-            db_item = Item()
-            force_insert = True
-
-        db_item.item_id = item_dto.item_id
-        db_item.title = item_dto.title
+    def _build_item_row(
+        item_dto: ParsedItem, scraped_category_id: int
+    ) -> dict:
+        item = (
+            item_dto
+            if isinstance(item_dto, ItemRecord)
+            else ItemRecord.from_ebay_item(item_dto)
+        )
 
         # eBay payloads can omit or mismatch category ids; keep writes resilient.
-        resolved_category_id = item_dto.main_category
+        resolved_category_id = item.main_category
         if resolved_category_id is None:
-            if item_dto.categories:
-                resolved_category_id = item_dto.categories[0].categoryId
+            if item.categories:
+                resolved_category_id = item.categories[0][0]
             else:
                 resolved_category_id = scraped_category_id
 
-        db_item.category_id = int(resolved_category_id)
+        category_id = int(resolved_category_id)
 
-        if item_dto.main_category is None and item_dto.categories:
-            db_item.category_name = item_dto.categories[0].categoryName
+        if item.main_category is None and item.categories:
+            category_name = item.categories[0][1]
         else:
-            db_item.category_name = next(
+            category_name = next(
                 (
-                    category.categoryName
-                    for category in item_dto.categories
-                    if category.categoryId == db_item.category_id
+                    name
+                    for candidate_id, name in item.categories
+                    if candidate_id == category_id
                 ),
                 "Unknown",
             )
 
-        db_item.scraped_category_id = scraped_category_id
-        db_item.image_url = item_dto.image
-        db_item.seller_name = item_dto.seller.username
-        db_item.condition = item_dto.condition
-        db_item.shipping_options = item_dto.shipping_options
-        db_item.buying_options = item_dto.buying_options
-        if item_dto.price:
-            db_item.price = item_dto.price.value
-            db_item.price_currency = item_dto.price.currency
-        if item_dto.current_bid_price:
-            db_item.current_bid_price = item_dto.current_bid_price.value
-            db_item.current_bid_price_currency = item_dto.current_bid_price.currency
+        now = datetime.now()
+        return {
+            "item_id": item.item_id,
+            "title": item.title,
+            "scraped_category_id": scraped_category_id,
+            "category_id": category_id,
+            "category_name": category_name,
+            "image_url": item.image,
+            "seller_name": item.seller_name,
+            "condition": item.condition,
+            "shipping_options": item.shipping_options,
+            "buying_options": item.buying_options,
+            "price": item.price,
+            "price_currency": item.price_currency,
+            "current_bid_price": item.current_bid_price,
+            "current_bid_price_currency": item.current_bid_price_currency,
+            "bid_count": item.bid_count or 0,
+            "web_url": item.web_url,
+            # SQLite doesn't support timezone aware timestamps, the following is a bit hacky
+            # transforming aware datetimes to naive. It works because it's all UTC
+            "origin_date": item.origin_date.replace(tzinfo=None),
+            "creation_date": item.creation_date.replace(tzinfo=None),
+            "end_date": item.end_date.replace(tzinfo=None),
+            "db_creation_date": now,
+            "db_update_date": now,
+        }
 
-        db_item.bid_count = item_dto.bid_count or 0
-        db_item.web_url = item_dto.web_url
+    @staticmethod
+    def _content_fingerprint(row: dict) -> str:
+        """
+        Hash of the listing fields that change while an auction runs.
+        """
+        content = "\x1f".join(
+            ItemRepository._fingerprint_value(field_name, row[field_name])
+            for field_name in FINGERPRINT_FIELDS
+        )
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
-        # SQLite doesn't support timezone aware timestamps, the following is a bit hacky
-        # transforming aware datetimes to naive. It works because it's all UTC
-        db_item.origin_date = item_dto.origin_date.replace(tzinfo=None)
-        db_item.creation_date = item_dto.creation_date.replace(tzinfo=None)
-        db_item.end_date = item_dto.end_date.replace(tzinfo=None)
+    @staticmethod
+    def _fingerprint_value(field_name: str, value: object) -> str:
+        if value is None:
+            return ""
+        if field_name in FINGERPRINT_DECIMAL_FIELDS:
+            try:
+                return str(Decimal(str(value)).normalize())
+            except InvalidOperation:
+                pass
+        return str(value)
 
-        db_item.db_update_date = datetime.now()
+    @staticmethod
+    def upsert_items_from_ebay_item_dtos(
+        item_dtos: Sequence[ParsedItem], scraped_category_id: int
+    ) -> tuple[list[str], list[str], list[str]]:
+        """
+        Writes a batch of items with INSERT ... ON CONFLICT(item_id) DO UPDATE,
+        all inside a single transaction.
 
-        db_item.save(force_insert=force_insert)
+        Stored items whose content fingerprint is unchanged are skipped, so
+        re-polling an idle category writes nothing. Prices missing from the
+        payload keep their stored value, matching the per-item path.
+        Returns (inserted_ids, updated_ids, skipped_ids).
+        """
+        rows_by_id: dict[str, dict] = {}
+        for item_dto in item_dtos:
+            row = ItemRepository._build_item_row(item_dto, scraped_category_id)
+            row["content_fingerprint"] = ItemRepository._content_fingerprint(row)
+            rows_by_id[item_dto.item_id] = row
+        if not rows_by_id:
+            return [], [], []
+
+        # hidden/favorite are written by the ItemState triggers only.
+        update = {
+            field: EXCLUDED[field.column_name]
+            for field in Item._meta.sorted_fields
+            if field.name
+            not in {"item_id", "db_creation_date", "hidden", "favorite"}
+        }
+        for field in (
+            Item.price,
+            Item.price_currency,
+            Item.current_bid_price,
+            Item.current_bid_price_currency,
+        ):
+            update[field] = fn.COALESCE(EXCLUDED[field.column_name], field)
+
+        rows = list(rows_by_id.values())
+        chunk_size = max(1, SQLITE_MAX_VARIABLES // len(rows[0]))
+        stored_fingerprints: dict[str, str | None] = {}
+        with database.atomic():
+            # Rows carry seller and category names; the item stores their keys.
+            for field_name, model in (("seller", Seller), ("category", Category)):
+                names = [row.pop(f"{field_name}_name") for row in rows]
+                keys = ItemRepository.get_dimension_keys(model, set(names))
+                for row, name in zip(rows, names):
+                    row[field_name] = keys[name]
+
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start : start + chunk_size]
+                chunk_ids = [row["item_id"] for row in chunk]
+                chunk_fingerprints = {
+                    str(row.item_id): row.content_fingerprint
+                    for row in Item.select(
+                        Item.item_id, Item.content_fingerprint
+                    ).where(Item.item_id.in_(chunk_ids))
+                }
+                stored_fingerprints.update(chunk_fingerprints)
+
+                changed_rows = [
+                    row
+                    for row in chunk
+                    if row["item_id"] not in chunk_fingerprints
+                    or chunk_fingerprints[row["item_id"]] != row["content_fingerprint"]
+                ]
+                if not changed_rows:
+                    continue
+
+                Item.insert_many(changed_rows).on_conflict(
+                    conflict_target=[Item.item_id],
+                    update=update,
+                ).execute()
+
+        inserted_ids: list[str] = []
+        updated_ids: list[str] = []
+        skipped_ids: list[str] = []
+        for item_id, row in rows_by_id.items():
+            if item_id not in stored_fingerprints:
+                inserted_ids.append(item_id)
+            elif stored_fingerprints[item_id] == row["content_fingerprint"]:
+                skipped_ids.append(item_id)
+            else:
+                updated_ids.append(item_id)
 
-        return db_item
+        return inserted_ids, updated_ids, skipped_ids
+
+    @staticmethod
+    def save_refreshed_items(items: list[Item]) -> None:
+        """
+        Writes only the {REFRESHED_ITEM_FIELDS} of {items}, with their content
+        fingerprint recomputed, in one transaction. The other columns, such as
+        the trigger-maintained hidden/favorite copies, keep their stored values.
+        """
+        with database.atomic():
+            for item in items:
+                item.content_fingerprint = ItemRepository._content_fingerprint(
+                    {
+                        field_name: getattr(item, field_name)
+                        for field_name in FINGERPRINT_FIELDS
+                    }
+                )
+                item.save(only=REFRESHED_ITEM_FIELDS)
+
+    @staticmethod
+    def create_or_update_item_from_ebay_item_dto(
+        item_dto: EbayItem, scraped_category_id: int
+    ) -> Item:
+        ItemRepository.upsert_items_from_ebay_item_dtos([item_dto], scraped_category_id)
+        return Item.get_by_id(item_dto.item_id)
+
+    @staticmethod
+    def get_active_item_ids(reference_time: datetime | None = None) -> set[str]:
+        now = reference_time or datetime.now()
+        return {
+            str(row.item_id)
+            for row in Item.select(Item.item_id).where(Item.end_date >= now)
+        }
+
+    @staticmethod
+    def get_items_by_ids(item_ids: list[str]) -> list[Item]:
+        return ItemRepository._join_dimensions(Item.select()).where(
+            Item.item_id.in_(item_ids)
+        )
 
     @staticmethod
     def get_items_created_after_datetime(start_datetime: datetime) -> list[Item]:
         # TODO: Maybe return DTOs
         return (
-            Item.select()
+            ItemRepository._join_dimensions(Item.select())
             .where(Item.db_creation_date >= start_datetime)
             .order_by(Item.creation_date.desc())
         )
@@ -303,7 +759,11 @@ class ItemRepository:
     @staticmethod
     def get_latest_items(limit: int = 50) -> list[Item]:
         # TODO: Maybe return DTOs
-        return Item.select().order_by(Item.creation_date.desc()).limit(limit)
+        return (
+            ItemRepository._join_dimensions(Item.select())
+            .order_by(Item.creation_date.desc())
+            .limit(limit)
+        )
 
     @staticmethod
     def get_latest_items_for_scraped_category(
@@ -316,7 +776,7 @@ class ItemRepository:
         This filter is intended to be used to get items in the parent category
         """
         return (
-            Item.select()
+            ItemRepository._join_dimensions(Item.select())
             .where(Item.scraped_category_id == category_id)
             .order_by(Item.creation_date.desc())
             .limit(limit)
@@ -331,7 +791,7 @@ class ItemRepository:
         This filter is intended to be used to get items in the leaf category
         """
         return (
-            Item.select()
+            ItemRepository._join_dimensions(Item.select())
             .where(Item.category_id == category_id)
             .order_by(Item.creation_date.desc())
             .limit(limit)
@@ -340,8 +800,8 @@ class ItemRepository:
     @staticmethod
     def get_latest_items_for_seller(seller_name: str, limit: int = 50) -> list[Item]:
         return (
-            Item.select()
-            .where(Item.seller_name == seller_name)
+            ItemRepository._join_dimensions(Item.select())
+            .where(Seller.name == seller_name)
             .order_by(Item.creation_date.desc())
             .limit(limit)
         )
@@ -425,61 +885,76 @@ class ItemRepository:
         next_day = current_time + timedelta(days=1)
         last_7_days_start = current_time - timedelta(days=7)
 
-        total_items = Item.select().count()
-        active_items = Item.select().where(Item.end_date >= current_time).count()
-        ending_soon_items = (
-            Item.select()
-            .where((Item.end_date >= current_time) & (Item.end_date < next_day))
-            .count()
+        # Whole hours come from the ItemRollup buckets; only the partial hours
+        # at the edges of a time window are counted on the (indexed) item rows.
+        def hour_start(value: datetime) -> datetime:
+            return value.replace(minute=0, second=0, microsecond=0)
+
+        def bucket_total(dimension: str, start: datetime, end: datetime | None) -> int:
+            query = ItemRollup.select(fn.SUM(ItemRollup.item_count)).where(
+                ItemRollup.dimension == dimension,
+                ItemRollup.bucket >= start.strftime(ROLLUP_HOUR_FORMAT),
+            )
+            if end is not None:
+                query = query.where(
+                    ItemRollup.bucket < end.strftime(ROLLUP_HOUR_FORMAT)
+                )
+            return int(query.scalar() or 0)
+
+        def rows_between(field: Field, start: datetime, end: datetime) -> int:
+            if end <= start:
+                return 0
+            return Item.select().where((field >= start) & (field < end)).count()
+
+        current_hour_end = hour_start(current_time) + timedelta(hours=1)
+        total_items = int(
+            ItemRollup.select(fn.SUM(ItemRollup.item_count))
+            .where(ItemRollup.dimension == ROLLUP_CREATED_HOUR)
+            .scalar()
+            or 0
         )
-        new_last_7_days = (
-            Item.select()
-            .where(Item.creation_date >= last_7_days_start)
-            .count()
+        ending_this_hour = rows_between(Item.end_date, current_time, current_hour_end)
+        active_items = ending_this_hour + bucket_total(
+            ROLLUP_ENDING_HOUR, current_hour_end, None
         )
+        ending_soon_items = (
+            ending_this_hour
+            + bucket_total(ROLLUP_ENDING_HOUR, current_hour_end, hour_start(next_day))
+            + rows_between(Item.end_date, hour_start(next_day), next_day)
+        )
+        week_start_hour_end = hour_start(last_7_days_start) + timedelta(hours=1)
+        new_last_7_days = rows_between(
+            Item.creation_date, last_7_days_start, week_start_hour_end
+        ) + bucket_total(ROLLUP_CREATED_HOUR, week_start_hour_end, None)
 
         hidden_items = ItemState.select().where(ItemState.hidden).count()
         favorite_items = ItemState.select().where(ItemState.favorite).count()
 
-        top_seller_rows = (
-            Item.select(
-                Item.seller_name,
-                fn.COUNT(Item.item_id).alias("item_count"),
+        def top_names(model: type[Seller] | type[Category]) -> list[tuple[str, int]]:
+            rows = (
+                model.select(model.name, model.item_count)
+                .where(model.item_count > 0)
+                .order_by(model.item_count.desc(), model.name.asc())
+                .limit(top_limit)
             )
-            .group_by(Item.seller_name)
-            .order_by(fn.COUNT(Item.item_id).desc(), Item.seller_name.asc())
-            .limit(top_limit)
-        )
-        top_sellers = [
-            (str(row.seller_name), int(getattr(row, "item_count")))
-            for row in top_seller_rows
-        ]
+            return [(str(row.name), int(row.item_count)) for row in rows]
 
-        top_category_rows = (
-            Item.select(
-                Item.category_name,
-                fn.COUNT(Item.item_id).alias("item_count"),
-            )
-            .group_by(Item.category_name)
-            .order_by(fn.COUNT(Item.item_id).desc(), Item.category_name.asc())
-            .limit(top_limit)
-        )
-        top_categories = [
-            (str(row.category_name), int(getattr(row, "item_count")))
-            for row in top_category_rows
-        ]
+        top_sellers = top_names(Seller)
+        top_categories = top_names(Category)
 
         month_counts = [0] * 12
         weekday_counts = [0] * 7
         hour_counts = [0] * 24
 
-        for item in Item.select(Item.creation_date).iterator():
-            created_at = item.creation_date
-            if created_at is None:
+        for row in ItemRollup.select(ItemRollup.bucket, ItemRollup.item_count).where(
+            ItemRollup.dimension == ROLLUP_CREATED_HOUR
+        ):
+            if not row.bucket:
                 continue
-            month_counts[created_at.month - 1] += 1
-            weekday_counts[created_at.weekday()] += 1
-            hour_counts[created_at.hour] += 1
+            created_at = datetime.strptime(row.bucket, ROLLUP_HOUR_FORMAT)
+            month_counts[created_at.month - 1] += row.item_count
+            weekday_counts[created_at.weekday()] += row.item_count
+            hour_counts[created_at.hour] += row.item_count
 
         posted_by_month = [
             ("Jan", month_counts[0]),
@@ -579,3 +1054,207 @@ class CategoryRepository:
 
         db_category.enabled = False
         db_category.save()
+
+
+class CategoryScheduleRepository:
+    @staticmethod
+    def get_schedules(category_ids: list[int]) -> dict[int, CategorySchedule]:
+        if not category_ids:
+            return {}
+
+        schedules = CategorySchedule.select().where(
+            CategorySchedule.category_id.in_(category_ids)
+        )
+        return {int(schedule.category_id): schedule for schedule in schedules}
+
+    @staticmethod
+    def get_all_schedules() -> list[CategorySchedule]:
+        return list(
+            CategorySchedule.select().order_by(
+                CategorySchedule.next_poll_at.asc(),
+                CategorySchedule.category_id.asc(),
+            )
+        )
+
+    @staticmethod
+    def save_schedule(
+        category_id: int,
+        new_items_per_hour: float,
+        interval_seconds: int,
+        last_polled_at: datetime,
+        next_poll_at: datetime,
+    ) -> CategorySchedule:
+        CategorySchedule.insert(
+            category_id=category_id,
+            new_items_per_hour=new_items_per_hour,
+            interval_seconds=interval_seconds,
+            last_polled_at=last_polled_at,
+            next_poll_at=next_poll_at,
+            db_update_date=datetime.now(),
+        ).on_conflict_replace().execute()
+        return CategorySchedule.get_by_id(category_id)
+
+
+class OAuthTokenRepository:
+    """
+    Shared OAuth token cache, see :class:`ebay_watchlist.ebay.api.TokenStore`.
+
+    Lives in the SQLite DB so the daemon and every gunicorn worker reuse the
+    same token.
+    """
+
+    @staticmethod
+    def load_token(cache_key: str) -> tuple[str, datetime] | None:
+        token = OAuthToken.get_or_none(cache_key=cache_key)
+        if token is None:
+            return None
+        return str(token.access_token), token.expires_at
+
+    @staticmethod
+    def save_token(cache_key: str, access_token: str, expires_at: datetime) -> None:
+        OAuthToken.insert(
+            cache_key=cache_key,
+            access_token=access_token,
+            expires_at=expires_at,
+            db_update_date=datetime.now(),
+        ).on_conflict_replace().execute()
+
+    @staticmethod
+    @contextmanager
+    def refresh_lock() -> Generator[None]:
+        """
+        Advisory lock file next to the DB, held while a token is requested.
+
+        Unlike a write transaction it does not block the DB for the length of
+        the OAuth call, so item writes and checkpoints carry on meanwhile.
+        """
+        if database.database == ":memory:":
+            with _oauth_refresh_lock:
+                yield
+            return
+
+        # flock locks belong to the open file, so threads block each other too.
+        with open(f"{database.database}{OAUTH_REFRESH_LOCK_SUFFIX}", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class CategoryTreeRepository:
+    """
+    Local mirror of an eBay category tree, filled by `config sync-category-tree`.
+    """
+
+    @staticmethod
+    def replace_tree(
+        marketplace_id: str,
+        category_tree_id: str,
+        category_tree_version: str | None,
+        categories: list[dict],
+    ) -> int:
+        """
+        Swaps the mirrored tree for {categories} in one transaction and rebuilds
+        the name index. Only one marketplace is mirrored at a time.
+        """
+        with database.atomic():
+            CategoryTreeNode.delete().execute()
+            CategoryTreeSync.delete().execute()
+            for start in range(0, len(categories), CATEGORY_TREE_INSERT_BATCH_SIZE):
+                CategoryTreeNode.insert_many(
+                    categories[start : start + CATEGORY_TREE_INSERT_BATCH_SIZE]
+                ).execute()
+            CategoryTreeNodeIndex.rebuild()
+            CategoryTreeSync.create(
+                marketplace_id=marketplace_id,
+                category_tree_id=category_tree_id,
+                category_tree_version=category_tree_version,
+                category_count=len(categories),
+                synced_at=datetime.now(),
+            )
+        return len(categories)
+
+    @staticmethod
+    def get_synced_tree(marketplace_id: str | None = None) -> CategoryTreeSync | None:
+        query = CategoryTreeSync.select()
+        if marketplace_id is not None:
+            query = query.where(CategoryTreeSync.marketplace_id == marketplace_id)
+        return query.first()
+
+    @staticmethod
+    def search_categories(query: str, limit: int = 15) -> list[dict[str, str]]:
+        """
+        Prefix match on every word of {query}, best bm25 rank first. Same shape
+        as :meth:`ebay_watchlist.ebay.api.EbayAPI.get_category_suggestions`.
+        """
+        tokens = _SEARCH_TOKEN_PATTERN.findall(query.lower())
+        if not tokens:
+            return []
+
+        match_expression = " ".join(f'"{token}"*' for token in tokens)
+        categories = (
+            CategoryTreeNode.select(
+                CategoryTreeNode.category_id,
+                CategoryTreeNode.name,
+                CategoryTreeNode.path,
+            )
+            .join(
+                CategoryTreeNodeIndex,
+                on=(CategoryTreeNodeIndex.rowid == CategoryTreeNode.category_id),
+            )
+            .where(CategoryTreeNodeIndex.match(match_expression))
+            .order_by(CategoryTreeNodeIndex.rank(), CategoryTreeNode.level.asc())
+            .limit(limit)
+        )
+        return [
+            {
+                "id": str(category.category_id),
+                "name": str(category.name),
+                "path": str(category.path),
+            }
+            for category in categories
+        ]
+
+    @staticmethod
+    def get_category_names(category_ids: list[int]) -> dict[int, str]:
+        if not category_ids:
+            return {}
+
+        names: dict[int, str] = {}
+        for start in range(0, len(category_ids), SQLITE_MAX_VARIABLES):
+            query = CategoryTreeNode.select(
+                CategoryTreeNode.category_id, CategoryTreeNode.name
+            ).where(
+                CategoryTreeNode.category_id.in_(
+                    category_ids[start : start + SQLITE_MAX_VARIABLES]
+                )
+            )
+            names.update(
+                {int(category.category_id): str(category.name) for category in query}
+            )
+        return names
+
+    @staticmethod
+    def get_ancestors(category_id: int) -> list[CategoryTreeNode]:
+        """
+        {category_id} and all of its parents, root first. Empty when unknown.
+        """
+        parent = CategoryTreeNode.alias()
+        lineage = (
+            CategoryTreeNode.select(
+                CategoryTreeNode.category_id, CategoryTreeNode.parent_id
+            )
+            .where(CategoryTreeNode.category_id == category_id)
+            .cte("lineage", recursive=True)
+        )
+        parents = parent.select(parent.category_id, parent.parent_id).join(
+            lineage, on=(parent.category_id == lineage.c.parent_id)
+        )
+        lineage = lineage.union_all(parents)
+        return list(
+            CategoryTreeNode.select()
+            .join(lineage, on=(CategoryTreeNode.category_id == lineage.c.category_id))
+            .with_cte(lineage)
+            .order_by(CategoryTreeNode.level.asc())
+        )
@@ -0,0 +1,107 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Iterator
+from itertools import islice
+
+# Longest n-gram kept in the infix map; longer queries intersect their trigrams.
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    return {
+        text[start : start + size]
+        for size in range(1, NGRAM_SIZE + 1)
+        for start in range(len(text) - size + 1)
+    }
+
+
+class SuggestionIndex:
+    """
+    Case-insensitive prefix and infix lookups over a fixed set of names.
+
+    Names are kept sorted by their lowercase form, so prefix matches are one
+    bisect away; infix matches come from a map of every 1-3 character n-gram
+    to the positions of the names containing it. Each name carries its item
+    counts per scope (the scraped category, or None when unscoped).
+    """
+
+    def __init__(self, counts: dict[str, dict[int | None, int]]):
+        self._names = sorted(counts, key=lambda name: (name.lower(), name))
+        self._keys = [name.lower() for name in self._names]
+        self._counts = [counts[name] for name in self._names]
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for position, key in enumerate(self._keys):
+            for ngram in _ngrams(key):
+                postings[ngram].append(position)
+        self._ngram_positions = {
+            ngram: set(positions) for ngram, positions in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _count(self, position: int, scopes: Collection[int] | None) -> int:
+        counts = self._counts[position]
+        if scopes is None:
+            return sum(counts.values())
+        return sum(counts.get(scope, 0) for scope in scopes)
+
+    def _infix_positions(self, key: str) -> set[int]:
+        if len(key) <= NGRAM_SIZE:
+            return self._ngram_positions.get(key, set())
+
+        trigram_sets = sorted(
+            (
+                self._ngram_positions.get(key[start : start + NGRAM_SIZE], set())
+                for start in range(len(key) - NGRAM_SIZE + 1)
+            ),
+            key=len,
+        )
+        positions = set.intersection(*trigram_sets)
+        # Trigrams can all be present without being adjacent.
+        return {position for position in positions if key in self._keys[position]}
+
+    def search(
+        self,
+        query: str,
+        limit: int = 15,
+        scopes: Collection[int] | None = None,
+        rank_by_count: bool = False,
+    ) -> list[str]:
+        """
+        Names containing {query}. Prefix matches come first, each group in
+        name order; with {rank_by_count}, all matches are ordered by their
+        item count instead. {scopes} keeps names with items in those scopes.
+        """
+        key = query.strip().lower()
+        if not key:
+            return []
+
+        prefix_start = bisect_left(self._keys, key)
+        prefix_end = bisect_right(self._keys, key + "\U0010ffff", lo=prefix_start)
+
+        def in_scope(positions: Iterable[int]) -> Iterator[int]:
+            return (
+                position for position in positions if self._count(position, scopes) > 0
+            )
+
+        if rank_by_count:
+            matches = list(in_scope(self._infix_positions(key)))
+            matches.sort(
+                key=lambda position: (
+                    -self._count(position, scopes),
+                    position >= prefix_end or position < prefix_start,
+                    position,
+                )
+            )
+            return [self._names[position] for position in matches[:limit]]
+
+        matches = list(islice(in_scope(range(prefix_start, prefix_end)), limit))
+        if len(matches) < limit:
+            infix_matches = sorted(
+                position
+                for position in self._infix_positions(key)
+                if not prefix_start <= position < prefix_end
+            )
+            matches += islice(in_scope(infix_matches), limit - len(matches))
+        return [self._names[position] for position in matches]
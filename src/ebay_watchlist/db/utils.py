@@ -1,18 +1,427 @@
 from ebay_watchlist.db.config import database
 from ebay_watchlist.db.models import (
+    Category,
+    CategorySchedule,
+    CategoryTreeNode,
+    CategoryTreeNodeIndex,
+    CategoryTreeSync,
     Item,
     ItemNote,
+    ItemRollup,
     ItemState,
+    ItemTitleIndex,
+    ItemTitleWordIndex,
+    OAuthToken,
+    Seller,
+    TableGeneration,
     WatchedCategory,
     WatchedSeller,
 )
 
 
+ITEM_TITLE_SEARCH_INDEXES = (ItemTitleIndex, ItemTitleWordIndex)
+ITEM_LISTING_INDEXES = {
+    "idx_item_listing_newest": "creation_date, item_id, hidden, favorite, end_date",
+    "idx_item_listing_ending": "end_date, item_id, hidden, favorite",
+    "idx_item_listing_price_low": (
+        "effective_price, creation_date DESC, item_id DESC, hidden, favorite, end_date"
+    ),
+    "idx_item_listing_price_high": (
+        "effective_price, creation_date, item_id, hidden, favorite, end_date"
+    ),
+    "idx_item_listing_bids": (
+        "bid_count, creation_date, item_id, hidden, favorite, end_date"
+    ),
+}
+
+
+def _filtered_listing_indexes(name: str, column: str) -> dict[str, str]:
+    """
+    The listing indexes behind an equality on {column}, named
+    idx_item_{name}_listing_<sort>.
+    """
+    return {
+        index_name.replace("idx_item_listing_", f"idx_item_{name}_listing_"): (
+            f"{column}, {columns}"
+        )
+        for index_name, columns in ITEM_LISTING_INDEXES.items()
+    }
+
+
+# The same sort keys behind a seller, category or scraped category equality,
+# for listings filtered to one of them.
+ITEM_SELLER_LISTING_INDEXES = _filtered_listing_indexes("seller", "seller_key")
+ITEM_CATEGORY_LISTING_INDEXES = _filtered_listing_indexes("category", "category_key")
+ITEM_SCRAPED_CATEGORY_LISTING_INDEXES = _filtered_listing_indexes(
+    "scraped_category", "scraped_category_id"
+)
+ITEM_FILTERED_LISTING_INDEXES = (
+    ITEM_SELLER_LISTING_INDEXES
+    | ITEM_CATEGORY_LISTING_INDEXES
+    | ITEM_SCRAPED_CATEGORY_LISTING_INDEXES
+)
+
+
+def create_item_search_triggers():
+    """
+    Keeps the external content title indexes in step with the item table.
+
+    Index rows are keyed on item's implicit rowid, which is not stable across
+    maintenance (VACUUM, dump/restore) because item has a VARCHAR primary key.
+    Run vacuum_database() or rebuild_item_search_indexes() after any of it.
+    """
+    for index in ITEM_TITLE_SEARCH_INDEXES:
+        table = index._meta.table_name
+        database.execute_sql(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON item BEGIN
+                INSERT INTO {table}(rowid, title) VALUES (new.rowid, new.title);
+            END
+            """
+        )
+        database.execute_sql(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON item BEGIN
+                INSERT INTO {table}({table}, rowid, title)
+                VALUES ('delete', old.rowid, old.title);
+            END
+            """
+        )
+        database.execute_sql(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF title ON item
+            WHEN old.title IS NOT new.title BEGIN
+                INSERT INTO {table}({table}, rowid, title)
+                VALUES ('delete', old.rowid, old.title);
+                INSERT INTO {table}(rowid, title) VALUES (new.rowid, new.title);
+            END
+            """
+        )
+
+
+def create_item_state_triggers():
+    """
+    Mirrors ItemState's hidden/favorite flags onto the item row, including
+    for items re-inserted after their state was written.
+    """
+    database.execute_sql(
+        """
+        CREATE TRIGGER IF NOT EXISTS itemstate_ai AFTER INSERT ON itemstate BEGIN
+            UPDATE item SET hidden = new.hidden, favorite = new.favorite
+            WHERE item_id = new.item_id;
+        END
+        """
+    )
+    database.execute_sql(
+        """
+        CREATE TRIGGER IF NOT EXISTS itemstate_au
+        AFTER UPDATE OF hidden, favorite ON itemstate BEGIN
+            UPDATE item SET hidden = new.hidden, favorite = new.favorite
+            WHERE item_id = new.item_id;
+        END
+        """
+    )
+    database.execute_sql(
+        """
+        CREATE TRIGGER IF NOT EXISTS itemstate_ad AFTER DELETE ON itemstate BEGIN
+            UPDATE item SET hidden = 0, favorite = 0 WHERE item_id = old.item_id;
+        END
+        """
+    )
+    database.execute_sql(
+        """
+        CREATE TRIGGER IF NOT EXISTS item_state_ai AFTER INSERT ON item
+        WHEN EXISTS (SELECT 1 FROM itemstate WHERE item_id = new.item_id) BEGIN
+            UPDATE item
+            SET (hidden, favorite) = (
+                SELECT hidden, favorite FROM itemstate WHERE item_id = new.item_id
+            )
+            WHERE item_id = new.item_id;
+        END
+        """
+    )
+
+
+# Item columns the listing filters read; updates to other columns (prices,
+# bids, images) don't change which items a filter matches.
+ITEM_FILTER_COLUMNS = (
+    "title",
+    "seller_key",
+    "category_key",
+    "scraped_category_id",
+    "creation_date",
+    "end_date",
+    "hidden",
+    "favorite",
+)
+
+
+def create_item_generation_triggers():
+    """
+    Bumps TableGeneration['item'] on every insert, delete and filter-relevant
+    update of an item.
+    """
+    database.execute_sql(
+        "INSERT OR IGNORE INTO tablegeneration (table_name, generation) "
+        "VALUES ('item', 0)"
+    )
+    bump = (
+        "UPDATE tablegeneration SET generation = generation + 1 "
+        "WHERE table_name = 'item';"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS item_generation_ai AFTER INSERT ON item "
+        f"BEGIN {bump} END"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS item_generation_ad AFTER DELETE ON item "
+        f"BEGIN {bump} END"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS item_generation_au "
+        f"AFTER UPDATE OF {', '.join(ITEM_FILTER_COLUMNS)} ON item "
+        f"BEGIN {bump} END"
+    )
+
+
+# ItemRollup dimensions: the item columns each is grouped by and the SQL bucket
+# expression over a row alias. Hour buckets are 'YYYY-MM-DD HH:00:00' strings,
+# which sort like the datetimes peewee stores.
+ITEM_ROLLUP_DIMENSIONS = {
+    "created_hour": (
+        "creation_date",
+        "COALESCE(strftime('%Y-%m-%d %H:00:00', {row}.creation_date), '')",
+    ),
+    "ending_hour": (
+        "end_date",
+        "COALESCE(strftime('%Y-%m-%d %H:00:00', {row}.end_date), '')",
+    ),
+    # '<scraped_category_id>:<category_key>', for category suggestions scoped
+    # to the watched categories. Per seller and per category counts live on
+    # the Seller and Category tables.
+    "scraped_category": (
+        "scraped_category_id, category_key",
+        "{row}.scraped_category_id || ':' || {row}.category_key",
+    ),
+}
+# Item columns referencing a Seller/Category row whose item_count they keep.
+ITEM_DIMENSION_KEYS = {"seller_key": Seller, "category_key": Category}
+
+
+def _rollup_increment_sql(dimension: str, bucket: str) -> str:
+    return (
+        f"INSERT INTO itemrollup (dimension, bucket, item_count) "
+        f"VALUES ('{dimension}', {bucket}, 1) "
+        f"ON CONFLICT (dimension, bucket) DO UPDATE SET item_count = item_count + 1;"
+    )
+
+
+def _rollup_decrement_sql(dimension: str, bucket: str) -> str:
+    where = f"WHERE dimension = '{dimension}' AND bucket = {bucket}"
+    return (
+        f"UPDATE itemrollup SET item_count = item_count - 1 {where};"
+        f"DELETE FROM itemrollup {where} AND item_count <= 0;"
+    )
+
+
+def create_item_rollup_triggers():
+    """
+    Keeps ItemRollup's per-bucket counts in step with item inserts, deletes
+    and updates that move an item to another bucket, inside the same
+    transaction as the write.
+    """
+    inserts = "".join(
+        _rollup_increment_sql(dimension, bucket.format(row="new"))
+        for dimension, (_, bucket) in ITEM_ROLLUP_DIMENSIONS.items()
+    )
+    deletes = "".join(
+        _rollup_decrement_sql(dimension, bucket.format(row="old"))
+        for dimension, (_, bucket) in ITEM_ROLLUP_DIMENSIONS.items()
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS item_rollup_ai AFTER INSERT ON item "
+        f"BEGIN {inserts} END"
+    )
+    database.execute_sql(
+        f"CREATE TRIGGER IF NOT EXISTS item_rollup_ad AFTER DELETE ON item "
+        f"BEGIN {deletes} END"
+    )
+    for dimension, (column, bucket) in ITEM_ROLLUP_DIMENSIONS.items():
+        old_bucket = bucket.format(row="old")
+        new_bucket = bucket.format(row="new")
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS item_rollup_au_{dimension} "
+            f"AFTER UPDATE OF {column} ON item "
+            f"WHEN {old_bucket} IS NOT {new_bucket} BEGIN "
+            f"{_rollup_decrement_sql(dimension, old_bucket)}"
+            f"{_rollup_increment_sql(dimension, new_bucket)} END"
+        )
+
+
+def create_item_dimension_triggers():
+    """
+    Keeps Seller.item_count and Category.item_count in step with the items
+    referencing them. Rows left at zero stay, so their keys remain stable.
+    """
+    for column, model in ITEM_DIMENSION_KEYS.items():
+        table = model._meta.table_name
+        increment = (
+            f"UPDATE {table} SET item_count = item_count + 1 WHERE id = new.{column};"
+        )
+        decrement = (
+            f"UPDATE {table} SET item_count = item_count - 1 WHERE id = old.{column};"
+        )
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS item_{table}_ai AFTER INSERT ON item "
+            f"BEGIN {increment} END"
+        )
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS item_{table}_ad AFTER DELETE ON item "
+            f"BEGIN {decrement} END"
+        )
+        database.execute_sql(
+            f"CREATE TRIGGER IF NOT EXISTS item_{table}_au AFTER UPDATE OF {column} "
+            f"ON item WHEN old.{column} IS NOT new.{column} "
+            f"BEGIN {decrement}{increment} END"
+        )
+
+
+def rebuild_item_rollups() -> int:
+    """
+    Recounts every ItemRollup bucket and the Seller/Category item counts from
+    the item table, for backfills and after bulk edits made with the triggers
+    missing.
+
+    Returns the number of buckets written.
+    """
+    with database.atomic():
+        ItemRollup.delete().execute()
+        for dimension, (_, bucket) in ITEM_ROLLUP_DIMENSIONS.items():
+            database.execute_sql(
+                f"INSERT INTO itemrollup (dimension, bucket, item_count) "
+                f"SELECT '{dimension}', {bucket.format(row='item')}, COUNT(*) "
+                f"FROM item GROUP BY 2"
+            )
+        for column, model in ITEM_DIMENSION_KEYS.items():
+            table = model._meta.table_name
+            database.execute_sql(
+                f"UPDATE {table} SET item_count = "
+                f"(SELECT COUNT(*) FROM item WHERE {column} = {table}.id)"
+            )
+    return ItemRollup.select().count()
+
+
+def migrate_item_dimension_keys() -> bool:
+    """
+    Moves the seller_name and category_name text columns of an older item
+    table into the Seller and Category tables, leaving seller_key and
+    category_key behind.
+
+    Returns whether there was anything to migrate; the caller recounts the
+    rollups afterwards.
+    """
+    item_columns = {column.name for column in database.get_columns("item")}
+    if "seller_name" not in item_columns:
+        return False
+
+    database.create_tables([Seller, Category], safe=True)
+    with database.atomic():
+        for (column, model), name_column in zip(
+            ITEM_DIMENSION_KEYS.items(), ("seller_name", "category_name")
+        ):
+            table = model._meta.table_name
+            database.execute_sql(
+                f"INSERT OR IGNORE INTO {table} (name, item_count) "
+                f"SELECT DISTINCT {name_column}, 0 FROM item"
+            )
+            database.execute_sql(
+                f"ALTER TABLE item ADD COLUMN {column} INTEGER REFERENCES {table} (id)"
+            )
+            database.execute_sql(
+                f"UPDATE item SET {column} = "
+                f"(SELECT id FROM {table} WHERE name = item.{name_column})"
+            )
+
+        # SQLite refuses to drop a column an index or trigger still reads;
+        # the triggers are recreated over the key columns afterwards.
+        stale_triggers = database.execute_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'item' "
+            "AND (sql LIKE '%seller_name%' OR sql LIKE '%category_name%')"
+        ).fetchall()
+        for (trigger,) in stale_triggers:
+            database.execute_sql(f"DROP TRIGGER {trigger}")
+        database.execute_sql("DROP INDEX IF EXISTS idx_item_seller_name")
+        database.execute_sql("DROP INDEX IF EXISTS idx_item_category_name")
+        database.execute_sql("ALTER TABLE item DROP COLUMN seller_name")
+        database.execute_sql("ALTER TABLE item DROP COLUMN category_name")
+    return True
+
+
+def create_item_effective_price_column() -> bool:
+    """
+    Adds item.effective_price, the sort price in minor units (pence, cents):
+    the current bid, else the listed price. It's a VIRTUAL generated column,
+    so writes never touch it and peewee doesn't declare it as a field.
+
+    Returns whether the column had to be added.
+    """
+    # table_info leaves generated columns out, table_xinfo doesn't.
+    columns = {row[1] for row in database.execute_sql("PRAGMA table_xinfo(item)")}
+    if "effective_price" in columns:
+        return False
+    database.execute_sql(
+        "ALTER TABLE item ADD COLUMN effective_price INTEGER GENERATED ALWAYS AS "
+        "(CAST(ROUND(COALESCE(current_bid_price, price) * 100) AS INTEGER)) VIRTUAL"
+    )
+    return True
+
+
+def create_item_listing_indexes():
+    """
+    One index per get_filtered_items sort, led by the full sort key and
+    carrying the hidden/favorite/active filters, so a listing page is read in
+    index order without a temp B-tree sort. Copies led by seller_key,
+    category_key and scraped_category_id do the same for a listing filtered to
+    one seller, category or scraped category.
+
+    Still sorted: several values of one filter (one seek per value, then a sort
+    of their rows) and title searches (the FTS5 matches are looked up by rowid,
+    then sorted), which only ever sort the rows that matched.
+    """
+    for name, columns in (ITEM_LISTING_INDEXES | ITEM_FILTERED_LISTING_INDEXES).items():
+        database.execute_sql(f"CREATE INDEX IF NOT EXISTS {name} ON item ({columns})")
+
+
 def create_tables():
     database.create_tables(
-        [Item, ItemState, ItemNote, WatchedSeller, WatchedCategory],
+        [
+            Seller,
+            Category,
+            Item,
+            ItemTitleIndex,
+            ItemTitleWordIndex,
+            ItemState,
+            ItemNote,
+            TableGeneration,
+            ItemRollup,
+            WatchedSeller,
+            WatchedCategory,
+            OAuthToken,
+            CategorySchedule,
+            CategoryTreeSync,
+            CategoryTreeNode,
+            CategoryTreeNodeIndex,
+        ],
         safe=True,
     )
+    create_item_search_triggers()
+    create_item_state_triggers()
+    create_item_generation_triggers()
+    create_item_rollup_triggers()
+    create_item_dimension_triggers()
+    create_item_effective_price_column()
+    create_item_listing_indexes()
 
 
 def ensure_schema_compatibility():
@@ -20,25 +429,137 @@ def ensure_schema_compatibility():
     Lightweight migration hook for older DBs.
     Creates missing tables without touching existing data.
     """
+    existing_tables = set(database.get_tables())
+    # Before create_tables, which indexes the key columns this adds.
+    migrated_dimension_keys = "item" in existing_tables and migrate_item_dimension_keys()
     database.create_tables(
-        [Item, ItemState, ItemNote, WatchedSeller, WatchedCategory],
+        [
+            Seller,
+            Category,
+            Item,
+            ItemTitleIndex,
+            ItemTitleWordIndex,
+            ItemState,
+            ItemNote,
+            TableGeneration,
+            ItemRollup,
+            WatchedSeller,
+            WatchedCategory,
+            OAuthToken,
+            CategorySchedule,
+            CategoryTreeSync,
+            CategoryTreeNode,
+            CategoryTreeNodeIndex,
+        ],
         safe=True,
     )
+    create_item_search_triggers()
+    # Title indexes added to a DB that already has items start from a full build.
+    for index in ITEM_TITLE_SEARCH_INDEXES:
+        if index._meta.table_name not in existing_tables:
+            index.rebuild()
 
-    # Query-path indexes used by item filters/sorts.
-    database.execute_sql(
-        "CREATE INDEX IF NOT EXISTS idx_item_seller_name ON item (seller_name)"
-    )
-    database.execute_sql(
-        "CREATE INDEX IF NOT EXISTS idx_item_category_name ON item (category_name)"
-    )
+    # Columns added after the first release.
+    item_columns = {column.name for column in database.get_columns("item")}
+    if "content_fingerprint" not in item_columns:
+        database.execute_sql(
+            "ALTER TABLE item ADD COLUMN content_fingerprint VARCHAR(32)"
+        )
+    for flag in ("hidden", "favorite"):
+        if flag not in item_columns:
+            with database.atomic():
+                database.execute_sql(
+                    f"ALTER TABLE item ADD COLUMN {flag} INTEGER NOT NULL DEFAULT 0"
+                )
+                database.execute_sql(
+                    f"UPDATE item SET {flag} = 1 WHERE item_id IN "
+                    f"(SELECT item_id FROM itemstate WHERE {flag})"
+                )
+    create_item_state_triggers()
+    create_item_generation_triggers()
+    create_item_rollup_triggers()
+    create_item_dimension_triggers()
+    # Rollups (or dimensions) added to a DB that already has items start from a
+    # full count.
+    rolled_up_dimensions = {
+        row[0] for row in database.execute_sql("SELECT DISTINCT dimension FROM itemrollup")
+    }
+    if migrated_dimension_keys or (
+        rolled_up_dimensions != set(ITEM_ROLLUP_DIMENSIONS) and Item.select().exists()
+    ):
+        rebuild_item_rollups()
+    if create_item_effective_price_column():
+        # Earlier price indexes sorted on the raw COALESCE of the two prices.
+        database.execute_sql("DROP INDEX IF EXISTS idx_item_listing_price_low")
+        database.execute_sql("DROP INDEX IF EXISTS idx_item_listing_price_high")
+
+    # Query-path indexes used by item filters/sorts. The seller/category key
+    # indexes come with the Item model.
     database.execute_sql(
         "CREATE INDEX IF NOT EXISTS idx_item_scraped_category_id ON item (scraped_category_id)"
     )
     database.execute_sql(
         "CREATE INDEX IF NOT EXISTS idx_item_creation_date ON item (creation_date)"
     )
+    create_item_listing_indexes()
+
+
+WAL_CHECKPOINT_MODES = {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}
+
+
+def checkpoint_wal(mode: str = "PASSIVE") -> tuple[int, int, int]:
+    """
+    Copies the WAL back into the database file. PASSIVE never waits for
+    readers; TRUNCATE waits up to busy_timeout and then empties the WAL file.
+
+    Returns (busy, wal_frames, checkpointed_frames), all -1 outside WAL mode.
+    """
+    if mode not in WAL_CHECKPOINT_MODES:
+        raise ValueError(f"mode must be one of {sorted(WAL_CHECKPOINT_MODES)}")
+
+    busy, wal_frames, checkpointed_frames = database.execute_sql(
+        f"PRAGMA wal_checkpoint({mode})"
+    ).fetchone()
+    return int(busy), int(wal_frames), int(checkpointed_frames)
+
+
+def rebuild_item_search_indexes():
+    """
+    Rebuilds the title indexes from the item table, re-keying every row on
+    the current item rowids.
+    """
+    with database.atomic():
+        for index in ITEM_TITLE_SEARCH_INDEXES:
+            index.rebuild()
+
+
+def vacuum_database():
+    """
+    VACUUMs the database file, then rebuilds the title indexes in case the
+    VACUUM renumbered item rowids.
+    """
+    database.execute_sql("VACUUM")
+    rebuild_item_search_indexes()
 
 
 def drop_tables():
-    database.drop_tables([ItemNote, ItemState, Item, WatchedSeller, WatchedCategory])
+    database.drop_tables(
+        [
+            ItemTitleIndex,
+            ItemTitleWordIndex,
+            ItemNote,
+            ItemState,
+            ItemRollup,
+            TableGeneration,
+            Item,
+            Seller,
+            Category,
+            WatchedSeller,
+            WatchedCategory,
+            OAuthToken,
+            CategorySchedule,
+            CategoryTreeSync,
+            CategoryTreeNodeIndex,
+            CategoryTreeNode,
+        ]
+    )
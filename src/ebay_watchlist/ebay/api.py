@@ -1,49 +1,207 @@
 import base64
 import logging
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic, perf_counter
+from typing import Protocol
 from urllib.parse import quote
 
 import requests
-from pydantic import ValidationError
-
-from ebay_watchlist.ebay.dtos import EbayItem
+from pydantic import TypeAdapter, ValidationError
+
+from ebay_watchlist.ebay.dtos import (
+    EbayItem,
+    ItemRecord,
+    ParsedItem,
+    RawItemSummary,
+    strip_web_url,
+)
+from ebay_watchlist.ebay.transport import (
+    DEFAULT_HTTP_POOL_MAXSIZE,
+    RetryingTransport,
+    build_session,
+)
 
-SEARCH_API_ENDPOINT = "https://api.ebay.com/buy/browse/v1/item_summary/search"
-ITEM_API_ENDPOINT = "https://api.ebay.com/buy/browse/v1/item/{item_id}"
-OAUTH_TOKEN_URL = "https://api.ebay.com/identity/v1/oauth2/token"
+DEFAULT_API_BASE_URL = "https://api.ebay.com"
+SEARCH_API_ENDPOINT = f"{DEFAULT_API_BASE_URL}/buy/browse/v1/item_summary/search"
+ITEM_API_ENDPOINT = f"{DEFAULT_API_BASE_URL}/buy/browse/v1/item/{{item_id}}"
+ITEMS_API_ENDPOINT = f"{DEFAULT_API_BASE_URL}/buy/browse/v1/item/"
+OAUTH_TOKEN_URL = f"{DEFAULT_API_BASE_URL}/identity/v1/oauth2/token"
+OAUTH_SCOPE = "https://api.ebay.com/oauth/api_scope"
 TAXONOMY_DEFAULT_TREE_ENDPOINT = (
-    "https://api.ebay.com/commerce/taxonomy/v1/get_default_category_tree_id"
+    f"{DEFAULT_API_BASE_URL}/commerce/taxonomy/v1/get_default_category_tree_id"
 )
 TAXONOMY_CATEGORY_SUGGESTIONS_ENDPOINT = (
-    "https://api.ebay.com/commerce/taxonomy/v1/category_tree/{category_tree_id}/get_category_suggestions"
+    f"{DEFAULT_API_BASE_URL}/commerce/taxonomy/v1/category_tree/{{category_tree_id}}/get_category_suggestions"
+)
+TAXONOMY_CATEGORY_TREE_ENDPOINT = (
+    f"{DEFAULT_API_BASE_URL}/commerce/taxonomy/v1/category_tree/{{category_tree_id}}"
 )
 HTTP_TIMEOUT_SECONDS = 20
+# A full category tree is tens of megabytes, give it longer than a search page.
+CATEGORY_TREE_TIMEOUT_SECONDS = 120
+# Keeps the `sellers:{...}` filter well under eBay's seller and URL length limits.
+DEFAULT_SELLER_SHARD_SIZE = 50
+DEFAULT_SHARD_CONCURRENCY = 4
+# getItems accepts at most 20 item ids per call.
+GET_ITEMS_BATCH_SIZE = 20
+# eBay application tokens last 2 hours; refresh a little before they lapse.
+DEFAULT_TOKEN_EXPIRES_IN_SECONDS = 7200
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Default category trees change a few times a year at most.
+CATEGORY_TREE_ID_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_SUGGESTION_CACHE_SIZE = 512
+# "model" parses into EbayItem models, "fast" into slotted ItemRecords.
+PARSE_MODE_MODEL = "model"
+PARSE_MODE_FAST = "fast"
+PARSE_MODES = {PARSE_MODE_MODEL, PARSE_MODE_FAST}
+_ITEM_SUMMARY_PAGE_ADAPTER = TypeAdapter(list[RawItemSummary])
+_ITEM_SUMMARY_ADAPTER = TypeAdapter(RawItemSummary)
+_MAIN_CATEGORY_ADAPTER = TypeAdapter(int | None)
 logger = logging.getLogger(__name__)
 
 
+class TokenStore(Protocol):
+    """
+    Storage for OAuth tokens shared between processes.
+
+    refresh_lock() must serialize refreshes across every process using the store.
+    """
+
+    def load_token(self, cache_key: str) -> tuple[str, datetime] | None: ...
+
+    def save_token(
+        self, cache_key: str, access_token: str, expires_at: datetime
+    ) -> None: ...
+
+    def refresh_lock(self) -> AbstractContextManager: ...
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+
 class EbayAPI:
     def __init__(
-        self, client_id: str, client_secret: str, marketplace_id: str = "EBAY_GB"
+        self,
+        client_id: str,
+        client_secret: str,
+        marketplace_id: str = "EBAY_GB",
+        seller_shard_size: int = DEFAULT_SELLER_SHARD_SIZE,
+        shard_concurrency: int = DEFAULT_SHARD_CONCURRENCY,
+        token_store: TokenStore | None = None,
+        pool_maxsize: int = DEFAULT_HTTP_POOL_MAXSIZE,
+        transport: RetryingTransport | None = None,
+        base_url: str = DEFAULT_API_BASE_URL,
+        parse_mode: str = PARSE_MODE_MODEL,
+        suggestion_cache_size: int = DEFAULT_SUGGESTION_CACHE_SIZE,
     ):
+        if seller_shard_size < 1:
+            raise ValueError("seller_shard_size must be at least 1")
+        if parse_mode not in PARSE_MODES:
+            raise ValueError(f"parse_mode must be one of {sorted(PARSE_MODES)}")
+        if shard_concurrency < 1:
+            raise ValueError("shard_concurrency must be at least 1")
+
         self.authenticated = False
+        self.access_token: str | None = None
+        self.token_expires_at: datetime | None = None
+        self._auth_lock = threading.Lock()
         self.client_id = client_id
         self.client_secret = client_secret
+        self.token_store = token_store
+        self.token_cache_key = f"{client_id}:{OAUTH_SCOPE}"
+        self.seller_shard_size = seller_shard_size
+        self.shard_concurrency = shard_concurrency
+        # Point at a stand-in such as `ebay-watchlist run-fake-ebay` for offline runs.
+        self.base_url = base_url.rstrip("/")
+        self.parse_mode = parse_mode
+
+        # Taxonomy caches; they pay off when one client is kept for the process.
+        self.suggestion_cache_size = suggestion_cache_size
+        self._cache_lock = threading.Lock()
+        self._category_tree_ids: dict[str, tuple[str, float]] = {}
+        self._category_suggestions: OrderedDict[
+            tuple[str, str], list[dict[str, str]]
+        ] = OrderedDict()
+        self._cache_stats = {
+            "category_tree_id": CacheStats(),
+            "category_suggestions": CacheStats(),
+        }
 
         headers = {
             "X-EBAY-C-MARKETPLACE-ID": marketplace_id,
         }
-        self.session = requests.session()
+        self.session = build_session(pool_maxsize)
         self.session.headers.update(headers)
+        self.transport = transport or RetryingTransport()
 
-    def _authenticate(self):
+    def _authenticate(self, rejected_token: str | None = None):
         """
         Logs in using client id and secret and stores the OAUTH APP Token.
 
-        For long-lived sessions this will need to be called multiple times as
-        the oauth tokens expire every 2 hours.
+        With a token store the token is shared with every other process using
+        the same store; {rejected_token} is never reused from it.
 
         Raises :class:`HTTPError` if there's an issue calling the API.
         """
+        if self.token_store is None:
+            oauth_app_token, expires_at = self._request_token()
+        else:
+            oauth_app_token, expires_at = self._get_shared_token(
+                self.token_store, rejected_token
+            )
+
+        session_headers = {
+            "Authorization": f"Bearer {oauth_app_token}",
+        }
+
+        self.access_token = oauth_app_token
+        self.token_expires_at = expires_at
+        self.authenticated = True
+        self.session.headers.update(session_headers)
+
+    def _get_shared_token(
+        self, token_store: TokenStore, rejected_token: str | None
+    ) -> tuple[str, datetime]:
+        cached = token_store.load_token(self.token_cache_key)
+        if cached is not None and self._is_reusable_token(*cached, rejected_token):
+            return cached
+
+        # Only one process refreshes; the others wait on the lock and then
+        # pick up the token it stored instead of stampeding the OAuth endpoint.
+        with token_store.refresh_lock():
+            cached = token_store.load_token(self.token_cache_key)
+            if cached is not None and self._is_reusable_token(*cached, rejected_token):
+                return cached
+
+            oauth_app_token, expires_at = self._request_token()
+            token_store.save_token(self.token_cache_key, oauth_app_token, expires_at)
+            return oauth_app_token, expires_at
+
+    @staticmethod
+    def _is_reusable_token(
+        access_token: str, expires_at: datetime, rejected_token: str | None
+    ) -> bool:
+        if access_token == rejected_token:
+            return False
+        return datetime.now() < expires_at - TOKEN_REFRESH_MARGIN
+
+    def _request_token(self) -> tuple[str, datetime]:
+        """
+        Requests a new OAUTH APP Token from eBay.
+
+        Returns the token and the time it expires at.
+        """
         basic_auth = base64.b64encode(
             f"{self.client_id}:{self.client_secret}".encode()
         ).decode()
@@ -55,13 +213,12 @@ class EbayAPI:
 
         data = {
             "grant_type": "client_credentials",
-            "scope": "https://api.ebay.com/oauth/api_scope",
+            "scope": OAUTH_SCOPE,
         }
 
+        requested_at = datetime.now()
         try:
-            auth_data = self.session.post(
-                OAUTH_TOKEN_URL, headers=headers, data=data, timeout=HTTP_TIMEOUT_SECONDS
-            )
+            auth_data = self._post_token_request(headers, data)
         except requests.exceptions.SSLError:
             logger.warning(
                 "TLS error while requesting eBay OAuth token. "
@@ -73,9 +230,7 @@ class EbayAPI:
             try:
                 os.environ["OPENSSL_CONF"] = "/dev/null"
                 os.environ.pop("OPENSSL_MODULES", None)
-                auth_data = self.session.post(
-                    OAUTH_TOKEN_URL, headers=headers, data=data, timeout=HTTP_TIMEOUT_SECONDS
-                )
+                auth_data = self._post_token_request(headers, data)
             finally:
                 if previous_openssl_conf is None:
                     os.environ.pop("OPENSSL_CONF", None)
@@ -89,28 +244,164 @@ class EbayAPI:
         auth_data.raise_for_status()
         token_info = auth_data.json()
 
-        oauth_app_token = token_info["access_token"]
-        session_headers = {
-            "Authorization": f"Bearer {oauth_app_token}",
-        }
+        expires_in = int(token_info.get("expires_in") or DEFAULT_TOKEN_EXPIRES_IN_SECONDS)
+        return token_info["access_token"], requested_at + timedelta(seconds=expires_in)
 
-        self.authenticated = True
-        self.session.headers.update(session_headers)
+    def _post_token_request(self, headers: dict, data: dict) -> requests.Response:
+        url = self.endpoint_url(OAUTH_TOKEN_URL)
+        return self.transport.send(
+            url,
+            lambda: self.session.post(
+                url, headers=headers, data=data, timeout=HTTP_TIMEOUT_SECONDS
+            ),
+        )
+
+    def _ensure_authenticated(self):
+        """
+        Authenticates once even when several threads share this client, and
+        again shortly before the current token expires.
+        """
+        if self.authenticated and not self._token_expiring():
+            return
+
+        with self._auth_lock:
+            if not self.authenticated or self._token_expiring():
+                self._authenticate()
+
+    def get_access_token(self, rejected_token: str | None = None) -> str:
+        """
+        Returns a valid OAuth token for callers that make their own HTTP requests.
+
+        Pass the token eBay answered 401 to as {rejected_token} to force a refresh,
+        unless another caller has already replaced it.
+        """
+        if rejected_token is None:
+            self._ensure_authenticated()
+        else:
+            self._replace_rejected_token(rejected_token)
+
+        return str(self.access_token)
+
+    def _replace_rejected_token(self, rejected_token: str | None):
+        """
+        Refreshes the token after eBay answered 401 to {rejected_token}, unless
+        another thread already replaced it while this one waited for the lock.
+        """
+        with self._auth_lock:
+            if self.access_token in (None, rejected_token):
+                self.authenticated = False
+                self._authenticate(rejected_token=rejected_token)
+
+    def endpoint_url(self, endpoint: str) -> str:
+        """
+        {endpoint} (one of the module level endpoint constants) on {base_url}.
+        """
+        return self.base_url + endpoint.removeprefix(DEFAULT_API_BASE_URL)
+
+    def _token_expiring(self) -> bool:
+        if self.token_expires_at is None:
+            return False
+        return datetime.now() >= self.token_expires_at - TOKEN_REFRESH_MARGIN
 
     def get_latest_items_for_sellers(
-        self, seller_names: list[str], category_id: int, limit: int = 5
-    ) -> list[EbayItem]:
+        self,
+        seller_names: list[str],
+        category_id: int,
+        limit: int = 5,
+        known_item_ids: set[str] | None = None,
+        max_pages: int = 1,
+    ) -> list[ParsedItem]:
         """
         Get the most recent listed auction items by the selected sellers in the specified category.
 
         If the seller list is empty it will return all the auctions for that category in the site.
 
+        Reads up to {max_pages} pages of {limit} items, see :meth:`iter_latest_items_for_sellers`.
+        Long seller lists are split into shards of {seller_shard_size} sellers that are
+        searched concurrently, and the results are merged and de-duplicated by item id.
+
+        May raise :class:`HTTPError` if there's a problem calling the API.
+        """
+        shards = self.shard_sellers(seller_names, self.seller_shard_size)
+        if len(shards) == 1:
+            return self._get_latest_items_for_shard(
+                0, shards[0], category_id, limit, known_item_ids, max_pages
+            )
+
+        self._ensure_authenticated()
+        with ThreadPoolExecutor(
+            max_workers=min(len(shards), self.shard_concurrency)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._get_latest_items_for_shard,
+                    shard_index,
+                    shard,
+                    category_id,
+                    limit,
+                    known_item_ids,
+                    max_pages,
+                )
+                for shard_index, shard in enumerate(shards)
+            ]
+            shard_results = [future.result() for future in futures]
+
+        return self.merge_shard_results(shard_results)
+
+    def _get_latest_items_for_shard(
+        self,
+        shard_index: int,
+        seller_names: list[str],
+        category_id: int,
+        limit: int,
+        known_item_ids: set[str] | None,
+        max_pages: int,
+    ) -> list[ParsedItem]:
+        started_at = perf_counter()
+        ebay_items: list[ParsedItem] = []
+        pages_read = 0
+        for page in self.iter_latest_items_for_sellers(
+            seller_names=seller_names,
+            category_id=category_id,
+            limit=limit,
+            known_item_ids=known_item_ids,
+            max_pages=max_pages,
+        ):
+            pages_read += 1
+            ebay_items.extend(page)
+
+        logger.info(
+            "Seller shard fetched: category_id=%s shard_index=%s sellers_count=%s "
+            "pages_read=%s items_count=%s elapsed_seconds=%.3f",
+            category_id,
+            shard_index,
+            len(seller_names),
+            pages_read,
+            len(ebay_items),
+            perf_counter() - started_at,
+        )
+        return ebay_items
+
+    def iter_latest_items_for_sellers(
+        self,
+        seller_names: list[str],
+        category_id: int,
+        limit: int = 200,
+        known_item_ids: set[str] | None = None,
+        max_pages: int | None = None,
+    ) -> Iterator[list[ParsedItem]]:
+        """
+        Yields pages of the newest auction items, following the Browse API `next` links.
+
+        Results are sorted newest first, so once a whole page is made of
+        {known_item_ids} everything after it has been seen before and paging stops.
+        Paging also stops when there is no `next` link or after {max_pages} pages.
+
         May raise :class:`HTTPError` if there's a problem calling the API.
         """
-        if not self.authenticated:
-            self._authenticate()
+        self._ensure_authenticated()
 
-        params = {
+        params: dict | None = {
             "category_ids": category_id,
             "sort": "newlyListed",
             "filter": self.build_filters(
@@ -118,14 +409,31 @@ class EbayAPI:
             ),
             "limit": limit,
         }
+        url = self.endpoint_url(SEARCH_API_ENDPOINT)
+        pages_read = 0
 
-        request = self._get_with_reauth(SEARCH_API_ENDPOINT, params=params)
+        while True:
+            request = self._get_with_reauth(url, params=params)
+            pages_read += 1
 
-        results = request.json()
-        items = results.get("itemSummaries", [])
-        ebay_items = self.parse_items(items)
+            results = request.json()
+            items = results.get("itemSummaries", [])
+            yield self.parse_page(items)
 
-        return ebay_items
+            next_url = results.get("next")
+
+            if self.page_is_known(items, known_item_ids):
+                logger.info(
+                    "Stopping pagination at already known items: category_id=%s pages_read=%s",
+                    category_id,
+                    pages_read,
+                )
+                return
+            if not next_url or (max_pages is not None and pages_read >= max_pages):
+                return
+
+            # The `next` href already carries the query string and offset.
+            url, params = next_url, None
 
     def get_item_snapshot(self, item_id: str) -> dict | None:
         """
@@ -133,11 +441,10 @@ class EbayAPI:
 
         Returns None when eBay responds with 404.
         """
-        if not self.authenticated:
-            self._authenticate()
+        self._ensure_authenticated()
 
         encoded_item_id = quote(item_id, safe="")
-        endpoint = ITEM_API_ENDPOINT.format(item_id=encoded_item_id)
+        endpoint = self.endpoint_url(ITEM_API_ENDPOINT.format(item_id=encoded_item_id))
         params = {"fieldgroups": "COMPACT"}
         request = self._get_with_reauth(
             endpoint,
@@ -153,16 +460,89 @@ class EbayAPI:
             raise requests.HTTPError("Unexpected item payload type")
         return payload
 
+    def get_item_snapshots(self, item_ids: list[str]) -> dict[str, dict | None]:
+        """
+        Fetch many eBay item payloads with the getItems endpoint.
+
+        Ids are sent in chunks of {GET_ITEMS_BATCH_SIZE} and the chunks are fetched
+        concurrently. Ids eBay doesn't return (or a chunk answered with 404) map to None.
+        """
+        unique_item_ids = list(dict.fromkeys(item_ids))
+        if not unique_item_ids:
+            return {}
+
+        self._ensure_authenticated()
+
+        chunks = [
+            unique_item_ids[start : start + GET_ITEMS_BATCH_SIZE]
+            for start in range(0, len(unique_item_ids), GET_ITEMS_BATCH_SIZE)
+        ]
+        if len(chunks) == 1:
+            chunk_results = [self._get_item_snapshots_chunk(chunks[0])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(len(chunks), self.shard_concurrency)
+            ) as executor:
+                chunk_results = list(executor.map(self._get_item_snapshots_chunk, chunks))
+
+        snapshots: dict[str, dict | None] = {}
+        for chunk_result in chunk_results:
+            snapshots.update(chunk_result)
+        return snapshots
+
+    def _get_item_snapshots_chunk(self, item_ids: list[str]) -> dict[str, dict | None]:
+        request = self._get_with_reauth(
+            self.endpoint_url(ITEMS_API_ENDPOINT),
+            params={"item_ids": ",".join(item_ids)},
+            allow_statuses={404},
+        )
+
+        snapshots: dict[str, dict | None] = dict.fromkeys(item_ids)
+        if request.status_code == 404:
+            return snapshots
+
+        payload = request.json()
+        if not isinstance(payload, dict):
+            raise requests.HTTPError("Unexpected items payload type")
+
+        for item_payload in payload.get("items") or []:
+            item_id = item_payload.get("itemId")
+            if item_id in snapshots:
+                snapshots[item_id] = item_payload
+
+        logger.info(
+            "Item snapshots fetched: requested_count=%s found_count=%s",
+            len(item_ids),
+            sum(snapshot is not None for snapshot in snapshots.values()),
+        )
+        return snapshots
+
     def get_default_category_tree_id(self, marketplace_id: str = "EBAY_GB") -> str:
-        if not self.authenticated:
-            self._authenticate()
+        """
+        Cached per marketplace for {CATEGORY_TREE_ID_TTL_SECONDS}.
+        """
+        with self._cache_lock:
+            cached = self._category_tree_ids.get(marketplace_id)
+            if cached is not None and cached[1] > monotonic():
+                self._cache_stats["category_tree_id"].hits += 1
+                return cached[0]
+            self._cache_stats["category_tree_id"].misses += 1
+
+        self._ensure_authenticated()
 
         request = self._get_with_reauth(
-            TAXONOMY_DEFAULT_TREE_ENDPOINT,
+            self.endpoint_url(TAXONOMY_DEFAULT_TREE_ENDPOINT),
             params={"marketplace_id": marketplace_id},
         )
         response_json = request.json()
-        return str(response_json["categoryTreeId"])
+        category_tree_id = str(response_json["categoryTreeId"])
+
+        with self._cache_lock:
+            self._category_tree_ids[marketplace_id] = (
+                category_tree_id,
+                monotonic() + CATEGORY_TREE_ID_TTL_SECONDS,
+            )
+        return category_tree_id
 
     def get_category_suggestions(
         self,
@@ -170,17 +550,44 @@ class EbayAPI:
         marketplace_id: str = "EBAY_GB",
         limit: int = 10,
     ) -> list[dict[str, str]]:
-        normalized_query = query.strip()
+        """
+        Results are kept in an LRU cache of {suggestion_cache_size} entries keyed by
+        marketplace and the case and whitespace normalized query.
+        """
+        normalized_query = " ".join(query.split())
         if not normalized_query:
             return []
 
+        cache_key = (marketplace_id, normalized_query.lower())
+        with self._cache_lock:
+            cached = self._category_suggestions.get(cache_key)
+            if cached is not None:
+                self._category_suggestions.move_to_end(cache_key)
+                self._cache_stats["category_suggestions"].hits += 1
+                return [dict(suggestion) for suggestion in cached[:limit]]
+            self._cache_stats["category_suggestions"].misses += 1
+
+        suggestions = self._fetch_category_suggestions(normalized_query, marketplace_id)
+
+        with self._cache_lock:
+            self._category_suggestions[cache_key] = suggestions
+            self._category_suggestions.move_to_end(cache_key)
+            while len(self._category_suggestions) > self.suggestion_cache_size:
+                self._category_suggestions.popitem(last=False)
+        return [dict(suggestion) for suggestion in suggestions[:limit]]
+
+    def _fetch_category_suggestions(
+        self, query: str, marketplace_id: str
+    ) -> list[dict[str, str]]:
         category_tree_id = self.get_default_category_tree_id(
             marketplace_id=marketplace_id
         )
-        endpoint = TAXONOMY_CATEGORY_SUGGESTIONS_ENDPOINT.format(
-            category_tree_id=category_tree_id
+        endpoint = self.endpoint_url(
+            TAXONOMY_CATEGORY_SUGGESTIONS_ENDPOINT.format(
+                category_tree_id=category_tree_id
+            )
         )
-        request = self._get_with_reauth(endpoint, params={"q": normalized_query})
+        request = self._get_with_reauth(endpoint, params={"q": query})
         results = request.json()
 
         suggestions: list[dict[str, str]] = []
@@ -209,24 +616,109 @@ class EbayAPI:
                 }
             )
 
-            if len(suggestions) >= limit:
-                break
-
         return suggestions
 
+    def get_category_tree(self, marketplace_id: str = "EBAY_GB") -> dict:
+        """
+        Downloads the full default category tree of a marketplace, flattened into
+        one dict per category with its parent id, depth and root->leaf path.
+        """
+        self._ensure_authenticated()
+        category_tree_id = self.get_default_category_tree_id(
+            marketplace_id=marketplace_id
+        )
+        request = self._get_with_reauth(
+            self.endpoint_url(
+                TAXONOMY_CATEGORY_TREE_ENDPOINT.format(category_tree_id=category_tree_id)
+            ),
+            timeout=CATEGORY_TREE_TIMEOUT_SECONDS,
+        )
+        response_json = request.json()
+
+        return {
+            "category_tree_id": str(response_json.get("categoryTreeId", category_tree_id)),
+            "category_tree_version": response_json.get("categoryTreeVersion"),
+            "categories": self.flatten_category_tree(
+                response_json.get("rootCategoryNode", {})
+            ),
+        }
+
+    @staticmethod
+    def flatten_category_tree(root_node: dict) -> list[dict]:
+        """
+        The root node is a synthetic "Root" category, its children become the
+        top level categories (parent_id None, level 1).
+        """
+        categories: list[dict] = []
+        # (node, parent_id, parent path parts), walked without recursion.
+        stack = [
+            (child, None, [])
+            for child in reversed(root_node.get("childCategoryTreeNodes", []))
+        ]
+        while stack:
+            node, parent_id, parent_path = stack.pop()
+            category = node.get("category", {})
+            category_id = int(category["categoryId"])
+            name = str(category.get("categoryName", "")).strip()
+            path = [*parent_path, name]
+            children = node.get("childCategoryTreeNodes", [])
+            categories.append(
+                {
+                    "category_id": category_id,
+                    "name": name,
+                    "parent_id": parent_id,
+                    "level": len(path),
+                    "leaf": bool(node.get("leafCategoryTreeNode", not children)),
+                    "path": " > ".join(path),
+                }
+            )
+            stack.extend((child, category_id, path) for child in reversed(children))
+        return categories
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """
+        Hit and miss counters of the taxonomy caches of this client.
+        """
+        with self._cache_lock:
+            self._cache_stats["category_tree_id"].size = len(self._category_tree_ids)
+            self._cache_stats["category_suggestions"].size = len(
+                self._category_suggestions
+            )
+            return {
+                name: CacheStats(**vars(stats))
+                for name, stats in self._cache_stats.items()
+            }
+
+    def _get(
+        self,
+        url: str,
+        params: dict | None,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+    ) -> requests.Response:
+        """
+        GET through the transport, which throttles and retries 429/5xx responses.
+        """
+        return self.transport.send(
+            url,
+            lambda: self.session.get(url, params=params, timeout=timeout),
+        )
+
     def _get_with_reauth(
         self,
         url: str,
         params: dict | None = None,
         allow_statuses: set[int] | None = None,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
     ):
         allowed = allow_statuses or set()
-        request = self.session.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+        # The token this request goes out with; by the time a 401 comes back
+        # another thread may already have replaced it.
+        sent_token = self.access_token
+        request = self._get(url, params, timeout)
 
         if request.status_code == 401:
-            self.authenticated = False
-            self._authenticate()
-            request = self.session.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+            self._replace_rejected_token(sent_token)
+            request = self._get(url, params, timeout)
             if request.status_code == 401:
                 raise requests.HTTPError("Unauthorized after re-authentication")
 
@@ -237,6 +729,49 @@ class EbayAPI:
         request.raise_for_status()
         return request
 
+    @staticmethod
+    def page_is_known(json_items: list, known_item_ids: set[str] | None) -> bool:
+        """
+        True when every summary in the raw search page is already in {known_item_ids}.
+        """
+        if known_item_ids is None:
+            return False
+
+        page_item_ids = {
+            str(item["itemId"])
+            for item in json_items
+            if isinstance(item, dict) and item.get("itemId")
+        }
+        return page_item_ids <= known_item_ids
+
+    @staticmethod
+    def merge_shard_results(shard_results: list[list[ParsedItem]]) -> list[ParsedItem]:
+        ebay_items: list[ParsedItem] = []
+        seen_item_ids: set[str] = set()
+        for shard_items in shard_results:
+            for item in shard_items:
+                if item.item_id in seen_item_ids:
+                    continue
+                seen_item_ids.add(item.item_id)
+                ebay_items.append(item)
+
+        return ebay_items
+
+    @staticmethod
+    def shard_sellers(seller_names: list[str], shard_size: int) -> list[list[str]]:
+        """
+        Splits the seller list into chunks of at most {shard_size} sellers.
+
+        An empty seller list is kept as a single shard meaning "every seller".
+        """
+        if not seller_names:
+            return [[]]
+
+        return [
+            seller_names[start : start + shard_size]
+            for start in range(0, len(seller_names), shard_size)
+        ]
+
     @staticmethod
     def build_filters(buying_options: list[str], sellers: list[str]) -> str:
         buying_options_filter = "buyingOptions:{" + ",".join(buying_options) + "}"
@@ -247,6 +782,91 @@ class EbayAPI:
         sellers_filter = "sellers:{" + "|".join(sellers) + "}"
         return f"{buying_options_filter},{sellers_filter}"
 
+    def parse_page(self, json_items: list[dict] | None) -> list[ParsedItem]:
+        """
+        Parses a search page with the parser selected by {parse_mode}.
+        """
+        items: list[ParsedItem] = []
+        if self.parse_mode == PARSE_MODE_FAST:
+            items.extend(self.parse_items_fast(json_items))
+        else:
+            items.extend(self.parse_items(json_items))
+        return items
+
+    @staticmethod
+    def parse_items_fast(json_items: list[dict] | None) -> list[ItemRecord]:
+        """
+        High-throughput counterpart of :meth:`parse_items`, accepting and skipping
+        the same payloads but returning :class:`ItemRecord`.
+
+        The whole page is validated in a single pydantic-core call. If any summary
+        is invalid the page is validated again item by item and the invalid ones skipped.
+        """
+        if not json_items:
+            return []
+
+        try:
+            summaries = _ITEM_SUMMARY_PAGE_ADAPTER.validate_python(json_items)
+        except ValidationError:
+            summaries = []
+            for item in json_items:
+                try:
+                    summaries.append(_ITEM_SUMMARY_ADAPTER.validate_python(item))
+                except ValidationError:
+                    logger.warning("Skipping invalid item payload: %r", item, exc_info=True)
+
+        records = []
+        for summary in summaries:
+            main_category = None
+            leaf_category_ids = summary.get("leafCategoryIds")
+            if isinstance(leaf_category_ids, list) and leaf_category_ids:
+                try:
+                    main_category = _MAIN_CATEGORY_ADAPTER.validate_python(
+                        leaf_category_ids[0]
+                    )
+                except ValidationError:
+                    logger.warning(
+                        "Skipping invalid item payload: %r", summary, exc_info=True
+                    )
+                    continue
+
+            image_info = summary.get("image")
+            image_url = image_info.get("imageUrl") if isinstance(image_info, dict) else None
+            price = summary.get("price")
+            current_bid_price = summary.get("currentBidPrice")
+
+            records.append(
+                ItemRecord(
+                    item_id=summary["itemId"],
+                    title=summary["title"],
+                    main_category=main_category,
+                    categories=[
+                        (category["categoryId"], category["categoryName"])
+                        for category in summary.get("categories", [])
+                    ],
+                    image=image_url if isinstance(image_url, str) else None,
+                    seller_name=summary["seller"]["username"],
+                    condition=summary.get("condition"),
+                    shipping_options=summary.get("shippingOptions"),
+                    buying_options=summary.get("buyingOptions", []),
+                    price=price["value"] if price else None,
+                    price_currency=price["currency"] if price else None,
+                    current_bid_price=(
+                        current_bid_price["value"] if current_bid_price else None
+                    ),
+                    current_bid_price_currency=(
+                        current_bid_price["currency"] if current_bid_price else None
+                    ),
+                    bid_count=summary.get("bidCount", 0),
+                    web_url=strip_web_url(summary["itemWebUrl"]),
+                    origin_date=summary["itemOriginDate"],
+                    creation_date=summary["itemCreationDate"],
+                    end_date=summary["itemEndDate"],
+                )
+            )
+
+        return records
+
     @staticmethod
     def parse_items(json_items: list[dict] | None) -> list[EbayItem]:
         if not json_items:
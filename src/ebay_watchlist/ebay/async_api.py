@@ -0,0 +1,276 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable
+from time import perf_counter
+from typing import TypeVar
+
+import httpx
+
+from ebay_watchlist.ebay.api import (
+    DEFAULT_API_BASE_URL,
+    DEFAULT_SELLER_SHARD_SIZE,
+    HTTP_TIMEOUT_SECONDS,
+    PARSE_MODE_MODEL,
+    SEARCH_API_ENDPOINT,
+    EbayAPI,
+    TokenStore,
+)
+from ebay_watchlist.ebay.dtos import ParsedItem
+from ebay_watchlist.ebay.transport import RETRYABLE_STATUSES, RetryingTransport
+
+DEFAULT_MAX_IN_FLIGHT = 8
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+
+async def gather_or_cancel(*awaitables: Awaitable[T]) -> list[T]:
+    """
+    Like :func:`asyncio.gather`, but when one awaitable fails the others are
+    cancelled and awaited before the error propagates, so none of them is left
+    running against a client that is about to be closed.
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class AsyncEbayAPI:
+    """
+    asyncio counterpart of :class:`EbayAPI` for the search path.
+
+    Requests share one ``httpx.AsyncClient`` and at most {max_in_flight} are in
+    flight at a time. OAuth tokens come from a wrapped :class:`EbayAPI`, so token
+    caching and the TLS fallback behave exactly like the sync client. Parsing
+    goes through :meth:`EbayAPI.parse_page`.
+
+    Every attempt waits on the per-host token bucket of the wrapped client's
+    :class:`RetryingTransport`. 429s, 5xx responses and dropped connections are
+    retried with its backoff, and counted in its stats.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        marketplace_id: str = "EBAY_GB",
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        seller_shard_size: int = DEFAULT_SELLER_SHARD_SIZE,
+        token_store: TokenStore | None = None,
+        transport: RetryingTransport | None = None,
+        base_url: str = DEFAULT_API_BASE_URL,
+        parse_mode: str = PARSE_MODE_MODEL,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.token_client = EbayAPI(
+            client_id,
+            client_secret,
+            marketplace_id,
+            seller_shard_size=seller_shard_size,
+            token_store=token_store,
+            transport=transport,
+            base_url=base_url,
+            parse_mode=parse_mode,
+        )
+        self.transport = self.token_client.transport
+        self.seller_shard_size = seller_shard_size
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self.client = httpx.AsyncClient(
+            headers={"X-EBAY-C-MARKETPLACE-ID": marketplace_id},
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=max_in_flight),
+        )
+
+    async def __aenter__(self) -> "AsyncEbayAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def get_latest_items_for_sellers(
+        self,
+        seller_names: list[str],
+        category_id: int,
+        limit: int = 5,
+        known_item_ids: set[str] | None = None,
+        max_pages: int = 1,
+    ) -> list[ParsedItem]:
+        """
+        Same contract as :meth:`EbayAPI.get_latest_items_for_sellers`, with the
+        seller shards gathered on the event loop instead of a thread pool.
+
+        May raise :class:`httpx.HTTPStatusError` if there's a problem calling the API.
+        """
+        shards = EbayAPI.shard_sellers(seller_names, self.seller_shard_size)
+        shard_results = await gather_or_cancel(
+            *(
+                self._get_latest_items_for_shard(
+                    shard_index, shard, category_id, limit, known_item_ids, max_pages
+                )
+                for shard_index, shard in enumerate(shards)
+            )
+        )
+        return EbayAPI.merge_shard_results(shard_results)
+
+    async def _get_latest_items_for_shard(
+        self,
+        shard_index: int,
+        seller_names: list[str],
+        category_id: int,
+        limit: int,
+        known_item_ids: set[str] | None,
+        max_pages: int,
+    ) -> list[ParsedItem]:
+        started_at = perf_counter()
+        ebay_items: list[ParsedItem] = []
+        pages_read = 0
+        async for page in self.iter_latest_items_for_sellers(
+            seller_names=seller_names,
+            category_id=category_id,
+            limit=limit,
+            known_item_ids=known_item_ids,
+            max_pages=max_pages,
+        ):
+            pages_read += 1
+            ebay_items.extend(page)
+
+        logger.info(
+            "Seller shard fetched: category_id=%s shard_index=%s sellers_count=%s "
+            "pages_read=%s items_count=%s elapsed_seconds=%.3f",
+            category_id,
+            shard_index,
+            len(seller_names),
+            pages_read,
+            len(ebay_items),
+            perf_counter() - started_at,
+        )
+        return ebay_items
+
+    async def iter_latest_items_for_sellers(
+        self,
+        seller_names: list[str],
+        category_id: int,
+        limit: int = 200,
+        known_item_ids: set[str] | None = None,
+        max_pages: int | None = None,
+    ) -> AsyncIterator[list[ParsedItem]]:
+        """
+        Yields pages of the newest auction items, see
+        :meth:`EbayAPI.iter_latest_items_for_sellers` for the stop conditions.
+        """
+        params: dict | None = {
+            "category_ids": category_id,
+            "sort": "newlyListed",
+            "filter": EbayAPI.build_filters(
+                buying_options=["AUCTION"], sellers=seller_names
+            ),
+            "limit": limit,
+        }
+        url = self.token_client.endpoint_url(SEARCH_API_ENDPOINT)
+        pages_read = 0
+
+        while True:
+            response = await self._get_with_reauth(url, params=params)
+            pages_read += 1
+
+            results = response.json()
+            items = results.get("itemSummaries", [])
+            yield self.token_client.parse_page(items)
+
+            next_url = results.get("next")
+
+            if EbayAPI.page_is_known(items, known_item_ids):
+                logger.info(
+                    "Stopping pagination at already known items: category_id=%s pages_read=%s",
+                    category_id,
+                    pages_read,
+                )
+                return
+            if not next_url or (max_pages is not None and pages_read >= max_pages):
+                return
+
+            # The `next` href already carries the query string and offset.
+            url, params = next_url, None
+
+    async def _get(
+        self, url: str, params: dict | None, access_token: str
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            # Throttled before taking an in-flight slot, so waiting holds none.
+            throttled_seconds = await self.transport.throttle_async(url)
+            self.transport.record(url, attempts=1, throttled_seconds=throttled_seconds)
+            try:
+                async with self._in_flight:
+                    response = await self.client.get(
+                        url,
+                        params=params,
+                        headers={"Authorization": f"Bearer {access_token}"},
+                    )
+            except (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError):
+                self.transport.record(url, connection_errors=1)
+                if attempt >= self.transport.max_retries:
+                    raise
+                delay = self.transport.backoff_delay(attempt)
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return response
+
+                if response.status_code == 429:
+                    self.transport.record(url, rate_limited=1)
+                else:
+                    self.transport.record(url, server_errors=1)
+                if attempt >= self.transport.max_retries:
+                    return response
+                delay = self.transport.retry_delay(attempt, response.headers)
+
+            logger.warning(
+                "HTTP request failed, retrying: url=%s attempt=%s delay_seconds=%.2f",
+                url,
+                attempt + 1,
+                delay,
+            )
+            self.transport.record(url, retries=1)
+            # The semaphore is released while waiting, so other requests go ahead.
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _get_with_reauth(
+        self,
+        url: str,
+        params: dict | None = None,
+        allow_statuses: set[int] | None = None,
+    ) -> httpx.Response:
+        allowed = allow_statuses or set()
+        # A refresh can read the token store and call the OAuth endpoint, both
+        # blocking, so it runs on a thread instead of stalling the event loop.
+        access_token = await asyncio.to_thread(self.token_client.get_access_token)
+        response = await self._get(url, params, access_token)
+
+        if response.status_code == 401:
+            access_token = await asyncio.to_thread(
+                self.token_client.get_access_token, rejected_token=access_token
+            )
+            response = await self._get(url, params, access_token)
+            if response.status_code == 401:
+                raise httpx.HTTPStatusError(
+                    "Unauthorized after re-authentication",
+                    request=response.request,
+                    response=response,
+                )
+
+        if response.status_code in allowed:
+            return response
+
+        # Intentionally unhandled, so failures for something other than authentication are loud
+        response.raise_for_status()
+        return response
@@ -1,10 +1,30 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Any, NotRequired, TypedDict
 from urllib.parse import urljoin, urlparse
 
 from pydantic import BaseModel, field_validator
 
 
+def strip_web_url(web_url: str) -> str:
+    """
+    Drops the tracking query string and fragment eBay appends to item URLs.
+    """
+    base = web_url.partition("#")[0].partition("?")[0]
+    # Plain absolute URLs (every eBay item URL) need no parsing; urljoin would
+    # only matter for params, dot segments or an empty path.
+    scheme, separator, rest = base.partition("://")
+    if (
+        separator
+        and scheme in ("https", "http")
+        and "/" in rest
+        and ";" not in base
+        and "/." not in rest
+    ):
+        return base
+    return urljoin(web_url, urlparse(web_url).path)
+
+
 class EbayPrice(BaseModel):
     value: Decimal
     currency: str
@@ -47,4 +67,155 @@ class EbayItem(BaseModel):
     @field_validator("web_url")
     @classmethod
     def format_web_url(cls, web_url: str):
-        return urljoin(web_url, urlparse(web_url).path)
+        return strip_web_url(web_url)
+
+
+# Raw Browse API item summary shapes, validated a whole page at a time by
+# :meth:`EbayAPI.parse_items_fast`. They accept exactly what EbayItem accepts.
+class RawPrice(TypedDict):
+    value: Decimal
+    currency: str
+
+
+class RawSeller(TypedDict):
+    username: str
+    feedbackPercentage: float
+    feedbackScore: int
+
+
+class RawCategory(TypedDict):
+    categoryName: str
+    categoryId: int
+
+
+class RawItemSummary(TypedDict):
+    itemId: str
+    title: str
+    # Only the first leaf id and a dict image are used; anything else is ignored.
+    leafCategoryIds: NotRequired[Any]
+    categories: NotRequired[list[RawCategory]]
+    image: NotRequired[Any]
+    seller: RawSeller
+    condition: NotRequired[str | None]
+    shippingOptions: NotRequired[list[dict] | None]
+    buyingOptions: NotRequired[list[str]]
+    price: NotRequired[RawPrice | None]
+    currentBidPrice: NotRequired[RawPrice | None]
+    bidCount: NotRequired[int | None]
+    itemWebUrl: str
+    itemOriginDate: datetime
+    itemCreationDate: datetime
+    itemEndDate: datetime
+
+
+class ItemRecord:
+    """
+    Flat, slotted item for the DB writer. Built straight from validated
+    summaries by the fast parser, or from an :class:`EbayItem`.
+    """
+
+    __slots__ = (
+        "item_id",
+        "title",
+        "main_category",
+        "categories",
+        "image",
+        "seller_name",
+        "condition",
+        "shipping_options",
+        "buying_options",
+        "price",
+        "price_currency",
+        "current_bid_price",
+        "current_bid_price_currency",
+        "bid_count",
+        "web_url",
+        "origin_date",
+        "creation_date",
+        "end_date",
+    )
+
+    def __init__(
+        self,
+        item_id: str,
+        title: str,
+        main_category: int | None,
+        categories: list[tuple[int, str]],
+        image: str | None,
+        seller_name: str,
+        condition: str | None,
+        shipping_options: list[dict] | None,
+        buying_options: list[str],
+        price: Decimal | None,
+        price_currency: str | None,
+        current_bid_price: Decimal | None,
+        current_bid_price_currency: str | None,
+        bid_count: int | None,
+        web_url: str,
+        origin_date: datetime,
+        creation_date: datetime,
+        end_date: datetime,
+    ):
+        self.item_id = item_id
+        self.title = title
+        self.main_category = main_category
+        # (categoryId, categoryName) pairs in payload order.
+        self.categories = categories
+        self.image = image
+        self.seller_name = seller_name
+        self.condition = condition
+        self.shipping_options = shipping_options
+        self.buying_options = buying_options
+        self.price = price
+        self.price_currency = price_currency
+        self.current_bid_price = current_bid_price
+        self.current_bid_price_currency = current_bid_price_currency
+        self.bid_count = bid_count
+        self.web_url = web_url
+        self.origin_date = origin_date
+        self.creation_date = creation_date
+        self.end_date = end_date
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ItemRecord):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f"ItemRecord(item_id={self.item_id!r}, title={self.title!r})"
+
+    @classmethod
+    def from_ebay_item(cls, item: EbayItem) -> "ItemRecord":
+        return cls(
+            item_id=item.item_id,
+            title=item.title,
+            main_category=item.main_category,
+            categories=[
+                (category.categoryId, category.categoryName)
+                for category in item.categories
+            ],
+            image=item.image,
+            seller_name=item.seller.username,
+            condition=item.condition,
+            shipping_options=item.shipping_options,
+            buying_options=item.buying_options,
+            price=item.price.value if item.price else None,
+            price_currency=item.price.currency if item.price else None,
+            current_bid_price=(
+                item.current_bid_price.value if item.current_bid_price else None
+            ),
+            current_bid_price_currency=(
+                item.current_bid_price.currency if item.current_bid_price else None
+            ),
+            bid_count=item.bid_count,
+            web_url=item.web_url,
+            origin_date=item.origin_date,
+            creation_date=item.creation_date,
+            end_date=item.end_date,
+        )
+
+
+# One parsed search result: an EbayItem, or an ItemRecord from the fast parser.
+ParsedItem = EbayItem | ItemRecord
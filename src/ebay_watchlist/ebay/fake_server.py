@@ -0,0 +1,382 @@
+"""
+Deterministic local stand-in for the eBay endpoints used by :class:`EbayAPI`.
+
+Point the client at it with ``EBAY_API_BASE_URL`` (or ``EbayAPI(base_url=...)``)
+to exercise ingestion without credentials or network access.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, make_server
+
+DEFAULT_FAKE_EBAY_PORT = 8765
+DEFAULT_ITEMS_PER_SELLER = 200
+DEFAULT_ANONYMOUS_SELLERS = 10
+FAKE_CATEGORY_TREE_ID = "3"
+# Listings are dated backwards from here so every run serves the same payloads.
+FAKE_CATALOG_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+FAKE_LISTING_INTERVAL = timedelta(minutes=7)
+FAKE_CATEGORIES = [
+    # (category_id, name, parent_id)
+    (1, "Collectables", None),
+    (619, "Musical Instruments & DJ Equipment", None),
+    (3858, "Guitars & Basses", 619),
+    (33034, "Electric Guitars", 3858),
+    (58058, "Computers, Tablets & Network Hardware", None),
+    (177, "Laptops & Netbooks", 58058),
+    (180014, "Synthesisers", 619),
+]
+FAKE_CATEGORY_NAMES = {category[0]: category[1] for category in FAKE_CATEGORIES}
+_SELLERS_FILTER_PREFIX = "sellers:{"
+
+
+@dataclass
+class FakeEbayConfig:
+    """
+    Behaviour of the fake server. Rates are probabilities per API request;
+    faults are drawn from a generator seeded with {seed}, so a sequential run
+    sees the same faults every time.
+    """
+
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    items_per_seller: int = DEFAULT_ITEMS_PER_SELLER
+    token_expires_in_seconds: int = 7200
+    seed: int = 0
+
+
+class FakeEbayCatalog:
+    """
+    Synthetic listings derived only from (category id, seller, index).
+    Index 0 is each seller's newest listing.
+    """
+
+    def __init__(self, items_per_seller: int = DEFAULT_ITEMS_PER_SELLER):
+        self.items_per_seller = items_per_seller
+
+    @staticmethod
+    def item_id(category_id: int, seller: str, index: int) -> str:
+        return f"v1|{category_id}-{seller}-{index}|0"
+
+    @staticmethod
+    def parse_item_id(item_id: str) -> tuple[int, str, int] | None:
+        parts = item_id.split("|")
+        if len(parts) != 3 or parts[0] != "v1":
+            return None
+        category_part, _, rest = parts[1].partition("-")
+        seller, _, index_part = rest.rpartition("-")
+        if not category_part.isdigit() or not index_part.isdigit() or not seller:
+            return None
+        return int(category_part), seller, int(index_part)
+
+    def has_item(self, index: int) -> bool:
+        return 0 <= index < self.items_per_seller
+
+    def search(
+        self, category_id: int, sellers: list[str], offset: int, limit: int
+    ) -> tuple[list[dict], int]:
+        """
+        Newest-first page of the merged listings of {sellers}. Returns the page
+        and the total number of matches.
+        """
+        if not sellers:
+            sellers = [f"fake_seller_{idx}" for idx in range(DEFAULT_ANONYMOUS_SELLERS)]
+
+        total = len(sellers) * self.items_per_seller
+        # Sellers list on a shared clock, so the merged order is by index then
+        # seller offset; computing it only up to the requested page keeps deep
+        # pages cheap enough for load tests.
+        ordered_sellers = sorted(sellers, key=self._seller_offset_seconds)
+        page = []
+        for position in range(offset, min(offset + limit, total)):
+            index, seller_position = divmod(position, len(ordered_sellers))
+            page.append(
+                self.item_summary(category_id, ordered_sellers[seller_position], index)
+            )
+        return page, total
+
+    def item_summary(self, category_id: int, seller: str, index: int) -> dict:
+        digest = self._digest(category_id, seller, index)
+        created_at = (
+            FAKE_CATALOG_EPOCH
+            - FAKE_LISTING_INTERVAL * index
+            - timedelta(seconds=self._seller_offset_seconds(seller))
+        )
+        price = f"{10 + digest % 990}.{digest % 100:02d}"
+        category_name = FAKE_CATEGORY_NAMES.get(category_id, f"Category {category_id}")
+        item_id = self.item_id(category_id, seller, index)
+        return {
+            "itemId": item_id,
+            "title": f"Fake listing {index} from {seller} in {category_name}",
+            "leafCategoryIds": [str(category_id)],
+            "categories": [{"categoryId": str(category_id), "categoryName": category_name}],
+            "image": {"imageUrl": f"https://i.ebayimg.example/{digest % 100000}.jpg"},
+            "seller": {
+                "username": seller,
+                "feedbackPercentage": "99.5",
+                "feedbackScore": 100 + digest % 5000,
+            },
+            "condition": "Used",
+            "shippingOptions": [
+                {"shippingCost": {"value": "4.99", "currency": "GBP"}}
+            ],
+            "buyingOptions": ["AUCTION"],
+            "price": {"value": price, "currency": "GBP"},
+            "currentBidPrice": {"value": price, "currency": "GBP"},
+            "bidCount": digest % 12,
+            "itemWebUrl": f"https://www.ebay.example/itm/{category_id}{index}",
+            "itemOriginDate": _iso(created_at),
+            "itemCreationDate": _iso(created_at),
+            "itemEndDate": _iso(created_at + timedelta(days=7)),
+        }
+
+    @staticmethod
+    def _digest(category_id: int, seller: str, index: int) -> int:
+        key = f"{category_id}:{seller}:{index}".encode()
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+    @staticmethod
+    def _seller_offset_seconds(seller: str) -> int:
+        key = seller.encode()
+        digest = int.from_bytes(hashlib.blake2b(key, digest_size=4).digest(), "big")
+        return digest % int(FAKE_LISTING_INTERVAL.total_seconds())
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _parse_sellers(filter_value: str) -> list[str]:
+    for clause in filter_value.split(","):
+        if clause.startswith(_SELLERS_FILTER_PREFIX) and clause.endswith("}"):
+            return [
+                seller
+                for seller in clause[len(_SELLERS_FILTER_PREFIX) : -1].split("|")
+                if seller
+            ]
+    return []
+
+
+def create_fake_ebay_app(config: FakeEbayConfig | None = None) -> Flask:
+    """
+    Flask app serving OAuth, search, item, getItems and taxonomy endpoints.
+    Request counts per endpoint are served at ``/_fake/stats``.
+    """
+    config = config or FakeEbayConfig()
+    catalog = FakeEbayCatalog(config.items_per_seller)
+    rng = random.Random(config.seed)
+    lock = threading.Lock()
+    issued_tokens: set[str] = set()
+    request_counts: Counter[str] = Counter()
+
+    app = Flask(__name__)
+
+    def draw() -> tuple[float, float]:
+        with lock:
+            return rng.random(), rng.uniform(0, config.latency_jitter_seconds)
+
+    @app.before_request
+    def inject_faults():
+        with lock:
+            request_counts[request.endpoint or "unknown"] += 1
+        if request.endpoint in ("oauth_token", "fake_stats"):
+            return None
+
+        fault, jitter = draw()
+        if config.latency_seconds or jitter:
+            time.sleep(config.latency_seconds + jitter)
+
+        authorization = request.headers.get("Authorization", "")
+        if authorization.removeprefix("Bearer ") not in issued_tokens:
+            return jsonify({"errors": [{"errorId": 1001, "message": "Invalid access token"}]}), 401
+
+        if fault < config.rate_limit_rate:
+            with lock:
+                request_counts["injected_429"] += 1
+            response = jsonify({"errors": [{"errorId": 2001, "message": "Too many requests"}]})
+            response.status_code = 429
+            response.headers["Retry-After"] = str(config.retry_after_seconds)
+            return response
+        if fault < config.rate_limit_rate + config.error_rate:
+            with lock:
+                request_counts["injected_500"] += 1
+            return jsonify({"errors": [{"errorId": 10001, "message": "Internal error"}]}), 500
+        return None
+
+    @app.post("/identity/v1/oauth2/token")
+    def oauth_token():
+        with lock:
+            access_token = f"fake-token-{len(issued_tokens) + 1}"
+            issued_tokens.add(access_token)
+        return jsonify(
+            {
+                "access_token": access_token,
+                "expires_in": config.token_expires_in_seconds,
+                "token_type": "Application Access Token",
+            }
+        )
+
+    @app.get("/buy/browse/v1/item_summary/search")
+    def search():
+        category_id = request.args.get("category_ids", type=int) or 0
+        limit = min(request.args.get("limit", default=50, type=int), 200)
+        offset = request.args.get("offset", default=0, type=int)
+        sellers = _parse_sellers(request.args.get("filter", ""))
+
+        items, total = catalog.search(category_id, sellers, offset, limit)
+        payload: dict = {
+            "href": request.url,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "itemSummaries": items,
+        }
+        if offset + limit < total:
+            next_args = request.args.to_dict()
+            next_args["offset"] = str(offset + limit)
+            payload["next"] = f"{request.base_url}?{urlencode(next_args)}"
+        return jsonify(payload)
+
+    @app.get("/buy/browse/v1/item/<path:item_id>")
+    def get_item(item_id: str):
+        parsed = catalog.parse_item_id(item_id)
+        if parsed is None or not catalog.has_item(parsed[2]):
+            return jsonify({"errors": [{"errorId": 11001, "message": "Item not found"}]}), 404
+        return jsonify(catalog.item_summary(*parsed))
+
+    @app.get("/buy/browse/v1/item/")
+    def get_items():
+        items = []
+        for item_id in request.args.get("item_ids", "").split(",")[:20]:
+            parsed = catalog.parse_item_id(item_id)
+            if parsed is not None and catalog.has_item(parsed[2]):
+                items.append(catalog.item_summary(*parsed))
+        if not items:
+            return jsonify({"errors": [{"errorId": 11001, "message": "Items not found"}]}), 404
+        return jsonify({"items": items})
+
+    @app.get("/commerce/taxonomy/v1/get_default_category_tree_id")
+    def default_category_tree_id():
+        return jsonify(
+            {"categoryTreeId": FAKE_CATEGORY_TREE_ID, "categoryTreeVersion": "1"}
+        )
+
+    @app.get(
+        "/commerce/taxonomy/v1/category_tree/<category_tree_id>/get_category_suggestions"
+    )
+    def category_suggestions(category_tree_id: str):
+        query = request.args.get("q", "").strip().lower()
+        categories_by_id = {category[0]: category for category in FAKE_CATEGORIES}
+        suggestions = []
+        for category_id, name, parent_id in FAKE_CATEGORIES:
+            if not query or query not in name.lower():
+                continue
+            ancestors = []
+            while parent_id is not None:
+                parent = categories_by_id[parent_id]
+                ancestors.append(
+                    {"categoryId": str(parent[0]), "categoryName": parent[1]}
+                )
+                parent_id = parent[2]
+            suggestions.append(
+                {
+                    "category": {"categoryId": str(category_id), "categoryName": name},
+                    "categoryTreeNodeAncestors": ancestors,
+                }
+            )
+        return jsonify(
+            {
+                "categoryTreeId": category_tree_id,
+                "categorySuggestions": suggestions,
+            }
+        )
+
+    @app.get("/commerce/taxonomy/v1/category_tree/<category_tree_id>")
+    def category_tree(category_tree_id: str):
+        def tree_node(category_id: int, name: str, level: int) -> dict:
+            children = [
+                tree_node(child_id, child_name, level + 1)
+                for child_id, child_name, parent_id in FAKE_CATEGORIES
+                if parent_id == category_id
+            ]
+            node = {
+                "category": {"categoryId": str(category_id), "categoryName": name},
+                "treeLevel": level,
+                "leafCategoryTreeNode": not children,
+            }
+            if children:
+                node["childCategoryTreeNodes"] = children
+            return node
+
+        root = {
+            "category": {"categoryId": "0", "categoryName": "Root"},
+            "treeLevel": 0,
+            "leafCategoryTreeNode": False,
+            "childCategoryTreeNodes": [
+                tree_node(category_id, name, 1)
+                for category_id, name, parent_id in FAKE_CATEGORIES
+                if parent_id is None
+            ],
+        }
+        return jsonify(
+            {
+                "categoryTreeId": category_tree_id,
+                "categoryTreeVersion": "1",
+                "rootCategoryNode": root,
+            }
+        )
+
+    @app.get("/_fake/stats")
+    def fake_stats() -> Response:
+        with lock:
+            return jsonify(dict(request_counts))
+
+    return app
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs) -> None:
+        pass
+
+
+class FakeEbayServer:
+    """
+    Runs the fake eBay app on a background thread, for tests and benchmarks.
+
+    Port 0 picks a free port; read the address from {base_url}.
+    """
+
+    def __init__(
+        self,
+        config: FakeEbayConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.server: BaseWSGIServer = make_server(
+            host,
+            port,
+            create_fake_ebay_app(config),
+            threaded=True,
+            request_handler=_QuietRequestHandler,
+        )
+        self.base_url = f"http://{host}:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FakeEbayServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self._thread.join()
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Sized for the fetch worker threads times their concurrent seller shards.
+DEFAULT_HTTP_POOL_MAXSIZE = 32
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE_SECONDS = 0.5
+DEFAULT_BACKOFF_MAX_SECONDS = 30.0
+# Upper bound for server provided waits, so one bad header can't stall a run.
+MAX_RETRY_AFTER_SECONDS = 120.0
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+DEFAULT_REQUESTS_BURST = 20
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Headers checked, in order, for how long to wait before the next attempt.
+RETRY_AFTER_HEADERS = ("Retry-After", "RateLimit-Reset", "X-RateLimit-Reset")
+# Reset headers are delta seconds or a Unix timestamp; anything this large
+# (September 2001 onwards) can only be the latter.
+RESET_EPOCH_MIN_SECONDS = 1_000_000_000
+# Path segments that are ids rather than endpoints, collapsed in the counters.
+_ENDPOINT_ID_PATTERNS = (
+    (re.compile(r"(/buy/browse/v1/item/)[^/]+$"), r"\1{item_id}"),
+    (re.compile(r"(/category_tree/)[^/]+"), r"\1{category_tree_id}"),
+)
+logger = logging.getLogger(__name__)
+
+
+def build_session(pool_maxsize: int = DEFAULT_HTTP_POOL_MAXSIZE) -> requests.Session:
+    """
+    A requests session whose connection pool fits {pool_maxsize} concurrent requests.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Host and path of {url} with item and category tree ids collapsed.
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, replacement in _ENDPOINT_ID_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f"{parts.netloc}{path}"
+
+
+def parse_retry_after(headers: Mapping[str, str], now: datetime | None = None) -> float | None:
+    """
+    Seconds to wait according to Retry-After (delta seconds or HTTP date) or the
+    rate-limit reset headers (delta seconds or Unix timestamp). None when no
+    usable header is present.
+    """
+    reference_time = now or datetime.now(timezone.utc)
+    for header in RETRY_AFTER_HEADERS:
+        value = headers.get(header)
+        if not value:
+            continue
+        value = value.strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            pass
+        else:
+            if seconds >= RESET_EPOCH_MIN_SECONDS:
+                seconds -= reference_time.timestamp()
+            return max(0.0, seconds)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            continue
+        return max(0.0, (retry_at - reference_time).total_seconds())
+    return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing {rate_per_second} requests with bursts of {burst}.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available. Returns the seconds waited.
+        """
+        waited = 0.0
+        while wait_seconds := self._take():
+            self._sleep(wait_seconds)
+            waited += wait_seconds
+        return waited
+
+    async def acquire_async(self) -> float:
+        """
+        :meth:`acquire` for the event loop, waiting with :func:`asyncio.sleep`.
+        """
+        waited = 0.0
+        while wait_seconds := self._take():
+            await asyncio.sleep(wait_seconds)
+            waited += wait_seconds
+        return waited
+
+    def _take(self) -> float:
+        """
+        Takes a token if one is available and returns 0, otherwise returns the
+        seconds until the next one.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._updated_at) * self.rate_per_second,
+            )
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate_per_second
+
+
+@dataclass
+class EndpointStats:
+    attempts: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    connection_errors: int = 0
+    throttled_seconds: float = 0.0
+
+
+class RetryingTransport:
+    """
+    Sends requests with a per-host token bucket and retries 429s, 5xx responses
+    and dropped connections with exponential backoff and full jitter.
+
+    Retry-After and rate-limit reset headers take precedence over the backoff.
+    With a {retry_budget_seconds}, a retry is only attempted if its wait ends
+    within that many seconds of the first attempt; otherwise the last response
+    (or connection error) is handed back straight away.
+    TLS errors are not retried; :class:`EbayAPI` has its own fallback for those.
+    Attempts and retries are counted per endpoint, see :meth:`stats_snapshot`.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = DEFAULT_REQUESTS_BURST,
+        retry_budget_seconds: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+        if retry_budget_seconds is not None and retry_budget_seconds < 0:
+            raise ValueError("retry_budget_seconds must be >= 0")
+
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.retry_budget_seconds = retry_budget_seconds
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def send(self, url: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Calls {send} until it returns a non-retryable response or retries run out.
+
+        The last response is returned as is once retries are exhausted, so callers
+        keep deciding which statuses are errors. The last connection error is re-raised.
+        """
+        endpoint = endpoint_name(url)
+        bucket = self._bucket_for(urlsplit(url).netloc)
+        started_at = self._clock()
+        attempt = 0
+
+        while True:
+            throttled_seconds = bucket.acquire()
+            self._record(endpoint, attempts=1, throttled_seconds=throttled_seconds)
+            try:
+                response = send()
+            except requests.exceptions.SSLError:
+                raise
+            except requests.exceptions.ConnectionError:
+                self._record(endpoint, connection_errors=1)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                if not self._within_budget(started_at, delay):
+                    raise
+                logger.warning(
+                    "HTTP connection error, retrying: endpoint=%s attempt=%s delay_seconds=%.2f",
+                    endpoint,
+                    attempt + 1,
+                    delay,
+                    exc_info=True,
+                )
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return response
+
+                if response.status_code == 429:
+                    self._record(endpoint, rate_limited=1)
+                else:
+                    self._record(endpoint, server_errors=1)
+                if attempt >= self.max_retries:
+                    return response
+                delay = self.retry_delay(attempt, getattr(response, "headers", None) or {})
+                if not self._within_budget(started_at, delay):
+                    logger.warning(
+                        "HTTP %s, retry budget exhausted: endpoint=%s delay_seconds=%.2f",
+                        response.status_code,
+                        endpoint,
+                        delay,
+                    )
+                    return response
+                logger.warning(
+                    "HTTP %s, retrying: endpoint=%s attempt=%s delay_seconds=%.2f",
+                    response.status_code,
+                    endpoint,
+                    attempt + 1,
+                    delay,
+                )
+
+            self._record(endpoint, retries=1)
+            self._sleep(delay)
+            attempt += 1
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Full jitter: uniform between 0 and base * 2**attempt, capped at the max.
+        """
+        ceiling = min(
+            self.backoff_max_seconds, self.backoff_base_seconds * (2**attempt)
+        )
+        return self._rng.uniform(0, ceiling)
+
+    def _within_budget(self, started_at: float, delay: float) -> bool:
+        if self.retry_budget_seconds is None:
+            return True
+        return self._clock() + delay - started_at <= self.retry_budget_seconds
+
+    def retry_delay(self, attempt: int, headers: Mapping[str, str]) -> float:
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            return min(retry_after, MAX_RETRY_AFTER_SECONDS)
+        return self.backoff_delay(attempt)
+
+    async def throttle_async(self, url: str) -> float:
+        """
+        Waits on the token bucket of {url}'s host without blocking the event
+        loop, for requests sent outside :meth:`send`. Returns the seconds waited.
+        """
+        return await self._bucket_for(urlsplit(url).netloc).acquire_async()
+
+    def record(self, url: str, **increments: float) -> None:
+        """
+        Adds to the {EndpointStats} counters of a request sent outside
+        :meth:`send`, e.g. by the asyncio client.
+        """
+        self._record(endpoint_name(url), **increments)
+
+    def stats_snapshot(self) -> dict[str, EndpointStats]:
+        with self._lock:
+            return {
+                endpoint: EndpointStats(**vars(stats))
+                for endpoint, stats in sorted(self._stats.items())
+            }
+
+    def _bucket_for(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    self.requests_per_second,
+                    self.burst,
+                    clock=self._clock,
+                    sleep=self._sleep,
+                )
+                self._buckets[host] = bucket
+            return bucket
+
+    def _record(self, endpoint: str, **increments: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            for field_name, increment in increments.items():
+                setattr(stats, field_name, getattr(stats, field_name) + increment)
@@ -0,0 +1,127 @@
+import logging
+import random
+from datetime import datetime, timedelta
+
+from ebay_watchlist.db.models import CategorySchedule
+from ebay_watchlist.db.repositories import CategoryScheduleRepository
+
+DEFAULT_MIN_POLL_INTERVAL_SECONDS = 120
+DEFAULT_MAX_POLL_INTERVAL_SECONDS = 60 * 60
+DEFAULT_POLL_JITTER_RATIO = 0.1
+# Weight of the latest observation in the new-items-per-hour moving average.
+DEFAULT_RATE_SMOOTHING = 0.3
+# Poll often enough that a category typically yields this many new items per poll.
+DEFAULT_TARGET_NEW_ITEMS_PER_POLL = 2.0
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Picks the next poll time of every category from its observed new-item rate.
+
+    Busy categories are polled close to {min_interval_seconds}, quiet ones drift
+    towards {max_interval_seconds}. State lives in the DB so restarts keep it.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: int = DEFAULT_MIN_POLL_INTERVAL_SECONDS,
+        max_interval_seconds: int = DEFAULT_MAX_POLL_INTERVAL_SECONDS,
+        jitter_ratio: float = DEFAULT_POLL_JITTER_RATIO,
+        smoothing: float = DEFAULT_RATE_SMOOTHING,
+        target_new_items_per_poll: float = DEFAULT_TARGET_NEW_ITEMS_PER_POLL,
+        rng: random.Random | None = None,
+    ):
+        if min_interval_seconds < 1:
+            raise ValueError("min_interval_seconds must be at least 1")
+        if max_interval_seconds < min_interval_seconds:
+            raise ValueError("max_interval_seconds must be >= min_interval_seconds")
+
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.jitter_ratio = jitter_ratio
+        self.smoothing = smoothing
+        self.target_new_items_per_poll = target_new_items_per_poll
+        self._rng = rng or random.Random()
+
+    def due_categories(self, category_ids: list[int], now: datetime) -> list[int]:
+        """
+        Categories without a schedule yet are always due.
+        """
+        schedules = CategoryScheduleRepository.get_schedules(category_ids)
+        return [
+            category_id
+            for category_id in category_ids
+            if category_id not in schedules
+            or schedules[category_id].next_poll_at <= now
+        ]
+
+    def seconds_until_next_poll(self, category_ids: list[int], now: datetime) -> float:
+        if not category_ids:
+            return float(self.max_interval_seconds)
+
+        schedules = CategoryScheduleRepository.get_schedules(category_ids)
+        if len(schedules) < len(set(category_ids)):
+            return 0.0
+
+        next_poll_at = min(schedule.next_poll_at for schedule in schedules.values())
+        return max(0.0, (next_poll_at - now).total_seconds())
+
+    def next_interval_seconds(self, new_items_per_hour: float) -> float:
+        """
+        Un-jittered interval for a rate, clamped to the configured bounds.
+        """
+        if new_items_per_hour <= 0:
+            return float(self.max_interval_seconds)
+
+        interval = self.target_new_items_per_poll / new_items_per_hour * 3600
+        return min(
+            float(self.max_interval_seconds),
+            max(float(self.min_interval_seconds), interval),
+        )
+
+    def record_poll(
+        self, category_id: int, new_items_count: int, polled_at: datetime
+    ) -> CategorySchedule:
+        previous = CategoryScheduleRepository.get_schedules([category_id]).get(
+            category_id
+        )
+
+        if previous is None or previous.last_polled_at is None:
+            # Nothing to measure a rate against yet; check back soon to learn one.
+            new_items_per_hour = 0.0
+            interval = float(self.min_interval_seconds)
+        else:
+            elapsed_hours = max(
+                (polled_at - previous.last_polled_at).total_seconds() / 3600,
+                1 / 3600,
+            )
+            observed_rate = new_items_count / elapsed_hours
+            new_items_per_hour = (
+                self.smoothing * observed_rate
+                + (1 - self.smoothing) * float(previous.new_items_per_hour)
+            )
+            interval = self.next_interval_seconds(new_items_per_hour)
+
+        jitter = self._rng.uniform(-self.jitter_ratio, self.jitter_ratio)
+        interval_seconds = int(
+            min(
+                float(self.max_interval_seconds),
+                max(float(self.min_interval_seconds), interval * (1 + jitter)),
+            )
+        )
+
+        logger.info(
+            "Poll scheduled: category_id=%s new_items_count=%s new_items_per_hour=%.2f interval_seconds=%s",
+            category_id,
+            new_items_count,
+            new_items_per_hour,
+            interval_seconds,
+        )
+        return CategoryScheduleRepository.save_schedule(
+            category_id=category_id,
+            new_items_per_hour=new_items_per_hour,
+            interval_seconds=interval_seconds,
+            last_polled_at=polled_at,
+            next_poll_at=polled_at + timedelta(seconds=interval_seconds),
+        )
@@ -1,19 +1,34 @@
+import base64
+import json
 import os
 import logging
 import ssl
+import threading
+from collections import OrderedDict
 from math import ceil
 from datetime import datetime
+from time import monotonic
 from urllib.parse import urljoin, urlparse
 
+import requests
 from flask import Blueprint, jsonify, request
 
+from ebay_watchlist.db.config import database
 from ebay_watchlist.db.models import Item, ItemNote
 from ebay_watchlist.db.repositories import (
     CategoryRepository,
+    CategoryTreeRepository,
+    CURSOR_DIRECTIONS,
+    CURSOR_NEXT,
+    CURSOR_PREV,
+    SEARCH_MODE_SUBSTRING,
+    SEARCH_MODES,
     ItemRepository,
+    OAuthTokenRepository,
     SellerRepository,
 )
-from ebay_watchlist.ebay.api import EbayAPI
+from ebay_watchlist.ebay.api import DEFAULT_API_BASE_URL, EbayAPI
+from ebay_watchlist.ebay.transport import RETRYABLE_STATUSES, RetryingTransport
 from ebay_watchlist.web.db import connect_db
 from ebay_watchlist.web.view_helpers import (
     get_main_category_name_by_id,
@@ -25,18 +40,33 @@ bp = Blueprint("api_v1", __name__, url_prefix="/api/v1")
 logger = logging.getLogger(__name__)
 DEFAULT_PAGE_SIZE = 100
 MAX_PAGE_SIZE = 200
+# A bulk refresh covers at most one full page of items.
+MAX_REFRESH_ITEM_IDS = MAX_PAGE_SIZE
 SUPPORTED_SORTS = {
     "newest",
     "ending_soon_active",
     "price_low",
     "price_high",
     "bids_desc",
+    "relevance",
 }
 QUICK_CATEGORY_FILTERS: list[tuple[int, str]] = [
     (619, "Musical Instruments"),
     (58058, "Computers"),
     (1249, "Videogames"),
 ]
+# /items totals cached per worker, see _count_items.
+COUNT_CACHE_TTL_SECONDS = 60
+COUNT_CACHE_MAX_ENTRIES = 256
+_count_cache: OrderedDict[tuple, tuple[int, float, int]] = OrderedDict()
+_count_cache_lock = threading.Lock()
+# One eBay client per worker process and configuration, see _get_ebay_client.
+_ebay_clients: dict[tuple[str, str, str, str], EbayAPI] = {}
+_ebay_clients_lock = threading.Lock()
+# eBay calls made inside a request retry briefly: gunicorn kills a worker that
+# takes longer than its 30s default timeout, so an error is better than a wait.
+WEB_EBAY_MAX_RETRIES = 1
+WEB_EBAY_RETRY_BUDGET_SECONDS = 5.0
 
 
 def _to_float(value: object | None, default: float = 0.0) -> float:
@@ -110,6 +140,11 @@ def _extract_price(price_payload: object) -> tuple[str | None, str | None]:
 
 
 def _apply_item_snapshot_update(item: Item, snapshot: dict) -> None:
+    _apply_item_snapshot(item, snapshot)
+    ItemRepository.save_refreshed_items([item])
+
+
+def _apply_item_snapshot(item: Item, snapshot: dict) -> None:
     price_value, price_currency = _extract_price(snapshot.get("price"))
     if price_value is not None and price_currency is not None:
         item.price = price_value
@@ -143,7 +178,6 @@ def _apply_item_snapshot_update(item: Item, snapshot: dict) -> None:
         item.web_url = _normalize_web_url(item_web_url.strip())
 
     item.db_update_date = datetime.now()
-    item.save()
 
 
 def _normalize_sort(sort_value: str) -> str:
@@ -167,6 +201,36 @@ def _parse_page(raw_value: str | None) -> int:
     return max(1, int(raw_value))
 
 
+def _encode_cursor(sort: str, direction: str, sort_key: list) -> str:
+    """Opaque token pointing next to a row: its sort key and the paging direction."""
+    values = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in sort_key
+    ]
+    payload = json.dumps(
+        {"sort": sort, "dir": direction, "key": values}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(raw_value: str, sort: str) -> tuple[str, list]:
+    """(direction, sort key) of a cursor, ValueError if it's not one for {sort}."""
+    try:
+        padding = "=" * (-len(raw_value) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(raw_value + padding))
+        direction = payload["dir"]
+        values = payload["key"]
+        if payload["sort"] != sort or direction not in CURSOR_DIRECTIONS:
+            raise ValueError
+        sort_key = [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in values
+        ]
+    except (TypeError, KeyError, ValueError) as exc:
+        raise ValueError(f"invalid cursor for sort {sort!r}") from exc
+    return direction, sort_key
+
+
 def _resolve_main_category_ids(selected_main_categories: list[str]) -> list[int]:
     main_category_name_by_id = _get_main_category_name_by_id()
     main_category_id_by_name = {
@@ -225,6 +289,37 @@ def _get_main_category_name_by_id() -> dict[int, str]:
     )
 
 
+def _get_ebay_client() -> EbayAPI | None:
+    """
+    Shared eBay client of this worker, so its OAuth token and taxonomy caches
+    outlive a single request. None when the eBay credentials are not configured.
+    """
+    client_id = os.getenv("EBAY_CLIENT_ID")
+    client_secret = os.getenv("EBAY_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        return None
+
+    marketplace_id = os.getenv("EBAY_MARKETPLACE_ID", "EBAY_GB")
+    base_url = os.getenv("EBAY_API_BASE_URL", DEFAULT_API_BASE_URL)
+    client_key = (client_id, client_secret, marketplace_id, base_url)
+    with _ebay_clients_lock:
+        api = _ebay_clients.get(client_key)
+        if api is None:
+            api = EbayAPI(
+                client_id=client_id,
+                client_secret=client_secret,
+                marketplace_id=marketplace_id,
+                token_store=OAuthTokenRepository,
+                base_url=base_url,
+                transport=RetryingTransport(
+                    max_retries=WEB_EBAY_MAX_RETRIES,
+                    retry_budget_seconds=WEB_EBAY_RETRY_BUDGET_SECONDS,
+                ),
+            )
+            _ebay_clients[client_key] = api
+        return api
+
+
 def _search_watchlist_category_suggestions(
     query: str,
     marketplace_id: str | None = None,
@@ -233,23 +328,20 @@ def _search_watchlist_category_suggestions(
     if len(normalized_query) < 2:
         return []
 
+    resolved_marketplace_id = marketplace_id or os.getenv("EBAY_MARKETPLACE_ID", "EBAY_GB")
+    if CategoryTreeRepository.get_synced_tree(resolved_marketplace_id) is not None:
+        return CategoryTreeRepository.search_categories(normalized_query, limit=15)
+
     fallback = [
         {"id": str(category_id), "name": category_name, "path": category_name}
         for category_id, category_name in ItemRepository.get_scraped_category_suggestions()
         if normalized_query.lower() in category_name.lower()
     ][:15]
 
-    client_id = os.getenv("EBAY_CLIENT_ID")
-    client_secret = os.getenv("EBAY_CLIENT_SECRET")
-    if not client_id or not client_secret:
+    api = _get_ebay_client()
+    if api is None:
         return fallback
 
-    resolved_marketplace_id = marketplace_id or os.getenv("EBAY_MARKETPLACE_ID", "EBAY_GB")
-    api = EbayAPI(
-        client_id=client_id,
-        client_secret=client_secret,
-        marketplace_id=resolved_marketplace_id,
-    )
     try:
         return api.get_category_suggestions(
             query=normalized_query,
@@ -287,62 +379,129 @@ def _snapshot_ranking(
     return rows
 
 
+def _item_filters_from_request() -> dict:
+    """Filter arguments for ItemRepository shared by /items and /items/count."""
+    search_mode = request.args.get("search_mode", SEARCH_MODE_SUBSTRING)
+    if search_mode not in SEARCH_MODES:
+        search_mode = SEARCH_MODE_SUBSTRING
+    selected_main_categories = normalize_multi(request.args.getlist("main_category"))
+    return {
+        "seller_names": normalize_multi(request.args.getlist("seller")) or None,
+        "category_names": normalize_multi(request.args.getlist("category")) or None,
+        "scraped_category_ids": (
+            _resolve_main_category_ids(selected_main_categories) or None
+        ),
+        "search_query": (request.args.get("q") or "").strip() or None,
+        "include_hidden": request.args.get("show_hidden") == "1",
+        "include_favorites_only": request.args.get("favorite") == "1",
+        "include_ended": request.args.get("show_ended") == "1",
+        "only_last_24h": request.args.get("last_24h") == "1",
+        "search_mode": search_mode,
+    }
+
+
+def _count_items(filters: dict, reference_time: datetime) -> int:
+    """
+    count_filtered_items through a per-worker cache keyed by the normalized
+    filters. An entry is reused while the item generation is unchanged, and for
+    at most COUNT_CACHE_TTL_SECONDS because the active and last-24h filters
+    move with the clock.
+    """
+    key = (database.database,) + tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(filters.items())
+    )
+    generation = ItemRepository.get_generation()
+    now = monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached is not None and cached[0] == generation and cached[1] > now:
+            _count_cache.move_to_end(key)
+            return cached[2]
+
+    total = ItemRepository.count_filtered_items(
+        **filters, reference_time=reference_time
+    )
+    with _count_cache_lock:
+        _count_cache[key] = (generation, now + COUNT_CACHE_TTL_SECONDS, total)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return total
+
+
 @bp.route("/items")
 def items():
     _ = connect_db()
 
-    selected_sellers = normalize_multi(request.args.getlist("seller"))
-    selected_categories = normalize_multi(request.args.getlist("category"))
-    selected_main_categories = normalize_multi(request.args.getlist("main_category"))
-    search_query = (request.args.get("q") or "").strip()
-    include_hidden = request.args.get("show_hidden") == "1"
-    include_ended = request.args.get("show_ended") == "1"
-    only_last_24h = request.args.get("last_24h") == "1"
-    include_favorites_only = request.args.get("favorite") == "1"
+    filters = _item_filters_from_request()
     sort = _normalize_sort(request.args.get("sort", "newest"))
+    page_size = _parse_page_size(request.args.get("page_size"))
+    requested_page = _parse_page(request.args.get("page"))
+    include_total = request.args.get("include_total") != "0"
+    cursor = None
+    if request.args.get("cursor"):
+        try:
+            cursor = _decode_cursor(request.args["cursor"], sort)
+        except ValueError:
+            return jsonify({"error": "invalid cursor"}), 400
     reference_now = datetime.now()
 
-    selected_main_category_ids = _resolve_main_category_ids(selected_main_categories)
+    total_count = _count_items(filters, reference_now) if include_total else None
+    if total_count is None:
+        total_pages = None
+        page = requested_page
+    else:
+        total_pages = max(1, ceil(total_count / page_size))
+        page = min(requested_page, total_pages)
 
-    page_size = _parse_page_size(request.args.get("page_size"))
-    requested_page = _parse_page(request.args.get("page"))
-    total_count = ItemRepository.count_filtered_items(
-        seller_names=selected_sellers or None,
-        category_names=selected_categories or None,
-        scraped_category_ids=selected_main_category_ids or None,
-        search_query=search_query or None,
-        sort=sort,
-        include_hidden=include_hidden,
-        include_favorites_only=include_favorites_only,
-        include_ended=include_ended,
-        only_last_24h=only_last_24h,
-        reference_time=reference_now,
+    direction, keyset = cursor if cursor is not None else (CURSOR_NEXT, None)
+    # Without a total, one extra row tells whether another page follows.
+    read_ahead = keyset is not None or total_count is None
+    try:
+        rows = list(
+            ItemRepository.get_filtered_items(
+                **filters,
+                sort=sort,
+                reference_time=reference_now,
+                limit=page_size + 1 if read_ahead else page_size,
+                offset=(page - 1) * page_size,
+                keyset=keyset,
+                keyset_direction=direction,
+            )
+        )
+    except ValueError:
+        return jsonify({"error": "invalid cursor"}), 400
+
+    if keyset is None:
+        items = rows[:page_size]
+        has_next = (
+            len(rows) > page_size if total_pages is None else page < total_pages
+        )
+        has_prev = page > 1
+    elif direction == CURSOR_PREV:
+        # In cursor mode {page} only echoes the client's own page counter.
+        items = rows[-page_size:]
+        has_next = True
+        has_prev = len(rows) > page_size
+    else:
+        items = rows[:page_size]
+        has_next = len(rows) > page_size
+        has_prev = True
+    next_cursor = (
+        _encode_cursor(sort, CURSOR_NEXT, ItemRepository.get_sort_key(items[-1]))
+        if has_next and items
+        else None
+    )
+    prev_cursor = (
+        _encode_cursor(sort, CURSOR_PREV, ItemRepository.get_sort_key(items[0]))
+        if has_prev and items
+        else None
     )
-    total_pages = max(1, ceil(total_count / page_size))
-    page = min(requested_page, total_pages)
-    offset = (page - 1) * page_size
-
-    items = ItemRepository.get_filtered_items(
-        seller_names=selected_sellers or None,
-        category_names=selected_categories or None,
-        scraped_category_ids=selected_main_category_ids or None,
-        search_query=search_query or None,
-        sort=sort,
-        include_hidden=include_hidden,
-        include_favorites_only=include_favorites_only,
-        include_ended=include_ended,
-        only_last_24h=only_last_24h,
-        reference_time=reference_now,
-        limit=page_size,
-        offset=offset,
+
+    note_by_item_id = ItemRepository.get_item_notes(
+        [str(item.item_id) for item in items]
     )
-    item_ids = [str(item.item_id) for item in items]
-    state_by_item_id = ItemRepository.get_item_states(item_ids)
-    note_by_item_id = ItemRepository.get_item_notes(item_ids)
-    for item in items:
-        state = state_by_item_id.get(str(item.item_id))
-        item.hidden = bool(state.hidden) if state is not None else False
-        item.favorite = bool(state.favorite) if state is not None else False
 
     return jsonify(
         {
@@ -354,13 +513,24 @@ def items():
             "page_size": page_size,
             "total": total_count,
             "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
             "sort": sort,
         }
     )
 
 
+@bp.route("/items/count")
+def items_count():
+    """Exact total for the /items filters, for clients using include_total=0."""
+    _ = connect_db()
+    page_size = _parse_page_size(request.args.get("page_size"))
+    total = _count_items(_item_filters_from_request(), datetime.now())
+    return jsonify({"total": total, "total_pages": max(1, ceil(total / page_size))})
+
+
 @bp.route("/items/<item_id>/favorite", methods=["POST"])
 def update_favorite(item_id: str):
     _ = connect_db()
@@ -423,6 +593,117 @@ def upsert_note(item_id: str):
     )
 
 
+def _log_refresh_failure(item_id: str) -> None:
+    logger.exception(
+        "Manual refresh failed for item_id=%s | openssl=%s OPENSSL_CONF=%r "
+        "OPENSSL_MODULES=%r SSL_CERT_FILE=%r SSL_CERT_DIR=%r",
+        item_id,
+        ssl.OPENSSL_VERSION,
+        os.getenv("OPENSSL_CONF"),
+        os.getenv("OPENSSL_MODULES"),
+        os.getenv("SSL_CERT_FILE"),
+        os.getenv("SSL_CERT_DIR"),
+    )
+
+
+def _ebay_unavailable(error: Exception) -> bool:
+    """
+    True when eBay was rate limiting, failing or unreachable for longer than
+    the web client's retry budget, rather than rejecting the request.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in RETRYABLE_STATUSES
+
+
+def _ebay_unavailable_response():
+    return jsonify({"error": "refresh unavailable: ebay is busy, try again later"}), 503
+
+
+@bp.route("/items/refresh", methods=["POST"])
+def refresh_items():
+    """
+    Refreshes up to {MAX_REFRESH_ITEM_IDS} items with batched getItems calls and
+    writes every update in one transaction. Ids that could not be refreshed are
+    reported in "errors" instead of failing the whole request.
+    """
+    _ = connect_db()
+    payload = request.get_json(silent=True) or {}
+    raw_item_ids = payload.get("item_ids")
+    if (
+        not isinstance(raw_item_ids, list)
+        or not raw_item_ids
+        or not all(isinstance(item_id, str) and item_id for item_id in raw_item_ids)
+    ):
+        return jsonify({"error": "item_ids must be a non-empty list of strings"}), 400
+
+    item_ids = list(dict.fromkeys(raw_item_ids))
+    if len(item_ids) > MAX_REFRESH_ITEM_IDS:
+        return (
+            jsonify({"error": f"at most {MAX_REFRESH_ITEM_IDS} item_ids per request"}),
+            400,
+        )
+
+    api = _get_ebay_client()
+    if api is None:
+        logger.warning(
+            "Manual bulk refresh unavailable for %s items: missing eBay credentials",
+            len(item_ids),
+        )
+        return (
+            jsonify(
+                {"error": "refresh unavailable: missing EBAY_CLIENT_ID or EBAY_CLIENT_SECRET"}
+            ),
+            503,
+        )
+
+    item_by_id = {
+        str(item.item_id): item for item in ItemRepository.get_items_by_ids(item_ids)
+    }
+    errors = {
+        item_id: "item not found" for item_id in item_ids if item_id not in item_by_id
+    }
+    local_item_ids = [item_id for item_id in item_ids if item_id in item_by_id]
+
+    snapshots: dict[str, dict | None] = {}
+    if local_item_ids:
+        try:
+            snapshots = api.get_item_snapshots(local_item_ids)
+        except Exception as error:
+            _log_refresh_failure(",".join(local_item_ids))
+            if _ebay_unavailable(error):
+                return _ebay_unavailable_response()
+            return jsonify({"error": "refresh failed: could not fetch items from ebay"}), 502
+
+    refreshed_items: list[Item] = []
+    for item_id in local_item_ids:
+        snapshot = snapshots.get(item_id)
+        if snapshot is None:
+            errors[item_id] = "item not found on ebay"
+            continue
+        item = item_by_id[item_id]
+        _apply_item_snapshot(item, snapshot)
+        refreshed_items.append(item)
+    ItemRepository.save_refreshed_items(refreshed_items)
+
+    note_by_item_id = ItemRepository.get_item_notes(
+        [str(item.item_id) for item in refreshed_items]
+    )
+
+    if errors:
+        logger.warning("Manual bulk refresh errors: %s", errors)
+    return jsonify(
+        {
+            "items": [
+                _serialize_item(item, note=note_by_item_id.get(str(item.item_id)))
+                for item in refreshed_items
+            ],
+            "errors": errors,
+        }
+    )
+
+
 @bp.route("/items/<item_id>/refresh", methods=["POST"])
 def refresh_item(item_id: str):
     _ = connect_db()
@@ -431,9 +712,8 @@ def refresh_item(item_id: str):
         logger.warning("Manual refresh requested for missing local item item_id=%s", item_id)
         return jsonify({"error": "item not found"}), 404
 
-    client_id = os.getenv("EBAY_CLIENT_ID")
-    client_secret = os.getenv("EBAY_CLIENT_SECRET")
-    if not client_id or not client_secret:
+    api = _get_ebay_client()
+    if api is None:
         logger.warning(
             "Manual refresh unavailable for item_id=%s: missing eBay credentials",
             item_id,
@@ -445,26 +725,12 @@ def refresh_item(item_id: str):
             503,
         )
 
-    marketplace_id = os.getenv("EBAY_MARKETPLACE_ID", "EBAY_GB")
-    api = EbayAPI(
-        client_id=client_id,
-        client_secret=client_secret,
-        marketplace_id=marketplace_id,
-    )
-
     try:
         snapshot = api.get_item_snapshot(item_id=item_id)
-    except Exception:
-        logger.exception(
-            "Manual refresh failed for item_id=%s | openssl=%s OPENSSL_CONF=%r "
-            "OPENSSL_MODULES=%r SSL_CERT_FILE=%r SSL_CERT_DIR=%r",
-            item_id,
-            ssl.OPENSSL_VERSION,
-            os.getenv("OPENSSL_CONF"),
-            os.getenv("OPENSSL_MODULES"),
-            os.getenv("SSL_CERT_FILE"),
-            os.getenv("SSL_CERT_DIR"),
-        )
+    except Exception as error:
+        _log_refresh_failure(item_id)
+        if _ebay_unavailable(error):
+            return _ebay_unavailable_response()
         return jsonify({"error": "refresh failed: could not fetch item from ebay"}), 502
 
     if snapshot is None:
@@ -473,10 +739,7 @@ def refresh_item(item_id: str):
 
     _apply_item_snapshot_update(item, snapshot)
 
-    state = ItemRepository.get_item_states([item_id]).get(item_id)
     note = ItemRepository.get_item_notes([item_id]).get(item_id)
-    item.hidden = bool(state.hidden) if state is not None else False
-    item.favorite = bool(state.favorite) if state is not None else False
 
     return jsonify({"item": _serialize_item(item, note=note)})
 
@@ -485,7 +748,9 @@ def refresh_item(item_id: str):
 def seller_suggestions():
     _ = connect_db()
     query = (request.args.get("q") or "").strip()
-    suggestions = ItemRepository.get_seller_suggestions(query=query)
+    suggestions = ItemRepository.get_seller_suggestions(
+        query=query, rank_by_count=request.args.get("rank") == "count"
+    )
     return jsonify(
         {
             "items": [{"value": suggestion, "label": suggestion} for suggestion in suggestions]
@@ -503,6 +768,7 @@ def category_suggestions():
     suggestions = ItemRepository.get_category_suggestions(
         query=query,
         scraped_category_ids=main_category_ids or None,
+        rank_by_count=request.args.get("rank") == "count",
     )
     return jsonify(
         {
@@ -604,7 +870,8 @@ def remove_watchlist_category(category_id: int):
 
 @bp.route("/watchlist/category-suggestions")
 def watchlist_category_suggestions():
-    _ = connect_db()
+    # Falling back to the eBay API may persist a refreshed OAuth token.
+    _ = connect_db(read_only=False)
     query = request.args.get("q", "")
     marketplace_id = request.args.get("marketplace_id")
     suggestions = _search_watchlist_category_suggestions(
@@ -614,6 +881,18 @@ def watchlist_category_suggestions():
     return jsonify({"suggestions": suggestions})
 
 
+@bp.route("/ebay/cache-stats")
+def ebay_cache_stats():
+    """
+    Taxonomy cache counters of this worker's eBay client.
+    """
+    api = _get_ebay_client()
+    cache_stats = api.cache_stats() if api is not None else {}
+    return jsonify(
+        {"caches": {name: vars(stats) for name, stats in cache_stats.items()}}
+    )
+
+
 @bp.route("/analytics")
 def analytics_snapshot():
     _ = connect_db()
@@ -1,21 +1,25 @@
-from flask import g
-from peewee import OperationalError
+from flask import g, has_request_context, request
 
 from ebay_watchlist.db.config import database
 from ebay_watchlist.db.utils import ensure_schema_compatibility
 
 
-def connect_db():
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def connect_db(read_only: bool | None = None):
     """
     create a db connection for this request
+
+    GET/HEAD/OPTIONS requests get a read-only connection (mode=ro, query_only)
+    unless {read_only} says otherwise; mutations and app setup get the writer.
     :return:
     """
-    if "db" not in g:
-        try:
-            database.connect()
-        except OperationalError:  # Connection already open
-            pass
-        g.db = database
+    if read_only is None:
+        read_only = has_request_context() and request.method in READ_ONLY_METHODS
+
+    database.connect(reuse_if_open=True, read_only=read_only)
+    g.db = database
     return g.db
 
 
@@ -3,7 +3,7 @@ from urllib.parse import urlencode
 
 from flask import Blueprint, jsonify, redirect, request, send_from_directory, url_for
 
-from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.db.repositories import CategoryTreeRepository, ItemRepository
 from ebay_watchlist.web.db import connect_db
 from ebay_watchlist.web.view_helpers import get_main_category_name_by_id
 
@@ -96,6 +96,7 @@ def items_by_seller(seller_name: str):
 
 @bp.route("/categories/<int:category_id>")
 def items_by_leaf_category(category_id: int):
+    _ = connect_db()
     category_name = ItemRepository.get_category_name_by_id(category_id)
     if category_name is None:
         return redirect(url_for("main.home"))
@@ -105,13 +106,20 @@ def items_by_leaf_category(category_id: int):
 
 @bp.route("/main_category/<int:category_id>")
 def items_by_parent_category(category_id: int):
+    _ = connect_db()
     main_category_name_by_id = get_main_category_name_by_id(
         quick_category_filters=QUICK_CATEGORY_FILTERS,
         scraped_category_suggestions=ItemRepository.get_scraped_category_suggestions(),
     )
     category_name = main_category_name_by_id.get(category_id)
     if category_name is None:
-        return redirect(url_for("main.home"))
+        # Leaf or intermediate categories resolve to their nearest main category.
+        for ancestor in reversed(CategoryTreeRepository.get_ancestors(category_id)):
+            category_name = main_category_name_by_id.get(int(ancestor.category_id))
+            if category_name is not None:
+                break
+        else:
+            return redirect(url_for("main.home"))
 
     return _redirect_to_home_with_params([("main_category", category_name)])
 
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import threading
 from dataclasses import dataclass
 
 import pytest
@@ -85,13 +87,35 @@ def test_fetch_updates_runs_full_happy_path_with_notifications(monkeypatch, capl
     }
 
     class FakeEbayAPI:
-        def __init__(self, client_id: str, client_secret: str, marketplace_id: str):
+        def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            marketplace_id: str,
+            seller_shard_size: int,
+            token_store,
+            transport,
+            base_url,
+            parse_mode,
+        ):
             calls["api_init"] = (client_id, client_secret, marketplace_id)
+            calls["seller_shard_size"] = seller_shard_size
+            self.transport = transport
 
         def get_latest_items_for_sellers(
-            self, seller_names: list[str], category_id: int, limit: int
+            self,
+            seller_names: list[str],
+            category_id: int,
+            limit: int,
+            known_item_ids: set[str],
+            max_pages: int,
         ):
             calls["latest_items"].append((tuple(seller_names), category_id, limit))
+            calls["known_item_ids"] = known_item_ids
+            calls["max_pages"] = max_pages
+            self.transport.record(
+                "https://api.ebay.com/buy/browse/v1/item_summary/search", attempts=1
+            )
             return items_by_category[category_id]
 
     class FakeNotificationService:
@@ -117,9 +141,17 @@ def test_fetch_updates_runs_full_happy_path_with_notifications(monkeypatch, capl
     )
     monkeypatch.setattr(
         cli_main.ItemRepository,
-        "create_or_update_item_from_ebay_item_dto",
+        "get_active_item_ids",
+        staticmethod(lambda: {"known-1"}),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "upsert_items_from_ebay_item_dtos",
         staticmethod(
-            lambda item, category_id: calls["created_items"].append((item, category_id))
+            lambda items, category_id: calls["created_items"].extend(
+                (item, category_id) for item in items
+            )
+            or ([], [], [])
         ),
     )
     monkeypatch.setattr(
@@ -128,6 +160,9 @@ def test_fetch_updates_runs_full_happy_path_with_notifications(monkeypatch, capl
         staticmethod(lambda start: ["created-row"]),
     )
     monkeypatch.setattr(cli_main, "display_db_items", lambda items: calls.update(displayed=items))
+    monkeypatch.setattr(
+        cli_main, "display_http_stats", lambda stats: calls.update(http_stats=stats)
+    )
     monkeypatch.setattr(
         cli_main,
         "print_with_timestamp",
@@ -135,14 +170,17 @@ def test_fetch_updates_runs_full_happy_path_with_notifications(monkeypatch, capl
     )
     caplog.set_level(logging.INFO, logger=cli_main.__name__)
 
-    cli_main.fetch_updates(limit=2)
+    cli_main.fetch_updates(limit=2, seller_shard_size=25, http_stats=True)
 
     assert calls["api_init"] == ("client-id", "client-secret", "EBAY_GB")
+    assert calls["seller_shard_size"] == 25
     assert calls["latest_items"] == [
         (("seller-1", "seller-2"), 619, 2),
         (("seller-1", "seller-2"), 58058, 2),
     ]
     assert len(calls["created_items"]) == 4
+    assert calls["known_item_ids"] == {"known-1"}
+    assert calls["max_pages"] == cli_main.DEFAULT_FETCH_MAX_PAGES
     assert calls["displayed"] == ["created-row"]
     assert calls["notified"] == ["created-row"]
     fetch_log_messages = [record.message for record in caplog.records]
@@ -165,6 +203,9 @@ def test_fetch_updates_runs_full_happy_path_with_notifications(monkeypatch, capl
         for message in fetch_log_messages
     )
     assert any("new items inserted" in message for message in calls["messages"])
+    search_stats = calls["http_stats"]["api.ebay.com/buy/browse/v1/item_summary/search"]
+    assert search_stats.attempts == 2
+    assert search_stats.retries == 0
 
 
 def test_show_latest_items_uses_category_specific_query_when_present(monkeypatch):
@@ -246,3 +287,250 @@ def test_main_ignores_operational_error_when_closing_database(monkeypatch):
     cli_main.main()
 
     assert close_called["value"] is True
+
+
+def test_fetch_updates_rejects_invalid_concurrency():
+    with pytest.raises(ValueError, match="concurrency must be at least 1"):
+        cli_main.fetch_updates(limit=1, concurrency=0)
+
+
+def test_fetch_updates_fetches_categories_concurrently_with_single_writer(
+    monkeypatch,
+):
+    main_thread = threading.current_thread()
+    both_in_flight = threading.Barrier(2, timeout=5)
+    writer_threads: set[threading.Thread] = set()
+    messages: list[str] = []
+
+    class FakeEbayAPI:
+        def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            marketplace_id: str,
+            seller_shard_size: int,
+            token_store,
+            transport,
+            base_url,
+            parse_mode,
+        ):
+            _ = client_id, client_secret, marketplace_id, seller_shard_size, token_store
+
+        def get_latest_items_for_sellers(
+            self,
+            seller_names: list[str],
+            category_id: int,
+            limit: int,
+            known_item_ids: set[str],
+            max_pages: int,
+        ):
+            # Both categories must be in flight at the same time to pass.
+            both_in_flight.wait()
+            return [_FakeItem(_FakeSeller(f"seller-{category_id}"))]
+
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setenv("ENABLE_NOTIFICATIONS", "0")
+    monkeypatch.setattr(cli_main, "EbayAPI", FakeEbayAPI)
+    monkeypatch.setattr(cli_main, "NotificationService", lambda: None)
+    monkeypatch.setattr(
+        cli_main.SellerRepository,
+        "get_enabled_sellers",
+        staticmethod(lambda: ["seller-1"]),
+    )
+    monkeypatch.setattr(
+        cli_main.CategoryRepository,
+        "get_enabled_categories",
+        staticmethod(lambda: [619, 58058]),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "get_active_item_ids",
+        staticmethod(lambda: {"known-1"}),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "upsert_items_from_ebay_item_dtos",
+        staticmethod(
+            lambda items, category_id: writer_threads.add(threading.current_thread())
+            or ([], [], [])
+        ),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "get_items_created_after_datetime",
+        staticmethod(lambda start: []),
+    )
+    monkeypatch.setattr(cli_main, "print_with_timestamp", messages.append)
+
+    cli_main.fetch_updates(limit=1, concurrency=2)
+
+    assert writer_threads == {main_thread}
+    assert any(
+        "2[/bold] categories fetched" in message and "concurrency=2" in message
+        for message in messages
+    )
+
+
+def test_fetch_updates_async_engine_writes_from_single_writer(monkeypatch):
+    main_thread = threading.current_thread()
+    written: list[tuple[int, threading.Thread]] = []
+    messages: list[str] = []
+
+    class FakeAsyncEbayAPI:
+        def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            marketplace_id: str,
+            max_in_flight: int,
+            seller_shard_size: int,
+            token_store,
+            transport,
+            base_url,
+            parse_mode,
+        ):
+            assert max_in_flight == 3
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+        async def get_latest_items_for_sellers(
+            self,
+            seller_names: list[str],
+            category_id: int,
+            limit: int,
+            known_item_ids: set[str],
+            max_pages: int,
+        ):
+            return [_FakeItem(_FakeSeller(f"seller-{category_id}"))]
+
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setenv("ENABLE_NOTIFICATIONS", "0")
+    monkeypatch.setattr(cli_main, "AsyncEbayAPI", FakeAsyncEbayAPI)
+    monkeypatch.setattr(cli_main, "NotificationService", lambda: None)
+    monkeypatch.setattr(
+        cli_main.SellerRepository,
+        "get_enabled_sellers",
+        staticmethod(lambda: ["seller-1"]),
+    )
+    monkeypatch.setattr(
+        cli_main.CategoryRepository,
+        "get_enabled_categories",
+        staticmethod(lambda: [619, 58058]),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "get_active_item_ids",
+        staticmethod(lambda: set()),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "upsert_items_from_ebay_item_dtos",
+        staticmethod(
+            lambda items, category_id: written.append(
+                (category_id, threading.current_thread())
+            )
+            or ([], [], [])
+        ),
+    )
+    monkeypatch.setattr(
+        cli_main.ItemRepository,
+        "get_items_created_after_datetime",
+        staticmethod(lambda start: []),
+    )
+    monkeypatch.setattr(cli_main, "print_with_timestamp", messages.append)
+
+    cli_main.fetch_updates(limit=1, engine="async", max_in_flight=3)
+
+    assert sorted(category_id for category_id, _ in written) == [619, 58058]
+    # Writes run off the event loop's thread.
+    assert main_thread not in {thread for _, thread in written}
+    assert any("engine=async, max_in_flight=3" in message for message in messages)
+
+
+class _SlowFetchAsyncEbayAPI:
+    """Returns category 1 at once and every other category after a short wait."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def get_latest_items_for_sellers(self, category_id: int, **kwargs):
+        if category_id != 1:
+            await asyncio.sleep(0.05)
+        return [_FakeItem(_FakeSeller(f"seller-{category_id}"))]
+
+
+def test_async_engine_keeps_fetching_while_writes_run_one_at_a_time(monkeypatch):
+    fetched_while_writing = threading.Event()
+    overlapped: list[bool] = []
+    active_writes: list[int] = []
+    max_active_writes = 0
+
+    def store_category_items(category_id, items, elapsed_seconds):
+        nonlocal max_active_writes
+        active_writes.append(category_id)
+        max_active_writes = max(max_active_writes, len(active_writes))
+        if category_id == 1:
+            # Only set if the loop keeps fetching while this write blocks.
+            overlapped.append(fetched_while_writing.wait(timeout=2))
+        active_writes.remove(category_id)
+        return len(items), 0, 0
+
+    api = _SlowFetchAsyncEbayAPI()
+    original_fetch = api.get_latest_items_for_sellers
+
+    async def fetch(category_id: int, **kwargs):
+        items = await original_fetch(category_id=category_id, **kwargs)
+        if category_id != 1:
+            fetched_while_writing.set()
+        return items
+
+    api.get_latest_items_for_sellers = fetch
+    monkeypatch.setattr(cli_main, "_store_category_items", store_category_items)
+
+    _, write_counts = asyncio.run(
+        cli_main._fetch_and_store_async(
+            api, ["seller"], [1, 2, 3], limit=1, known_item_ids=set(), max_pages=1
+        )
+    )
+
+    assert overlapped == [True]
+    assert write_counts == {1: (1, 0, 0), 2: (1, 0, 0), 3: (1, 0, 0)}
+    assert max_active_writes == 1
+
+
+def test_async_engine_write_failure_stops_fetchers_blocked_on_the_queue(monkeypatch):
+    def store_category_items(category_id, items, elapsed_seconds):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(cli_main, "_store_category_items", store_category_items)
+    # More categories than the queue holds, so fetchers block on it.
+    categories = list(range(1, cli_main.ASYNC_WRITE_QUEUE_SIZE + 4))
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        asyncio.run(
+            asyncio.wait_for(
+                cli_main._fetch_and_store_async(
+                    _SlowFetchAsyncEbayAPI(),
+                    ["seller"],
+                    categories,
+                    limit=1,
+                    known_item_ids=set(),
+                    max_pages=1,
+                ),
+                timeout=5,
+            )
+        )
+
+
+def test_fetch_updates_rejects_unknown_engine():
+    with pytest.raises(ValueError, match="engine must be one of"):
+        cli_main.fetch_updates(limit=1, engine="gevent")
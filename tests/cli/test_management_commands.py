@@ -1,11 +1,20 @@
+from datetime import datetime, timedelta
+
 from typer.testing import CliRunner
 
 from ebay_watchlist.db.config import database
-from ebay_watchlist.db.repositories import CategoryRepository, SellerRepository
+from ebay_watchlist.db.models import Category, Item, ItemRollup, Seller
+from ebay_watchlist.db.repositories import (
+    CategoryRepository,
+    CategoryTreeRepository,
+    ItemRepository,
+    SellerRepository,
+)
 from ebay_watchlist.cli.main import app
 from ebay_watchlist.ebay.categories import (
     CATEGORY_MUSICAL_INSTRUMENTS_AND_DJ_EQUIPMENT,
 )
+from ebay_watchlist.ebay.fake_server import FakeEbayServer
 
 
 runner = CliRunner()
@@ -60,3 +69,80 @@ def test_load_defaults_adds_seed_sellers_and_categories(temp_db):
     assert len(sellers) == 7
     assert "bhf_shops" in sellers
     assert categories == [CATEGORY_MUSICAL_INSTRUMENTS_AND_DJ_EQUIPMENT]
+
+
+def test_sync_category_tree_mirrors_the_marketplace_tree(temp_db, monkeypatch):
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+
+    with FakeEbayServer() as server:
+        monkeypatch.setenv("EBAY_API_BASE_URL", server.base_url)
+        result = runner.invoke(
+            app, ["config", "sync-category-tree", "--marketplace-id", "EBAY_US"]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "synced 7 categories of tree 3" in result.stdout
+    assert CategoryTreeRepository.get_synced_tree("EBAY_US") is not None
+    assert CategoryTreeRepository.search_categories("synth") == [
+        {
+            "id": "180014",
+            "name": "Synthesisers",
+            "path": "Musical Instruments & DJ Equipment > Synthesisers",
+        }
+    ]
+
+
+def test_rebuild_rollups_recounts_buckets_from_items(temp_db):
+    now = datetime(2025, 1, 1, 12, 30)
+    for item_id, seller_name in [("1", "alice"), ("2", "alice"), ("3", "bob")]:
+        Item.create(
+            item_id=item_id,
+            title="Synth",
+            scraped_category_id=619,
+            category_id=619,
+            category=Category.get_or_create(name="Synthesisers")[0],
+            seller=Seller.get_or_create(name=seller_name)[0],
+            web_url=f"https://www.ebay.com/itm/{item_id}",
+            origin_date=now,
+            creation_date=now,
+            end_date=now + timedelta(days=1),
+        )
+    ItemRollup.delete().execute()
+    Seller.update(item_count=0).execute()
+
+    result = runner.invoke(app, ["config", "rebuild-rollups"])
+
+    assert result.exit_code == 0, result.output
+    # One created hour, one ending hour and one scraped category; the seller
+    # counts are recounted on the Seller rows.
+    assert "rebuilt 3 rollup buckets" in result.stdout
+    assert ItemRepository.get_analytics_snapshot(now=now)["top_sellers"] == [
+        ("alice", 2),
+        ("bob", 1),
+    ]
+
+
+def test_rebuild_search_indexes_rekeys_titles_on_current_rowids(temp_db):
+    now = datetime(2025, 1, 1, 12, 30)
+    for item_id, title in [("1", "Roland Juno-106"), ("2", "Yamaha DX7")]:
+        Item.create(
+            item_id=item_id,
+            title=title,
+            scraped_category_id=619,
+            category_id=619,
+            category=Category.get_or_create(name="Synthesisers")[0],
+            seller=Seller.get_or_create(name="alice")[0],
+            web_url=f"https://www.ebay.com/itm/{item_id}",
+            origin_date=now,
+            creation_date=now,
+            end_date=now + timedelta(days=1),
+        )
+    database.execute_sql("UPDATE item SET rowid = rowid + 100")
+
+    result = runner.invoke(app, ["config", "rebuild-search-indexes"])
+
+    assert result.exit_code == 0, result.output
+    assert "rebuilt the title search indexes" in result.stdout
+    items = ItemRepository.get_filtered_items(search_query="juno", reference_time=now)
+    assert [item.item_id for item in items] == ["1"]
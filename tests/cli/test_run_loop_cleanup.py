@@ -48,11 +48,18 @@ def test_run_loop_invokes_cleanup_periodically(monkeypatch):
     monkeypatch.setattr(cli_main, "cleanup_expired_items", fake_cleanup_expired_items)
     monkeypatch.setattr(cli_main, "sleep", fake_sleep)
     monkeypatch.setattr(cli_main, "print_with_timestamp", lambda message: None)
+    checkpoint_modes: list[str] = []
+    monkeypatch.setattr(
+        cli_main,
+        "checkpoint_wal",
+        lambda mode: checkpoint_modes.append(mode) or (0, 0, 0),
+    )
 
     cli_main.run_loop(cleanup_retention_days=45, cleanup_interval_minutes=60)
 
     assert fetch_calls["count"] == 3
     assert cleanup_calls == [45, 45]
+    assert checkpoint_modes == ["TRUNCATE", "PASSIVE", "TRUNCATE"]
 
 
 def test_run_loop_continues_when_cleanup_raises(monkeypatch):
@@ -87,3 +94,53 @@ def test_run_loop_continues_when_cleanup_raises(monkeypatch):
 
     assert fetch_calls["count"] == 2
     assert any("Cleanup failed" in message for message in messages)
+
+
+def test_run_loop_adaptive_schedule_fetches_only_due_categories(monkeypatch):
+    fetched: list[list[int] | None] = []
+    recorded: list[tuple[int, int]] = []
+    sleeps: list[float] = []
+
+    class FakeScheduler:
+        min_interval_seconds = 120
+
+        def __init__(self, min_interval_seconds: int, max_interval_seconds: int):
+            assert (min_interval_seconds, max_interval_seconds) == (60, 900)
+
+        def due_categories(self, category_ids, now):
+            return [619]
+
+        def record_poll(self, category_id, new_items_count, polled_at):
+            recorded.append((category_id, new_items_count))
+
+        def seconds_until_next_poll(self, category_ids, now):
+            return 45.0
+
+    def fake_fetch_updates(categories=None):
+        fetched.append(categories)
+        return {619: 3}
+
+    def fake_sleep(seconds: float):
+        sleeps.append(seconds)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli_main, "PollScheduler", FakeScheduler)
+    monkeypatch.setattr(
+        cli_main.CategoryRepository,
+        "get_enabled_categories",
+        staticmethod(lambda: [619, 1249]),
+    )
+    monkeypatch.setattr(cli_main, "fetch_updates", fake_fetch_updates)
+    monkeypatch.setattr(cli_main, "cleanup_expired_items", lambda retention_days: 0)
+    monkeypatch.setattr(cli_main, "sleep", fake_sleep)
+    monkeypatch.setattr(cli_main, "print_with_timestamp", lambda message: None)
+
+    cli_main.run_loop(
+        adaptive_schedule=True,
+        min_poll_interval_seconds=60,
+        max_poll_interval_seconds=900,
+    )
+
+    assert fetched == [[619]]
+    assert recorded == [(619, 3)]
+    assert sleeps == [45.0]
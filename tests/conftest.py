@@ -3,10 +3,30 @@ from pathlib import Path
 import pytest
 
 from ebay_watchlist.db.config import database
+from ebay_watchlist.db.utils import (
+    create_item_dimension_triggers,
+    create_item_effective_price_column,
+    create_item_generation_triggers,
+    create_item_listing_indexes,
+    create_item_rollup_triggers,
+    create_item_search_triggers,
+    create_item_state_triggers,
+)
 from ebay_watchlist.db.models import (
+    Category,
+    CategorySchedule,
+    CategoryTreeNode,
+    CategoryTreeNodeIndex,
+    CategoryTreeSync,
     Item,
     ItemNote,
+    ItemRollup,
     ItemState,
+    ItemTitleIndex,
+    ItemTitleWordIndex,
+    OAuthToken,
+    Seller,
+    TableGeneration,
     WatchedCategory,
     WatchedSeller,
 )
@@ -18,11 +38,54 @@ def temp_db(tmp_path: Path):
     database.init(str(db_path))
     database.connect(reuse_if_open=True)
     database.create_tables(
-        [Item, ItemState, ItemNote, WatchedSeller, WatchedCategory], safe=True
+        [
+            Seller,
+            Category,
+            Item,
+            ItemTitleIndex,
+            ItemTitleWordIndex,
+            ItemState,
+            ItemNote,
+            TableGeneration,
+            ItemRollup,
+            WatchedSeller,
+            WatchedCategory,
+            OAuthToken,
+            CategorySchedule,
+            CategoryTreeSync,
+            CategoryTreeNode,
+            CategoryTreeNodeIndex,
+        ],
+        safe=True,
     )
+    create_item_search_triggers()
+    create_item_state_triggers()
+    create_item_generation_triggers()
+    create_item_rollup_triggers()
+    create_item_dimension_triggers()
+    create_item_effective_price_column()
+    create_item_listing_indexes()
     yield database
     if not database.is_closed():
         database.drop_tables(
-            [ItemNote, ItemState, Item, WatchedSeller, WatchedCategory], safe=True
+            [
+                ItemTitleIndex,
+                ItemTitleWordIndex,
+                ItemNote,
+                ItemState,
+                ItemRollup,
+                TableGeneration,
+                Item,
+                Seller,
+                Category,
+                WatchedSeller,
+                WatchedCategory,
+                OAuthToken,
+                CategorySchedule,
+                CategoryTreeSync,
+                CategoryTreeNodeIndex,
+                CategoryTreeNode,
+            ],
+            safe=True,
         )
         database.close()
@@ -0,0 +1,129 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.models import Category, Item, ItemRollup, Seller
+from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.db.utils import ensure_schema_compatibility, rebuild_item_rollups
+
+REFERENCE_TIME = datetime(2025, 3, 10, 14, 37, 21)
+
+
+def insert_item(item_id: str, seller_name: str, created_at: datetime, ends_at: datetime):
+    Item.create(
+        item_id=item_id,
+        title="Synth",
+        scraped_category_id=619,
+        category_id=619,
+        category=Category.get_or_create(name=f"Category {seller_name[-1]}")[0],
+        seller=Seller.get_or_create(name=seller_name)[0],
+        web_url=f"https://www.ebay.com/itm/{item_id}",
+        origin_date=created_at,
+        creation_date=created_at,
+        end_date=ends_at,
+    )
+
+
+def rollups() -> set[tuple[str, str, int]]:
+    return {
+        (row.dimension, row.bucket, row.item_count) for row in ItemRollup.select()
+    }
+
+
+def dimension_counts() -> dict[str, int]:
+    return {
+        str(row.name): row.item_count
+        for model in (Seller, Category)
+        for row in model.select()
+    }
+
+
+def test_rollups_follow_item_writes(temp_db):
+    insert_item("1", "alice", REFERENCE_TIME, REFERENCE_TIME + timedelta(hours=1))
+    insert_item("2", "alice", REFERENCE_TIME, REFERENCE_TIME + timedelta(hours=1))
+    category_e = Category.get(Category.name == "Category e").id
+    assert rollups() == {
+        ("created_hour", "2025-03-10 14:00:00", 2),
+        ("ending_hour", "2025-03-10 15:00:00", 2),
+        ("scraped_category", f"619:{category_e}", 2),
+    }
+    assert dimension_counts() == {"alice": 2, "Category e": 2}
+
+    bob = Seller.create(name="bob")
+    category_b = Category.create(name="Category b")
+    Item.update(
+        seller=bob, category=category_b, end_date=REFERENCE_TIME + timedelta(days=1)
+    ).where(Item.item_id == "2").execute()
+    # Unchanged bucket: nothing to move.
+    Item.update(creation_date=REFERENCE_TIME.replace(minute=1)).execute()
+    Item.delete().where(Item.item_id == "1").execute()
+
+    assert rollups() == {
+        ("created_hour", "2025-03-10 14:00:00", 1),
+        ("ending_hour", "2025-03-11 14:00:00", 1),
+        ("scraped_category", f"619:{category_b.id}", 1),
+    }
+    assert dimension_counts() == {
+        "alice": 0,
+        "bob": 1,
+        "Category e": 0,
+        "Category b": 1,
+    }
+    before_rebuild = rollups(), dimension_counts()
+    assert rebuild_item_rollups() == 3
+    assert (rollups(), dimension_counts()) == before_rebuild
+
+
+def test_analytics_snapshot_matches_item_counts(temp_db):
+    rng = random.Random(7)
+    for index in range(300):
+        created_at = REFERENCE_TIME - timedelta(minutes=rng.randint(0, 60 * 24 * 10))
+        ends_at = REFERENCE_TIME + timedelta(minutes=rng.randint(-60 * 24, 60 * 24 * 3))
+        insert_item(str(index), f"seller{index % 7}", created_at, ends_at)
+    Item.delete().where(Item.item_id.in_(["3", "30", "300"])).execute()
+
+    for now in (REFERENCE_TIME, REFERENCE_TIME.replace(minute=0, second=0)):
+        snapshot = ItemRepository.get_analytics_snapshot(now=now, top_limit=3)
+        items = list(Item.select())
+
+        assert snapshot["total_items"] == len(items)
+        assert snapshot["active_items"] == sum(item.end_date >= now for item in items)
+        assert snapshot["ending_soon_items"] == sum(
+            now <= item.end_date < now + timedelta(days=1) for item in items
+        )
+        assert snapshot["new_last_7_days"] == sum(
+            item.creation_date >= now - timedelta(days=7) for item in items
+        )
+        seller_counts = Counter(item.seller_name for item in items)
+        assert snapshot["top_sellers"] == sorted(
+            seller_counts.items(), key=lambda row: (-row[1], row[0])
+        )[:3]
+        hour_counts = dict(snapshot["posted_by_hour"])
+        for hour in range(24):
+            assert hour_counts[f"{hour:02d}:00"] == sum(
+                item.creation_date.hour == hour for item in items
+            )
+
+
+def test_schema_compatibility_backfills_rollups(temp_db):
+    insert_item("1", "alice", REFERENCE_TIME, REFERENCE_TIME + timedelta(hours=1))
+    database.execute_sql("DROP TRIGGER item_rollup_ai")
+    database.drop_tables([ItemRollup])
+
+    ensure_schema_compatibility()
+    insert_item("2", "bob", REFERENCE_TIME, REFERENCE_TIME + timedelta(hours=1))
+
+    snapshot = ItemRepository.get_analytics_snapshot(now=REFERENCE_TIME)
+    assert snapshot["total_items"] == 2
+    assert snapshot["top_sellers"] == [("alice", 1), ("bob", 1)]
+
+
+def test_schema_compatibility_backfills_new_rollup_dimensions(temp_db):
+    insert_item("1", "alice", REFERENCE_TIME, REFERENCE_TIME + timedelta(hours=1))
+    ItemRollup.delete().where(ItemRollup.dimension == "scraped_category").execute()
+
+    ensure_schema_compatibility()
+
+    category_e = Category.get(Category.name == "Category e").id
+    assert ("scraped_category", f"619:{category_e}", 1) in rollups()
@@ -0,0 +1,245 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.models import Category, Item, ItemState, Seller
+from ebay_watchlist.db.repositories import (
+    SEARCH_MODE_SUBSTRING,
+    SEARCH_MODE_WORDS,
+    ItemRepository,
+)
+from ebay_watchlist.ebay.dtos import EbayItem
+from ebay_watchlist.web.api_v1 import SUPPORTED_SORTS
+
+REFERENCE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def ebay_item(item_id: str, price: str) -> EbayItem:
+    return EbayItem(
+        item_id=item_id,
+        title="Vintage Synth",
+        main_category=619,
+        categories=[{"categoryId": "619", "categoryName": "Synthesizers"}],
+        image="https://img.example/synth.jpg",
+        seller={"username": "seller1", "feedbackPercentage": 99.2, "feedbackScore": 1},
+        condition="Used",
+        shipping_options=[],
+        buying_options=["AUCTION"],
+        price={"value": price, "currency": "GBP"},
+        current_bid_price=None,
+        bid_count=0,
+        web_url=f"https://www.ebay.com/itm/{item_id}",
+        origin_date="2025-01-01T00:00:00Z",
+        creation_date="2025-01-01T00:00:00Z",
+        end_date="2025-01-02T00:00:00Z",
+    )
+
+
+def query_plan(query) -> list[str]:
+    sql, params = query.sql()
+    return [
+        str(row[3]) for row in database.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params)
+    ]
+
+
+def flags(item_id: str) -> tuple[bool, bool]:
+    item = Item.get_by_id(item_id)
+    return item.hidden, item.favorite
+
+
+def test_item_flags_follow_item_state_writes(temp_db):
+    ItemRepository.upsert_items_from_ebay_item_dtos(
+        [ebay_item("1", "10.00"), ebay_item("2", "10.00")], scraped_category_id=619
+    )
+
+    ItemRepository.update_item_state("1", hidden=True)
+    ItemRepository.update_item_state("2", favorite=True)
+    assert flags("1") == (True, False)
+    assert flags("2") == (False, True)
+
+    # Re-ingesting a changed listing keeps the flags.
+    ItemRepository.upsert_items_from_ebay_item_dtos(
+        [ebay_item("1", "12.00")], scraped_category_id=619
+    )
+    assert flags("1") == (True, False)
+
+    ItemRepository.update_item_state("1", hidden=False, favorite=True)
+    ItemState.delete().where(ItemState.item_id == "2").execute()
+    assert flags("1") == (False, True)
+    assert flags("2") == (False, False)
+
+    # An item deleted and scraped again picks its surviving state back up.
+    Item.delete().where(Item.item_id == "1").execute()
+    ItemRepository.upsert_items_from_ebay_item_dtos(
+        [ebay_item("1", "12.00")], scraped_category_id=619
+    )
+    assert flags("1") == (False, True)
+
+    visible = ItemRepository.get_filtered_items(
+        include_ended=True, include_favorites_only=True, reference_time=REFERENCE_TIME
+    )
+    assert [item.item_id for item in visible] == ["1"]
+
+
+def test_listing_queries_read_every_sort_off_an_index(temp_db):
+    for sort in sorted(SUPPORTED_SORTS):
+        for filters in (
+            {},
+            {"include_hidden": True},
+            {"include_favorites_only": True},
+            {"include_ended": True},
+        ):
+            query = ItemRepository.get_filtered_items(
+                sort=sort, reference_time=REFERENCE_TIME, limit=100, **filters
+            )
+            plan = " | ".join(query_plan(query))
+
+            assert "idx_item_listing_" in plan, (sort, filters, plan)
+            assert "TEMP B-TREE" not in plan, (sort, filters, plan)
+
+
+def test_seller_listings_seek_into_the_seller_sort_indexes(temp_db):
+    for name in ("alice", "bob"):
+        Seller.create(name=name)
+
+    for sort in sorted(SUPPORTED_SORTS):
+        for filters in (
+            {},
+            {"include_hidden": True},
+            {"include_favorites_only": True},
+            {"include_ended": True},
+        ):
+            query = ItemRepository.get_filtered_items(
+                seller_names=["alice"],
+                sort=sort,
+                reference_time=REFERENCE_TIME,
+                limit=100,
+                **filters,
+            )
+            plan = " | ".join(query_plan(query))
+
+            assert "idx_item_seller_listing_" in plan, (sort, filters, plan)
+            assert "(seller_key=?" in plan, (sort, filters, plan)
+            assert "TEMP B-TREE" not in plan, (sort, filters, plan)
+
+        # Several sellers are read one seek each, then only their rows sorted.
+        query = ItemRepository.get_filtered_items(
+            seller_names=["alice", "bob"], sort=sort, reference_time=REFERENCE_TIME
+        )
+        plan = query_plan(query)
+        assert "idx_item_seller_listing_" in plan[0], (sort, plan)
+        assert "(seller_key=?" in plan[0], (sort, plan)
+
+
+def test_category_listings_seek_into_the_category_sort_indexes(temp_db):
+    # Populated, so the plain scraped_category_id index is a real alternative.
+    for index in range(40):
+        Item.create(
+            item_id=str(index),
+            title="Synth",
+            scraped_category_id=619 + index % 2,
+            category_id=619,
+            category=Category.get_or_create(name=f"Synths {index % 2}")[0],
+            seller=Seller.get_or_create(name="alice")[0],
+            web_url=f"https://www.ebay.com/itm/{index}",
+            origin_date=REFERENCE_TIME,
+            creation_date=REFERENCE_TIME - timedelta(minutes=index),
+            end_date=REFERENCE_TIME + timedelta(days=index % 3 - 1),
+        )
+
+    for name, category_filter, key in (
+        ("category", {"category_names": ["Synths 0"]}, "category_key"),
+        ("scraped_category", {"scraped_category_ids": [619]}, "scraped_category_id"),
+    ):
+        for sort in sorted(SUPPORTED_SORTS):
+            for filters in (
+                {},
+                {"include_hidden": True},
+                {"include_favorites_only": True},
+                {"include_ended": True},
+            ):
+                query = ItemRepository.get_filtered_items(
+                    sort=sort,
+                    reference_time=REFERENCE_TIME,
+                    limit=100,
+                    **category_filter,
+                    **filters,
+                )
+                plan = " | ".join(query_plan(query))
+
+                assert f"idx_item_{name}_listing_" in plan, (sort, filters, plan)
+                assert f"({key}=?" in plan, (sort, filters, plan)
+                assert "TEMP B-TREE" not in plan, (sort, filters, plan)
+
+
+def test_title_searches_only_sort_the_matching_rows(temp_db):
+    for sort in sorted(SUPPORTED_SORTS):
+        for search_mode in (SEARCH_MODE_SUBSTRING, SEARCH_MODE_WORDS):
+            query = ItemRepository.get_filtered_items(
+                search_query="juno",
+                search_mode=search_mode,
+                sort=sort,
+                reference_time=REFERENCE_TIME,
+            )
+            plan = query_plan(query)
+
+            # Items are looked up from the FTS5 matches, never scanned.
+            scans = [step for step in plan if step.startswith("SCAN")]
+            assert scans and all("VIRTUAL TABLE" in step for step in scans), (
+                sort,
+                search_mode,
+                plan,
+            )
+
+
+def test_cursor_pages_seek_into_the_sort_index(temp_db):
+    keysets = {
+        "newest": [REFERENCE_TIME, "1"],
+        "ending_soon_active": [REFERENCE_TIME + timedelta(days=1), "1"],
+        "bids_desc": [3, REFERENCE_TIME, "1"],
+        "price_low": [10.0, REFERENCE_TIME, "1"],
+    }
+    for sort, keyset in keysets.items():
+        query = ItemRepository.get_filtered_items(
+            sort=sort, reference_time=REFERENCE_TIME, keyset=keyset
+        )
+        plan = " | ".join(query_plan(query))
+
+        assert plan.startswith("SEARCH"), (sort, plan)
+        assert "TEMP B-TREE" not in plan, (sort, plan)
+
+
+def test_effective_price_is_the_current_bid_or_price_in_minor_units(temp_db):
+    for item_id, price, current_bid_price in [
+        ("1", Decimal("10.50"), None),
+        ("2", Decimal("10.50"), Decimal("12.99")),
+        ("3", None, None),
+        ("4", Decimal("0.1"), None),
+    ]:
+        Item.create(
+            item_id=item_id,
+            title="Synth",
+            scraped_category_id=619,
+            category_id=619,
+            category=Category.get_or_create(name="Synthesizers")[0],
+            seller=Seller.get_or_create(name="alice")[0],
+            web_url=f"https://www.ebay.com/itm/{item_id}",
+            origin_date=REFERENCE_TIME,
+            creation_date=REFERENCE_TIME,
+            end_date=REFERENCE_TIME + timedelta(days=1),
+            price=price,
+            current_bid_price=current_bid_price,
+        )
+    Item.update(current_bid_price=Decimal("11")).where(Item.item_id == "1").execute()
+
+    rows = database.execute_sql(
+        "SELECT item_id, effective_price FROM item ORDER BY item_id"
+    ).fetchall()
+    assert rows == [("1", 1100), ("2", 1299), ("3", None), ("4", 10)]
+
+    def sorted_ids(sort: str) -> list[str]:
+        items = ItemRepository.get_filtered_items(sort=sort, reference_time=REFERENCE_TIME)
+        return [item.item_id for item in items]
+
+    assert sorted_ids("price_low") == ["3", "4", "1", "2"]
+    assert sorted_ids("price_high") == ["2", "1", "4", "3"]
@@ -1,4 +1,8 @@
-from ebay_watchlist.db.repositories import ItemRepository
+from datetime import datetime
+from decimal import Decimal
+
+from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.repositories import CategoryTreeRepository, ItemRepository
 from ebay_watchlist.ebay.dtos import EbayItem
 
 
@@ -59,3 +63,222 @@ def test_create_or_update_falls_back_when_main_category_missing(temp_db):
 
     assert db_item.category_id == 777
     assert db_item.category_name == "Keyboards"
+
+
+def test_upsert_items_reports_inserted_and_updated_ids(temp_db):
+    existing = make_item(
+        item_id="item-1",
+        main_category=777,
+        categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+    )
+    ItemRepository.upsert_items_from_ebay_item_dtos([existing], scraped_category_id=619)
+    first_seen = Item.get_by_id("item-1").db_creation_date
+
+    updated = existing.model_copy(update={"title": "Vintage Synth (boxed)"})
+    new_item = make_item(
+        item_id="item-2",
+        main_category=777,
+        categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+    )
+
+    inserted_ids, updated_ids, _ = ItemRepository.upsert_items_from_ebay_item_dtos(
+        [updated, new_item], scraped_category_id=619
+    )
+
+    assert inserted_ids == ["item-2"]
+    assert updated_ids == ["item-1"]
+    db_item = Item.get_by_id("item-1")
+    assert db_item.title == "Vintage Synth (boxed)"
+    assert db_item.db_creation_date == first_seen
+    assert db_item.shipping_options == []
+    assert db_item.buying_options == ["AUCTION"]
+
+
+def test_upsert_items_keeps_stored_prices_when_payload_omits_them(temp_db):
+    item = make_item(
+        item_id="item-1",
+        main_category=777,
+        categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+    )
+    ItemRepository.upsert_items_from_ebay_item_dtos([item], scraped_category_id=619)
+
+    without_prices = item.model_copy(update={"price": None, "current_bid_price": None})
+    ItemRepository.upsert_items_from_ebay_item_dtos(
+        [without_prices], scraped_category_id=619
+    )
+
+    db_item = Item.get_by_id("item-1")
+    assert db_item.price == Decimal("10.00")
+    assert db_item.price_currency == "GBP"
+    assert db_item.current_bid_price == Decimal("10.00")
+
+
+def test_upsert_items_chunks_large_batches(temp_db):
+    items = [
+        make_item(
+            item_id=f"item-{idx}",
+            main_category=777,
+            categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+        )
+        for idx in range(250)
+    ]
+
+    inserted_ids, updated_ids, _ = ItemRepository.upsert_items_from_ebay_item_dtos(
+        items, scraped_category_id=619
+    )
+
+    assert len(inserted_ids) == 250
+    assert updated_ids == []
+    assert Item.select().count() == 250
+
+
+def test_upsert_items_skips_unchanged_items(temp_db):
+    item = make_item(
+        item_id="item-1",
+        main_category=777,
+        categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+    )
+    ItemRepository.upsert_items_from_ebay_item_dtos([item], scraped_category_id=619)
+    Item.update(db_update_date=datetime(2020, 1, 1)).execute()
+
+    inserted_ids, updated_ids, skipped_ids = (
+        ItemRepository.upsert_items_from_ebay_item_dtos([item], scraped_category_id=619)
+    )
+
+    assert inserted_ids == []
+    assert updated_ids == []
+    assert skipped_ids == ["item-1"]
+    assert Item.get_by_id("item-1").db_update_date == datetime(2020, 1, 1)
+
+
+def test_upsert_items_writes_items_whose_content_changed(temp_db):
+    item = make_item(
+        item_id="item-1",
+        main_category=777,
+        categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+    )
+    ItemRepository.upsert_items_from_ebay_item_dtos([item], scraped_category_id=619)
+    first_fingerprint = Item.get_by_id("item-1").content_fingerprint
+
+    outbid = item.model_copy(
+        update={
+            "current_bid_price": item.current_bid_price.model_copy(
+                update={"value": Decimal("12.50")}
+            )
+        }
+    )
+    inserted_ids, updated_ids, skipped_ids = (
+        ItemRepository.upsert_items_from_ebay_item_dtos([outbid], scraped_category_id=619)
+    )
+
+    assert inserted_ids == []
+    assert updated_ids == ["item-1"]
+    assert skipped_ids == []
+    db_item = Item.get_by_id("item-1")
+    assert db_item.current_bid_price == Decimal("12.50")
+    assert db_item.content_fingerprint != first_fingerprint
+
+
+def test_refreshed_items_match_the_fingerprint_of_the_next_poll(temp_db):
+    item = make_item(
+        item_id="item-1",
+        main_category=777,
+        categories=[{"categoryName": "Keyboards", "categoryId": 777}],
+    )
+    ItemRepository.upsert_items_from_ebay_item_dtos([item], scraped_category_id=619)
+    outbid = item.model_copy(
+        update={
+            "current_bid_price": item.current_bid_price.model_copy(
+                update={"value": Decimal("12.50")}
+            )
+        }
+    )
+
+    db_item = Item.get_by_id("item-1")
+    db_item.current_bid_price = "12.50"
+    ItemRepository.save_refreshed_items([db_item])
+
+    # The poll sees what the refresh already stored; prices read back from
+    # the DB as 10 and 12.5 still hash like eBay's "10.00" and "12.50".
+    _, updated_ids, skipped_ids = ItemRepository.upsert_items_from_ebay_item_dtos(
+        [outbid], scraped_category_id=619
+    )
+    assert (updated_ids, skipped_ids) == ([], ["item-1"])
+
+
+def category_row(category_id: int, path: list[str], parent_id: int | None, leaf: bool):
+    return {
+        "category_id": category_id,
+        "name": path[-1],
+        "parent_id": parent_id,
+        "level": len(path),
+        "leaf": leaf,
+        "path": " > ".join(path),
+    }
+
+
+MUSIC = "Musical Instruments & DJ Equipment"
+CATEGORY_TREE = [
+    category_row(619, [MUSIC], None, leaf=False),
+    category_row(3858, [MUSIC, "Guitars & Basses"], 619, leaf=False),
+    category_row(33034, [MUSIC, "Guitars & Basses", "Electric Guitars"], 3858, leaf=True),
+    category_row(180014, [MUSIC, "Synthesisers"], 619, leaf=True),
+]
+
+
+def test_category_tree_search_names_and_ancestors(temp_db):
+    assert CategoryTreeRepository.get_synced_tree() is None
+
+    count = CategoryTreeRepository.replace_tree("EBAY_GB", "3", "1", CATEGORY_TREE)
+
+    assert count == 4
+    synced = CategoryTreeRepository.get_synced_tree("EBAY_GB")
+    assert synced is not None and synced.category_count == 4
+    assert CategoryTreeRepository.get_synced_tree("EBAY_US") is None
+    assert [s["id"] for s in CategoryTreeRepository.search_categories("elec guit")] == [
+        "33034"
+    ]
+    assert {s["id"] for s in CategoryTreeRepository.search_categories("GUITARS")} == {
+        "3858",
+        "33034",
+    }
+    assert CategoryTreeRepository.search_categories('"*') == []
+    assert CategoryTreeRepository.get_category_names([619, 180014, 1]) == {
+        619: MUSIC,
+        180014: "Synthesisers",
+    }
+    assert [int(c.category_id) for c in CategoryTreeRepository.get_ancestors(33034)] == [
+        619,
+        3858,
+        33034,
+    ]
+    assert CategoryTreeRepository.get_ancestors(1) == []
+
+
+def test_category_tree_sync_replaces_previous_tree(temp_db):
+    CategoryTreeRepository.replace_tree("EBAY_GB", "3", "1", CATEGORY_TREE)
+    CategoryTreeRepository.replace_tree("EBAY_US", "0", "2", CATEGORY_TREE[:1])
+
+    assert CategoryTreeRepository.get_synced_tree("EBAY_GB") is None
+    assert CategoryTreeRepository.search_categories("guitars") == []
+    assert CategoryTreeRepository.search_categories("music")[0]["id"] == "619"
+
+
+def test_scraped_category_names_prefer_the_category_tree(temp_db):
+    ItemRepository.create_or_update_item_from_ebay_item_dto(
+        make_item("item-1", 33034, [{"categoryId": "33034", "categoryName": "Electric Guitars"}]),
+        scraped_category_id=619,
+    )
+    ItemRepository.create_or_update_item_from_ebay_item_dto(
+        make_item("item-2", 177, [{"categoryId": "177", "categoryName": "Laptops"}]),
+        scraped_category_id=58058,
+    )
+
+    CategoryTreeRepository.replace_tree("EBAY_GB", "3", "1", CATEGORY_TREE)
+
+    assert ItemRepository.get_scraped_category_suggestions() == [
+        (619, MUSIC),
+        (58058, "Laptops"),
+    ]
+    assert ItemRepository.get_category_name_by_id(3858) == "Guitars & Basses"
+    assert ItemRepository.get_category_name_by_id(177) == "Laptops"
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from ebay_watchlist.db.models import Item, ItemNote, ItemState
+from ebay_watchlist.db.models import Category, Item, ItemNote, ItemState, Seller
 from ebay_watchlist.db.repositories import ItemRepository
 
 
@@ -11,9 +11,9 @@ def insert_item(item_id: str, end_date: datetime) -> None:
         title=f"Item {item_id}",
         scraped_category_id=619,
         category_id=619,
-        category_name="Electric Guitars",
+        category=Category.get_or_create(name="Electric Guitars")[0],
         image_url=None,
-        seller_name="alice",
+        seller=Seller.get_or_create(name="alice")[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -1,8 +1,21 @@
 from datetime import datetime, timedelta
 
 from ebay_watchlist.db.config import database
-from ebay_watchlist.db.models import Item, ItemNote, ItemState
-from ebay_watchlist.db.utils import ensure_schema_compatibility
+from ebay_watchlist.db.models import (
+    Category,
+    Item,
+    ItemNote,
+    ItemState,
+    ItemTitleIndex,
+    ItemTitleWordIndex,
+    Seller,
+)
+from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.db.utils import (
+    ITEM_FILTERED_LISTING_INDEXES,
+    ITEM_LISTING_INDEXES,
+    ensure_schema_compatibility,
+)
 
 
 def test_ensure_schema_compatibility_adds_state_tables_without_data_loss(temp_db):
@@ -12,9 +25,9 @@ def test_ensure_schema_compatibility_adds_state_tables_without_data_loss(temp_db
         title="Legacy Item",
         scraped_category_id=619,
         category_id=619,
-        category_name="Electric Guitars",
+        category=Category.get_or_create(name="Electric Guitars")[0],
         image_url="https://img.example/item.jpg",
-        seller_name="legacy_seller",
+        seller=Seller.get_or_create(name="legacy_seller")[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -42,8 +55,8 @@ def test_ensure_schema_compatibility_adds_state_tables_without_data_loss(temp_db
 
 
 def test_ensure_schema_compatibility_creates_item_filter_indexes(temp_db):
-    database.execute_sql("DROP INDEX IF EXISTS idx_item_seller_name")
-    database.execute_sql("DROP INDEX IF EXISTS idx_item_category_name")
+    database.execute_sql("DROP INDEX IF EXISTS item_seller_key")
+    database.execute_sql("DROP INDEX IF EXISTS item_category_key")
     database.execute_sql("DROP INDEX IF EXISTS idx_item_scraped_category_id")
     database.execute_sql("DROP INDEX IF EXISTS idx_item_creation_date")
 
@@ -53,8 +66,161 @@ def test_ensure_schema_compatibility_creates_item_filter_indexes(temp_db):
         str(row[1]) for row in database.execute_sql("PRAGMA index_list('item')").fetchall()
     }
     assert {
-        "idx_item_seller_name",
-        "idx_item_category_name",
+        "item_seller_key",
+        "item_category_key",
         "idx_item_scraped_category_id",
         "idx_item_creation_date",
     }.issubset(index_names)
+
+
+def test_ensure_schema_compatibility_adds_content_fingerprint_column(temp_db):
+    database.execute_sql("ALTER TABLE item DROP COLUMN content_fingerprint")
+
+    ensure_schema_compatibility()
+
+    columns = {column.name for column in database.get_columns("item")}
+    assert "content_fingerprint" in columns
+
+
+def test_ensure_schema_compatibility_backfills_item_state_flags(temp_db):
+    now = datetime(2026, 2, 11, 10, 0, 0)
+    for item_id in ("1", "2"):
+        Item.create(
+            item_id=item_id,
+            title="Legacy Item",
+            scraped_category_id=619,
+            category_id=619,
+            category=Category.get_or_create(name="Electric Guitars")[0],
+            seller=Seller.get_or_create(name="legacy_seller")[0],
+            web_url=f"https://www.ebay.com/itm/{item_id}",
+            origin_date=now,
+            creation_date=now,
+            end_date=now + timedelta(days=2),
+        )
+    ItemState.create(item_id="1", hidden=True)
+    ItemState.create(item_id="2", favorite=True)
+    for name in ITEM_LISTING_INDEXES | ITEM_FILTERED_LISTING_INDEXES:
+        database.execute_sql(f"DROP INDEX {name}")
+    for trigger in (
+        "itemstate_ai",
+        "itemstate_au",
+        "itemstate_ad",
+        "item_state_ai",
+        "item_generation_au",
+    ):
+        database.execute_sql(f"DROP TRIGGER {trigger}")
+    database.execute_sql("ALTER TABLE item DROP COLUMN hidden")
+    database.execute_sql("ALTER TABLE item DROP COLUMN favorite")
+
+    ensure_schema_compatibility()
+    ItemState.update(hidden=True).where(ItemState.item_id == "2").execute()
+
+    flags = {item.item_id: (item.hidden, item.favorite) for item in Item.select()}
+    assert flags == {"1": (True, False), "2": (True, True)}
+    index_names = {
+        str(row[1]) for row in database.execute_sql("PRAGMA index_list('item')").fetchall()
+    }
+    assert set(ITEM_LISTING_INDEXES | ITEM_FILTERED_LISTING_INDEXES).issubset(index_names)
+
+
+def test_ensure_schema_compatibility_adds_effective_price_column(temp_db):
+    now = datetime(2026, 2, 11, 10, 0, 0)
+    Item.create(
+        item_id="legacy-1",
+        title="Legacy Item",
+        scraped_category_id=619,
+        category_id=619,
+        category=Category.get_or_create(name="Electric Guitars")[0],
+        seller=Seller.get_or_create(name="legacy_seller")[0],
+        price=50,
+        current_bid_price=51.5,
+        web_url="https://www.ebay.com/itm/legacy-1",
+        origin_date=now,
+        creation_date=now,
+        end_date=now + timedelta(days=2),
+    )
+    for name in (
+        "idx_item_listing_price_low",
+        "idx_item_listing_price_high",
+        "idx_item_seller_listing_price_low",
+        "idx_item_seller_listing_price_high",
+        "idx_item_category_listing_price_low",
+        "idx_item_category_listing_price_high",
+        "idx_item_scraped_category_listing_price_low",
+        "idx_item_scraped_category_listing_price_high",
+    ):
+        database.execute_sql(f"DROP INDEX {name}")
+    database.execute_sql("ALTER TABLE item DROP COLUMN effective_price")
+    database.execute_sql(
+        "CREATE INDEX idx_item_listing_price_low "
+        "ON item (COALESCE(current_bid_price, price), creation_date DESC, item_id DESC)"
+    )
+
+    ensure_schema_compatibility()
+
+    assert database.execute_sql("SELECT effective_price FROM item").fetchone() == (5150,)
+    index_sql = database.execute_sql(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_item_listing_price_low'"
+    ).fetchone()[0]
+    assert "effective_price" in index_sql
+    index_sql = database.execute_sql(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_item_seller_listing_price_low'"
+    ).fetchone()[0]
+    assert "seller_key, effective_price" in index_sql
+
+
+def test_ensure_schema_compatibility_moves_names_into_dimension_tables(temp_db):
+    database.drop_tables([ItemNote, ItemState, ItemTitleIndex, ItemTitleWordIndex, Item])
+    database.execute_sql(
+        "CREATE TABLE item ("
+        "item_id VARCHAR(255) NOT NULL PRIMARY KEY, title TEXT NOT NULL, "
+        "scraped_category_id INTEGER NOT NULL, category_id INTEGER NOT NULL, "
+        "category_name VARCHAR(512) NOT NULL, image_url TEXT, "
+        "seller_name VARCHAR(255) NOT NULL, condition TEXT, shipping_options JSON, "
+        "buying_options JSON, price DECIMAL(10, 5), price_currency VARCHAR(16), "
+        "current_bid_price DECIMAL(10, 5), current_bid_price_currency VARCHAR(16), "
+        "bid_count INTEGER NOT NULL, web_url TEXT NOT NULL, "
+        "origin_date DATETIME NOT NULL, creation_date DATETIME NOT NULL, "
+        "end_date DATETIME NOT NULL, db_creation_date DATETIME NOT NULL, "
+        "db_update_date DATETIME NOT NULL)"
+    )
+    database.execute_sql("CREATE INDEX idx_item_seller_name ON item (seller_name)")
+    for item_id, seller_name, category_name in [
+        ("1", "alice", "Synthesisers"),
+        ("2", "alice", "Drum Machines"),
+        ("3", "bob", "Synthesisers"),
+    ]:
+        database.execute_sql(
+            "INSERT INTO item VALUES "
+            "(?, 'Legacy Item', 619, 619, ?, NULL, ?, NULL, NULL, NULL, 10, 'GBP', "
+            "NULL, NULL, 0, 'https://www.ebay.com/itm/1', "
+            "'2026-02-11 10:00:00', '2026-02-11 10:00:00', '2026-02-13 10:00:00', "
+            "'2026-02-11 10:00:00', '2026-02-11 10:00:00')",
+            (item_id, category_name, seller_name),
+        )
+
+    ensure_schema_compatibility()
+    Item.update(seller=Seller.get(Seller.name == "bob")).where(
+        Item.item_id == "2"
+    ).execute()
+
+    columns = {column.name for column in database.get_columns("item")}
+    assert {"seller_name", "category_name"}.isdisjoint(columns)
+    assert {"seller_key", "category_key"}.issubset(columns)
+    names = {
+        item.item_id: (item.seller_name, item.category_name)
+        for item in ItemRepository.get_latest_items()
+    }
+    assert names == {
+        "1": ("alice", "Synthesisers"),
+        "2": ("bob", "Drum Machines"),
+        "3": ("bob", "Synthesisers"),
+    }
+    snapshot = ItemRepository.get_analytics_snapshot(now=datetime(2026, 2, 12))
+    assert snapshot["top_sellers"] == [("bob", 2), ("alice", 1)]
+    assert snapshot["top_categories"] == [("Synthesisers", 2), ("Drum Machines", 1)]
+    assert ItemRepository.get_scraped_category_suggestions() == [(619, "Drum Machines")]
+    filtered = ItemRepository.get_filtered_items(
+        seller_names=["bob"], category_names=["Synthesisers"], include_ended=True
+    )
+    assert [item.item_id for item in filtered] == ["3"]
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from ebay_watchlist.db.models import Category, Item, Seller
+from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.db.suggestions import SuggestionIndex
+
+REFERENCE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def insert_item(item_id: str, seller_name: str, category_name: str, scraped_category_id: int):
+    Item.create(
+        item_id=item_id,
+        title="Synth",
+        scraped_category_id=scraped_category_id,
+        category_id=scraped_category_id,
+        category=Category.get_or_create(name=category_name)[0],
+        seller=Seller.get_or_create(name=seller_name)[0],
+        web_url=f"https://www.ebay.com/itm/{item_id}",
+        origin_date=REFERENCE_TIME,
+        creation_date=REFERENCE_TIME,
+        end_date=REFERENCE_TIME + timedelta(days=1),
+    )
+
+
+def test_suggestion_index_matches_prefixes_before_infixes():
+    index = SuggestionIndex(
+        {
+            "music_shop": {None: 1},
+            "Musicmagpie": {None: 9},
+            "best_music": {None: 4},
+            "amusic": {None: 2},
+            "abc_bcd_cde": {None: 3},
+        }
+    )
+
+    assert index.search("MUSIC") == ["music_shop", "Musicmagpie", "amusic", "best_music"]
+    assert index.search("us", limit=3) == ["amusic", "best_music", "music_shop"]
+    assert index.search("music_s") == ["music_shop"]
+    # All of the query's trigrams occur, but not next to each other.
+    assert index.search("abcde") == []
+    assert index.search("  ") == []
+    assert index.search("music", rank_by_count=True) == [
+        "Musicmagpie",
+        "best_music",
+        "amusic",
+        "music_shop",
+    ]
+
+
+def test_suggestion_index_scopes_names_and_counts():
+    index = SuggestionIndex(
+        {
+            "Electric Guitars": {619: 5},
+            "Laptops": {58058: 8},
+            "Guitar Amps": {619: 2, 58058: 9},
+        }
+    )
+
+    assert index.search("a", scopes=[619]) == ["Electric Guitars", "Guitar Amps"]
+    assert index.search("a", scopes=[619], rank_by_count=True) == [
+        "Electric Guitars",
+        "Guitar Amps",
+    ]
+    assert index.search("a", rank_by_count=True) == [
+        "Guitar Amps",
+        "Laptops",
+        "Electric Guitars",
+    ]
+
+
+def test_suggestion_indexes_follow_item_writes(temp_db):
+    insert_item("1", "alice", "Synthesisers", 619)
+    assert ItemRepository.get_seller_suggestions("ali") == ["alice"]
+
+    insert_item("2", "malice", "Laptops", 58058)
+    insert_item("3", "malice", "Synthesisers", 58058)
+    assert ItemRepository.get_seller_suggestions("ali") == ["alice", "malice"]
+    assert ItemRepository.get_seller_suggestions("ali", rank_by_count=True) == [
+        "malice",
+        "alice",
+    ]
+    assert ItemRepository.get_category_suggestions("s", scraped_category_ids=[58058]) == [
+        "Synthesisers",
+        "Laptops",
+    ]
+
+    Item.delete().where(Item.item_id == "1").execute()
+    assert ItemRepository.get_seller_suggestions("ali") == ["malice"]
+    assert ItemRepository.get_category_suggestions("synth", scraped_category_ids=[619]) == []
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.models import (
+    Category,
+    Item,
+    ItemTitleIndex,
+    ItemTitleWordIndex,
+    Seller,
+)
+from ebay_watchlist.db.repositories import SEARCH_MODE_WORDS, ItemRepository
+from ebay_watchlist.db.utils import ensure_schema_compatibility, vacuum_database
+
+REFERENCE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def insert_item(item_id: str, title: str, minutes_old: int = 0):
+    created_at = REFERENCE_TIME - timedelta(minutes=minutes_old)
+    Item.create(
+        item_id=item_id,
+        title=title,
+        scraped_category_id=619,
+        category_id=619,
+        category=Category.get_or_create(name="Synthesisers")[0],
+        seller=Seller.get_or_create(name="alice")[0],
+        web_url=f"https://www.ebay.com/itm/{item_id}",
+        origin_date=created_at,
+        creation_date=created_at,
+        end_date=REFERENCE_TIME + timedelta(days=1),
+    )
+
+
+def search(query: str, **kwargs) -> list[str]:
+    items = ItemRepository.get_filtered_items(
+        search_query=query, reference_time=REFERENCE_TIME, **kwargs
+    )
+    return [str(item.item_id) for item in items]
+
+
+def test_substring_search_keeps_like_semantics(temp_db):
+    insert_item("1", "Roland Juno-106 analog synthesizer", minutes_old=1)
+    insert_item("2", "KORG MS-20 Mini", minutes_old=2)
+    insert_item("3", 'Fender 12" speaker cabinet', minutes_old=3)
+
+    assert search("juno") == ["1"]
+    assert search("thesiz") == ["1"]
+    assert search("o-1") == ["1"]
+    assert search("ms-20 mini") == ["2"]
+    assert search('12" speaker') == ["3"]
+    # Shorter than a trigram: plain LIKE.
+    assert search("KO") == ["2"]
+    assert search("er") == ["1", "3"]
+    assert ItemRepository.count_filtered_items(
+        search_query="analog", reference_time=REFERENCE_TIME
+    ) == 1
+
+
+def test_title_indexes_follow_updates_and_deletes(temp_db):
+    insert_item("1", "Moog Subsequent 37")
+    insert_item("2", "Arturia MiniBrute")
+
+    Item.update(title="Moog Grandmother").where(Item.item_id == "1").execute()
+    Item.delete().where(Item.item_id == "2").execute()
+
+    assert search("subsequent") == []
+    assert search("grandmother") == ["1"]
+    assert search("minibrute") == []
+    assert search("grand", search_mode=SEARCH_MODE_WORDS) == ["1"]
+    assert ItemTitleIndex.select().count() == 1
+
+
+def test_word_search_matches_prefixes_and_ranks_by_relevance(temp_db):
+    insert_item("1", "Yamaha DX7 synth with case and synth manual", minutes_old=1)
+    insert_item("2", "Yamaha keyboard stand", minutes_old=2)
+    insert_item("3", "Yamaha DX7 synth", minutes_old=3)
+
+    assert search("yam dx", search_mode=SEARCH_MODE_WORDS) == ["1", "3"]
+    assert search("stand yamaha", search_mode=SEARCH_MODE_WORDS) == ["2"]
+    # Word mode doesn't match inside words.
+    assert search("amaha", search_mode=SEARCH_MODE_WORDS) == []
+    assert search("synth", search_mode=SEARCH_MODE_WORDS, sort="relevance") == ["3", "1"]
+    assert search("synth", search_mode=SEARCH_MODE_WORDS, sort="newest") == ["1", "3"]
+    # Nothing to tokenize: substring search instead.
+    assert search("--", search_mode=SEARCH_MODE_WORDS) == []
+
+
+def test_schema_compatibility_indexes_existing_items(temp_db):
+    insert_item("1", "Sequential Prophet 5")
+    database.drop_tables([ItemTitleIndex, ItemTitleWordIndex])
+    database.execute_sql("DROP TRIGGER IF EXISTS itemtitleindex_ai")
+
+    ensure_schema_compatibility()
+    insert_item("2", "Sequential Take 5")
+
+    assert search("prophet") == ["1"]
+    assert sorted(search("sequential", search_mode=SEARCH_MODE_WORDS)) == ["1", "2"]
+
+
+def test_vacuum_rekeys_the_title_indexes_on_renumbered_rowids(temp_db):
+    insert_item("1", "Roland Juno-106", minutes_old=1)
+    insert_item("2", "Yamaha DX7", minutes_old=2)
+    # What a VACUUM or dump/restore may do to a table without an INTEGER
+    # PRIMARY KEY: same rows, new rowids, and no trigger on the title.
+    database.execute_sql("UPDATE item SET rowid = rowid + 100")
+    assert search("juno") == []
+
+    vacuum_database()
+
+    assert search("juno") == ["1"]
+    assert search("dx7", search_mode=SEARCH_MODE_WORDS) == ["2"]
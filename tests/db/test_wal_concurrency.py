@@ -0,0 +1,142 @@
+import threading
+from datetime import datetime, timedelta
+from time import perf_counter, sleep
+
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.models import Category, Item, Seller
+from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.db.utils import checkpoint_wal
+
+WRITE_BATCHES = 20
+ITEMS_PER_BATCH = 250
+READER_THREADS = 4
+
+
+def item_rows(batch: int) -> list[dict]:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    seller_keys = ItemRepository.get_dimension_keys(
+        Seller, {f"seller_{index}" for index in range(10)}
+    )
+    category_keys = ItemRepository.get_dimension_keys(Category, {"Electric Guitars"})
+    return [
+        {
+            "item_id": f"{batch}-{index}",
+            "title": f"Stress item {batch}-{index}",
+            "scraped_category_id": 619,
+            "category_id": 33034,
+            "category": category_keys["Electric Guitars"],
+            "seller": seller_keys[f"seller_{index % 10}"],
+            "web_url": f"https://www.ebay.com/itm/{batch}-{index}",
+            "origin_date": now,
+            "creation_date": now,
+            "end_date": now + timedelta(days=1),
+        }
+        for index in range(ITEMS_PER_BATCH)
+    ]
+
+
+def test_connections_use_the_configured_pragmas(temp_db):
+    assert database.pragma("journal_mode") == "wal"
+    assert database.pragma("synchronous") == 1  # NORMAL
+    assert database.pragma("busy_timeout") == 5000
+    assert database.pragma("temp_store") == 2  # MEMORY
+    assert checkpoint_wal("PASSIVE")[0] == 0
+
+
+def test_readers_are_not_blocked_by_bulk_writes(temp_db):
+    writer_done = threading.Event()
+    transaction_open = threading.Event()
+    release_transaction = threading.Event()
+    errors: list[Exception] = []
+    read_seconds: list[float] = []
+    counts_seen_in_open_transaction: list[int] = []
+
+    def writer():
+        database.connect(reuse_if_open=True)
+        try:
+            for batch in range(WRITE_BATCHES):
+                with database.atomic():
+                    Item.insert_many(item_rows(batch)).execute()
+                    if batch == WRITE_BATCHES // 2:
+                        # Keep one write transaction open while readers query.
+                        transaction_open.set()
+                        release_transaction.wait(timeout=5)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            writer_done.set()
+            database.close()
+
+    def reader():
+        database.connect(reuse_if_open=True)
+        try:
+            while not writer_done.is_set():
+                during_open_transaction = transaction_open.is_set()
+                started_at = perf_counter()
+                count = Item.select().count()
+                _ = list(
+                    Item.select(Item.item_id)
+                    .where(Item.seller_name == "seller_3")
+                    .order_by(Item.creation_date.desc())
+                    .limit(50)
+                )
+                read_seconds.append(perf_counter() - started_at)
+                if during_open_transaction and not release_transaction.is_set():
+                    counts_seen_in_open_transaction.append(count)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            database.close()
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader) for _ in range(READER_THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    assert transaction_open.wait(timeout=10)
+    # Readers keep reading the last committed snapshot while the writer holds its lock.
+    deadline = perf_counter() + 5
+    while (
+        len(counts_seen_in_open_transaction) < READER_THREADS * 5
+        and perf_counter() < deadline
+    ):
+        sleep(0.01)
+    release_transaction.set()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert errors == []
+    assert Item.select().count() == WRITE_BATCHES * ITEMS_PER_BATCH
+    committed_before_open = (WRITE_BATCHES // 2) * ITEMS_PER_BATCH
+    assert counts_seen_in_open_transaction
+    assert set(counts_seen_in_open_transaction) == {committed_before_open}
+    # Far below the 5s busy_timeout: no reader ever waited on the writer's lock.
+    assert max(read_seconds) < 1.0
+
+
+def test_writer_commits_while_a_read_transaction_is_open(temp_db):
+    errors: list[Exception] = []
+
+    def writer():
+        database.connect(reuse_if_open=True)
+        try:
+            with database.atomic():
+                Item.insert_many(item_rows(0)).execute()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            database.close()
+
+    with database.atomic():
+        assert Item.select().count() == 0
+        started_at = perf_counter()
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join(timeout=10)
+        commit_seconds = perf_counter() - started_at
+        # This read transaction keeps its snapshot until it ends.
+        assert Item.select().count() == 0
+
+    assert errors == []
+    assert commit_seconds < 1.0
+    assert Item.select().count() == ITEMS_PER_BATCH
@@ -96,6 +96,94 @@ def test_parse_items_handles_missing_leaf_category_ids():
     assert items[0].main_category is None
 
 
+def _summary_payload(item_id: str, **overrides) -> dict:
+    payload = {
+        "itemId": item_id,
+        "title": "Synth",
+        "leafCategoryIds": ["777"],
+        "categories": [
+            {"categoryName": "Music", "categoryId": "619"},
+            {"categoryName": "Keys", "categoryId": 777},
+        ],
+        "image": {"imageUrl": "https://img.example/item.jpg"},
+        "seller": {
+            "username": "seller1",
+            "feedbackPercentage": "99.0",
+            "feedbackScore": 100,
+        },
+        "condition": "Used",
+        "shippingOptions": [{"shippingCost": {"value": "4.99", "currency": "GBP"}}],
+        "buyingOptions": ["AUCTION"],
+        "price": {"value": "10.00", "currency": "GBP"},
+        "currentBidPrice": {"value": "12.50", "currency": "GBP"},
+        "bidCount": 2,
+        "itemWebUrl": "https://www.ebay.com/itm/123?foo=bar#frag",
+        "itemOriginDate": "2025-01-01T00:00:00Z",
+        "itemCreationDate": "2025-01-01T00:00:00.000Z",
+        "itemEndDate": "2025-01-02T00:00:00Z",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_parse_items_fast_matches_model_parser():
+    from ebay_watchlist.ebay.dtos import ItemRecord
+
+    payloads = [
+        _summary_payload("v1"),
+        _summary_payload("v2", leafCategoryIds=[], image="not-a-dict"),
+        _summary_payload("v3", price=None, currentBidPrice=None, bidCount=None),
+        {
+            key: value
+            for key, value in _summary_payload("v4").items()
+            if key not in ("categories", "buyingOptions", "bidCount", "condition")
+        },
+    ]
+
+    fast_records = EbayAPI.parse_items_fast(payloads)
+
+    assert fast_records == [
+        ItemRecord.from_ebay_item(item) for item in EbayAPI.parse_items(payloads)
+    ]
+    assert [record.item_id for record in fast_records] == ["v1", "v2", "v3", "v4"]
+    assert fast_records[0].web_url == "https://www.ebay.com/itm/123"
+    assert fast_records[0].categories == [(619, "Music"), (777, "Keys")]
+    assert fast_records[3].bid_count == 0
+
+
+def test_parse_items_fast_skips_invalid_items_like_model_parser(caplog):
+    payloads = [
+        _summary_payload("v1"),
+        "not-a-dict",
+        _summary_payload("v2", seller=None),
+        _summary_payload("v3", leafCategoryIds=["not-a-number"]),
+        _summary_payload("v4", itemEndDate="soon"),
+        _summary_payload("v5"),
+    ]
+    caplog.set_level(logging.WARNING, logger="ebay_watchlist.ebay.api")
+
+    fast_records = EbayAPI.parse_items_fast(payloads)
+
+    assert [record.item_id for record in fast_records] == ["v1", "v5"]
+    assert [item.item_id for item in EbayAPI.parse_items(payloads)] == ["v1", "v5"]
+    assert sum("Skipping invalid item payload" in m for m in caplog.messages) >= 4
+
+
+def test_parse_mode_fast_yields_item_records():
+    from ebay_watchlist.ebay.dtos import ItemRecord
+
+    api = EbayAPI("id", "secret", parse_mode="fast")
+    api.session = FakeSession(
+        [FakeResponse(200, {"itemSummaries": [_summary_payload("v1")]})]
+    )
+    api.authenticated = True
+
+    items = api.get_latest_items_for_sellers(["seller"], category_id=123, limit=1)
+
+    assert len(items) == 1
+    assert isinstance(items[0], ItemRecord)
+
+
 def test_get_item_snapshot_reauths_once_and_returns_payload():
     api = EbayAPI("id", "secret")
     api.session = FakeSession(
@@ -137,6 +225,77 @@ def test_get_item_snapshot_encodes_item_id_in_path():
     assert api.session.last_params == {"fieldgroups": "COMPACT"}
 
 
+def test_get_item_snapshots_batches_ids_and_maps_missing_to_none():
+    import threading
+
+    class ItemsSession:
+        def __init__(self):
+            self.headers = {}
+            self.requested_batches: list[list[str]] = []
+            self._lock = threading.Lock()
+
+        def get(self, url, params=None, timeout=None):
+            item_ids = params["item_ids"].split(",")
+            with self._lock:
+                self.requested_batches.append(item_ids)
+            if "v1|missing-batch|0" in item_ids:
+                return FakeResponse(404, {})
+            return FakeResponse(
+                200,
+                {"items": [{"itemId": item_id} for item_id in item_ids if item_id != "v1|5|0"]},
+            )
+
+    api = EbayAPI("id", "secret")
+    api.session = ItemsSession()
+    api.authenticated = True
+    item_ids = [f"v1|{idx}|0" for idx in range(45)]
+
+    snapshots = api.get_item_snapshots(item_ids + ["v1|1|0"])
+
+    assert sorted(len(batch) for batch in api.session.requested_batches) == [5, 20, 20]
+    assert list(snapshots) == item_ids
+    assert snapshots["v1|5|0"] is None
+    assert snapshots["v1|44|0"] == {"itemId": "v1|44|0"}
+
+    api.session = ItemsSession()
+    assert api.get_item_snapshots(["v1|missing-batch|0"]) == {"v1|missing-batch|0": None}
+    assert api.get_item_snapshots([]) == {}
+
+
+def test_get_item_snapshots_reauths_once():
+    api = EbayAPI("id", "secret")
+    api.session = FakeSession(
+        [
+            FakeResponse(401, {}),
+            FakeResponse(200, {"access_token": "token-123"}),
+            FakeResponse(200, {"items": [{"itemId": "v1|1|0"}]}),
+        ]
+    )
+    api.authenticated = True
+
+    snapshots = api.get_item_snapshots(["v1|1|0", "v1|2|0"])
+
+    assert snapshots == {"v1|1|0": {"itemId": "v1|1|0"}, "v1|2|0": None}
+    assert api.session.get_calls == 2
+    assert api.session.last_params == {"item_ids": "v1|1|0,v1|2|0"}
+    assert api.session.headers["Authorization"] == "Bearer token-123"
+
+
+def test_get_with_reauth_retries_server_errors_through_transport():
+    from ebay_watchlist.ebay.transport import RetryingTransport
+
+    sleeps: list[float] = []
+    api = EbayAPI("id", "secret", transport=RetryingTransport(sleep=sleeps.append))
+    api.session = FakeSession(
+        [FakeResponse(502, {}), FakeResponse(200, {"categoryTreeId": "3"})]
+    )
+    api.authenticated = True
+
+    assert api.get_default_category_tree_id() == "3"
+    assert api.session.get_calls == 2
+    assert len(sleeps) == 1
+
+
 def test_get_with_reauth_allows_configured_status_without_raising():
     api = EbayAPI("id", "secret")
     api.session = FakeSession([FakeResponse(404, {})])
@@ -202,3 +361,267 @@ def test_authenticate_retries_after_ssl_error_with_minimal_openssl_env(
         "temporary OpenSSL environment override" in message
         for message in caplog.messages
     )
+
+
+def test_ensure_authenticated_posts_once_for_concurrent_callers():
+    import threading
+
+    class CountingAuthSession:
+        def __init__(self):
+            self.headers = {}
+            self.post_calls = 0
+
+        def post(self, url, headers=None, data=None, timeout=None):
+            self.post_calls += 1
+            return FakeResponse(200, {"access_token": "token-123"})
+
+    api = EbayAPI("id", "secret")
+    api.session = CountingAuthSession()
+
+    threads = [threading.Thread(target=api._ensure_authenticated) for _ in range(8)]  # noqa: SLF001
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert api.authenticated is True
+    assert api.session.post_calls == 1
+
+
+def test_concurrent_401s_refresh_the_token_once():
+    import threading
+    from datetime import datetime, timedelta
+
+    thread_count = 6
+    rejected = threading.Barrier(thread_count)
+
+    class ExpiredTokenSession:
+        def __init__(self):
+            self.headers = {"Authorization": "Bearer token-1"}
+
+        def get(self, url, params=None, timeout=None):
+            if self.headers["Authorization"] == "Bearer token-1":
+                # Every thread has sent token-1 before any of them refreshes.
+                rejected.wait(timeout=5)
+                return FakeResponse(401, {})
+            return FakeResponse(200, {"itemId": "v1"})
+
+    api = EbayAPI("id", "secret")
+    api.session = ExpiredTokenSession()
+    api.authenticated = True
+    api.access_token = "token-1"
+    token_requests = []
+
+    def request_token():
+        token_requests.append(threading.get_ident())
+        return f"token-{len(token_requests) + 1}", datetime.now() + timedelta(hours=2)
+
+    api._request_token = request_token  # type: ignore[method-assign]  # noqa: SLF001
+
+    payloads = []
+    threads = [
+        threading.Thread(target=lambda: payloads.append(api.get_item_snapshot("v1")))
+        for _ in range(thread_count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(token_requests) == 1
+    assert payloads == [{"itemId": "v1"}] * thread_count
+    assert api.access_token == "token-2"
+
+
+def test_iter_latest_items_follows_next_links_until_known_page():
+    api = EbayAPI("id", "secret")
+    api.session = FakeSession(
+        [
+            FakeResponse(
+                200,
+                {
+                    "itemSummaries": [{"itemId": "new-1"}, {"itemId": "known-1"}],
+                    "next": "https://api.example.test/search?offset=2",
+                },
+            ),
+            FakeResponse(
+                200,
+                {
+                    "itemSummaries": [{"itemId": "known-2"}, {"itemId": "known-3"}],
+                    "next": "https://api.example.test/search?offset=4",
+                },
+            ),
+        ]
+    )
+    api.authenticated = True
+    api.parse_items = staticmethod(  # type: ignore[method-assign]
+        lambda items: [item["itemId"] for item in items]
+    )
+
+    pages = list(
+        api.iter_latest_items_for_sellers(
+            ["seller"],
+            category_id=123,
+            limit=2,
+            known_item_ids={"known-1", "known-2", "known-3"},
+        )
+    )
+
+    assert pages == [["new-1", "known-1"], ["known-2", "known-3"]]
+    assert api.session.get_calls == 2
+    assert api.session.last_url == "https://api.example.test/search?offset=2"
+    assert api.session.last_params is None
+
+
+def test_get_latest_items_stops_at_max_pages():
+    api = EbayAPI("id", "secret")
+    api.session = FakeSession(
+        [
+            FakeResponse(
+                200,
+                {
+                    "itemSummaries": [{"itemId": f"new-{page}"}],
+                    "next": f"https://api.example.test/search?offset={page}",
+                },
+            )
+            for page in range(3)
+        ]
+    )
+    api.authenticated = True
+    api.parse_items = staticmethod(  # type: ignore[method-assign]
+        lambda items: [item["itemId"] for item in items]
+    )
+
+    result = api.get_latest_items_for_sellers(
+        ["seller"], category_id=123, limit=1, known_item_ids=set(), max_pages=2
+    )
+
+    assert result == ["new-0", "new-1"]
+    assert api.session.get_calls == 2
+
+
+def test_shard_sellers_splits_list_and_keeps_empty_list_as_single_shard():
+    assert EbayAPI.shard_sellers(["a", "b", "c", "d", "e"], 2) == [
+        ["a", "b"],
+        ["c", "d"],
+        ["e"],
+    ]
+    assert EbayAPI.shard_sellers([], 2) == [[]]
+
+
+def test_get_latest_items_merges_seller_shards_and_dedupes(caplog):
+    from types import SimpleNamespace
+
+    class ShardSession:
+        def __init__(self):
+            self.headers = {}
+            self.filters: list[str] = []
+
+        def get(self, url, params=None, timeout=None):
+            self.filters.append(params["filter"])
+            if "sellers:{a|b}" in params["filter"]:
+                return FakeResponse(
+                    200, {"itemSummaries": [{"itemId": "1"}, {"itemId": "2"}]}
+                )
+            return FakeResponse(200, {"itemSummaries": [{"itemId": "2"}, {"itemId": "3"}]})
+
+    api = EbayAPI("id", "secret", seller_shard_size=2)
+    api.session = ShardSession()
+    api.authenticated = True
+    api.parse_items = staticmethod(  # type: ignore[method-assign]
+        lambda items: [SimpleNamespace(item_id=item["itemId"]) for item in items]
+    )
+    caplog.set_level(logging.INFO, logger="ebay_watchlist.ebay.api")
+
+    result = api.get_latest_items_for_sellers(["a", "b", "c"], category_id=123, limit=2)
+
+    assert [item.item_id for item in result] == ["1", "2", "3"]
+    assert sorted(api.session.filters) == [
+        "buyingOptions:{AUCTION},sellers:{a|b}",
+        "buyingOptions:{AUCTION},sellers:{c}",
+    ]
+    assert sum("Seller shard fetched" in message for message in caplog.messages) == 2
+
+
+class TokenSession:
+    def __init__(self, tokens: list[str]):
+        self.headers = {}
+        self.tokens = tokens
+        self.post_calls = 0
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        self.post_calls += 1
+        return FakeResponse(
+            200, {"access_token": self.tokens.pop(0), "expires_in": 7200}
+        )
+
+
+def test_token_store_shares_token_between_clients(temp_db):
+    from ebay_watchlist.db.repositories import OAuthTokenRepository
+
+    first = EbayAPI("id", "secret", token_store=OAuthTokenRepository)
+    first.session = TokenSession(["token-1"])
+    second = EbayAPI("id", "secret", token_store=OAuthTokenRepository)
+    second.session = TokenSession(["token-2"])
+
+    first._ensure_authenticated()  # noqa: SLF001
+    second._ensure_authenticated()  # noqa: SLF001
+
+    assert first.session.post_calls == 1
+    assert second.session.post_calls == 0
+    assert second.session.headers["Authorization"] == "Bearer token-1"
+
+
+def test_token_store_refreshes_rejected_and_expiring_tokens(temp_db):
+    from datetime import datetime, timedelta
+
+    from ebay_watchlist.db.repositories import OAuthTokenRepository
+
+    api = EbayAPI("id", "secret", token_store=OAuthTokenRepository)
+    api.session = TokenSession(["token-2", "token-3"])
+    OAuthTokenRepository.save_token(
+        api.token_cache_key, "token-1", datetime.now() + timedelta(hours=1)
+    )
+
+    api._ensure_authenticated()  # noqa: SLF001
+    assert api.access_token == "token-1"
+    assert api.session.post_calls == 0
+
+    api._authenticate(rejected_token="token-1")  # noqa: SLF001
+    assert api.access_token == "token-2"
+    assert OAuthTokenRepository.load_token(api.token_cache_key)[0] == "token-2"
+
+    api.token_expires_at = datetime.now() + timedelta(minutes=1)
+    OAuthTokenRepository.save_token(
+        api.token_cache_key, "token-2", datetime.now() + timedelta(minutes=1)
+    )
+    api._ensure_authenticated()  # noqa: SLF001
+    assert api.access_token == "token-3"
+    assert api.session.post_calls == 2
+
+
+def test_token_store_refresh_lock_leaves_the_db_writable(temp_db):
+    import sqlite3
+    import threading
+
+    from ebay_watchlist.db.config import database
+    from ebay_watchlist.db.repositories import OAuthTokenRepository
+
+    entered = threading.Event()
+
+    def hold_lock():
+        with OAuthTokenRepository.refresh_lock():
+            entered.set()
+
+    with OAuthTokenRepository.refresh_lock():
+        other_writer = sqlite3.connect(database.database, timeout=0)
+        other_writer.execute("BEGIN IMMEDIATE")
+        other_writer.rollback()
+        other_writer.close()
+
+        waiter = threading.Thread(target=hold_lock)
+        waiter.start()
+        assert not entered.wait(timeout=0.2)
+
+    waiter.join(timeout=5)
+    assert entered.is_set()
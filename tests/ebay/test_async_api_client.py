@@ -0,0 +1,209 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ebay_watchlist.ebay.async_api import AsyncEbayAPI
+
+
+def _item_payload(item_id: str) -> dict:
+    return {
+        "itemId": item_id,
+        "title": "Synth",
+        "leafCategoryIds": ["777"],
+        "categories": [{"categoryName": "Keys", "categoryId": 777}],
+        "seller": {
+            "username": "seller1",
+            "feedbackPercentage": 99.0,
+            "feedbackScore": 100,
+        },
+        "buyingOptions": ["AUCTION"],
+        "price": {"value": "10.00", "currency": "GBP"},
+        "bidCount": 0,
+        "itemWebUrl": f"https://www.ebay.com/itm/{item_id}?foo=bar",
+        "itemOriginDate": "2025-01-01T00:00:00Z",
+        "itemCreationDate": "2025-01-01T00:00:00Z",
+        "itemEndDate": "2025-01-02T00:00:00Z",
+    }
+
+
+def _build_api(handler, **kwargs) -> AsyncEbayAPI:
+    api = AsyncEbayAPI("id", "secret", **kwargs)
+    api.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api.token_client.access_token = "token-1"
+    api.token_client.authenticated = True
+    return api
+
+
+def test_async_get_latest_items_follows_next_links_and_parses_items():
+    requested_urls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        assert request.headers["Authorization"] == "Bearer token-1"
+        if "offset=1" in str(request.url):
+            return httpx.Response(200, json={"itemSummaries": [_item_payload("v2")]})
+        return httpx.Response(
+            200,
+            json={
+                "itemSummaries": [_item_payload("v1")],
+                "next": "https://api.example.test/search?offset=1",
+            },
+        )
+
+    async def run():
+        async with _build_api(handler) as api:
+            return await api.get_latest_items_for_sellers(
+                ["seller1"], category_id=619, limit=1, max_pages=5
+            )
+
+    items = asyncio.run(run())
+
+    assert [item.item_id for item in items] == ["v1", "v2"]
+    assert items[0].web_url == "https://www.ebay.com/itm/v1"
+    assert len(requested_urls) == 2
+
+
+def test_async_get_with_reauth_retries_once_with_fresh_token(monkeypatch):
+    seen_tokens: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_tokens.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer token-1":
+            return httpx.Response(401)
+        return httpx.Response(200, json={})
+
+    api = _build_api(handler)
+
+    def fake_get_access_token(rejected_token=None):
+        return "token-2" if rejected_token == "token-1" else "token-1"
+
+    monkeypatch.setattr(api.token_client, "get_access_token", fake_get_access_token)
+
+    async def run():
+        async with api:
+            return await api.get_latest_items_for_sellers(["seller1"], category_id=619)
+
+    assert asyncio.run(run()) == []
+    assert seen_tokens == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_async_client_limits_requests_in_flight():
+    in_flight = {"current": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["current"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+        await asyncio.sleep(0.01)
+        in_flight["current"] -= 1
+        return httpx.Response(200, json={})
+
+    async def run():
+        async with _build_api(handler, max_in_flight=2, seller_shard_size=1) as api:
+            await api.get_latest_items_for_sellers(
+                ["a", "b", "c", "d", "e"], category_id=619
+            )
+
+    asyncio.run(run())
+
+    assert in_flight["peak"] == 2
+
+
+def test_async_client_rejects_invalid_max_in_flight():
+    with pytest.raises(ValueError, match="max_in_flight must be at least 1"):
+        AsyncEbayAPI("id", "secret", max_in_flight=0)
+
+
+def test_async_get_retries_429_with_retry_after():
+    from ebay_watchlist.ebay.transport import RetryingTransport
+
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"itemSummaries": [_item_payload("v1")]}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    async def run():
+        async with _build_api(handler, transport=RetryingTransport()) as api:
+            items = await api.get_latest_items_for_sellers(["seller1"], category_id=619)
+            return items, api.transport.stats_snapshot()
+
+    items, stats = asyncio.run(run())
+
+    assert [item.item_id for item in items] == ["v1"]
+    search_stats = stats["api.ebay.com/buy/browse/v1/item_summary/search"]
+    assert (search_stats.attempts, search_stats.retries, search_stats.rate_limited) == (2, 1, 1)
+
+
+def test_async_token_refresh_runs_off_the_event_loop(monkeypatch):
+    import threading
+
+    token_threads: list[int] = []
+
+    def fake_get_access_token(rejected_token=None):
+        token_threads.append(threading.get_ident())
+        return "token-1"
+
+    api = _build_api(lambda request: httpx.Response(200, json={}))
+    monkeypatch.setattr(api.token_client, "get_access_token", fake_get_access_token)
+
+    async def run():
+        async with api:
+            await api.get_latest_items_for_sellers(["seller1"], category_id=619)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert token_threads and loop_thread not in token_threads
+
+
+def test_async_failed_shard_cancels_its_siblings():
+    cancelled: list[tuple[str, bool]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "sellers:{a}" in request.url.params["filter"]:
+            return httpx.Response(400)
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append((request.url.params["filter"], api.client.is_closed))
+            raise
+        return httpx.Response(200, json={})
+
+    api = _build_api(handler, seller_shard_size=1)
+
+    async def run():
+        async with api:
+            await api.get_latest_items_for_sellers(["a", "b", "c"], category_id=619)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+    # Both were cancelled while the client was still open.
+    assert sorted(cancelled) == [
+        ("buyingOptions:{AUCTION},sellers:{b}", False),
+        ("buyingOptions:{AUCTION},sellers:{c}", False),
+    ]
+
+
+def test_async_requests_wait_on_the_host_token_bucket():
+    from ebay_watchlist.ebay.transport import RetryingTransport
+
+    transport = RetryingTransport(requests_per_second=50, burst=1)
+
+    async def run():
+        async with _build_api(
+            lambda request: httpx.Response(200, json={}),
+            transport=transport,
+            seller_shard_size=1,
+        ) as api:
+            await api.get_latest_items_for_sellers(["a", "b", "c"], category_id=619)
+
+    asyncio.run(run())
+
+    search_stats = transport.stats_snapshot()["api.ebay.com/buy/browse/v1/item_summary/search"]
+    assert search_stats.attempts == 3
+    # One request per 20ms after the burst of one.
+    assert search_stats.throttled_seconds >= 0.03
@@ -0,0 +1,138 @@
+import pytest
+
+from ebay_watchlist.cli import main as cli_main
+from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.repositories import CategoryRepository, SellerRepository
+from ebay_watchlist.ebay.api import EbayAPI
+from ebay_watchlist.ebay.fake_server import (
+    FAKE_CATEGORIES,
+    FakeEbayCatalog,
+    FakeEbayConfig,
+    FakeEbayServer,
+    create_fake_ebay_app,
+)
+from ebay_watchlist.ebay.transport import RetryingTransport
+
+
+def test_fake_search_paginates_newest_first_and_deterministically():
+    with FakeEbayServer(FakeEbayConfig(items_per_seller=30)) as server:
+        api = EbayAPI("id", "secret", base_url=server.base_url)
+        pages = list(
+            api.iter_latest_items_for_sellers(["alice", "bob"], category_id=33034, limit=25)
+        )
+        again = api.get_latest_items_for_sellers(
+            ["alice", "bob"], category_id=33034, limit=25, max_pages=1
+        )
+
+    items = [item for page in pages for item in page]
+    assert [len(page) for page in pages] == [25, 25, 10]
+    assert len({item.item_id for item in items}) == 60
+    creation_dates = [item.creation_date for item in items]
+    assert creation_dates == sorted(creation_dates, reverse=True)
+    assert {item.seller.username for item in items} == {"alice", "bob"}
+    assert [item.item_id for item in again] == [item.item_id for item in pages[0]]
+
+
+def test_fake_item_endpoints_and_taxonomy():
+    known_id = FakeEbayCatalog.item_id(619, "alice", 3)
+    missing_id = FakeEbayCatalog.item_id(619, "alice", 10_000)
+
+    with FakeEbayServer() as server:
+        api = EbayAPI("id", "secret", base_url=server.base_url)
+        snapshot = api.get_item_snapshot(known_id)
+        missing = api.get_item_snapshot(missing_id)
+        snapshots = api.get_item_snapshots([known_id, missing_id])
+        suggestions = api.get_category_suggestions("electric guitars")
+
+    assert snapshot is not None and snapshot["itemId"] == known_id
+    assert missing is None
+    assert snapshots == {known_id: snapshot, missing_id: None}
+    assert suggestions == [
+        {
+            "id": "33034",
+            "name": "Electric Guitars",
+            "path": "Musical Instruments & DJ Equipment > Guitars & Basses > Electric Guitars",
+        }
+    ]
+
+
+def test_fake_category_tree_is_flattened_root_first():
+    with FakeEbayServer() as server:
+        tree = EbayAPI("id", "secret", base_url=server.base_url).get_category_tree()
+
+    categories = {category["category_id"]: category for category in tree["categories"]}
+    assert tree["category_tree_id"] == "3"
+    assert tree["category_tree_version"] == "1"
+    assert len(categories) == len(FAKE_CATEGORIES)
+    assert categories[33034] == {
+        "category_id": 33034,
+        "name": "Electric Guitars",
+        "parent_id": 3858,
+        "level": 3,
+        "leaf": True,
+        "path": "Musical Instruments & DJ Equipment > Guitars & Basses > Electric Guitars",
+    }
+    assert categories[619]["parent_id"] is None
+    assert categories[619]["leaf"] is False
+
+
+def test_fake_server_rejects_unknown_tokens():
+    client = create_fake_ebay_app().test_client()
+
+    response = client.get(
+        "/buy/browse/v1/item_summary/search",
+        headers={"Authorization": "Bearer not-issued"},
+    )
+
+    assert response.status_code == 401
+
+
+def test_fake_server_injected_429s_and_errors_are_retried():
+    config = FakeEbayConfig(
+        items_per_seller=40,
+        rate_limit_rate=0.3,
+        error_rate=0.2,
+        retry_after_seconds=0,
+        seed=1,
+    )
+    transport = RetryingTransport(max_retries=10, sleep=lambda seconds: None)
+
+    with FakeEbayServer(config) as server:
+        api = EbayAPI("id", "secret", base_url=server.base_url, transport=transport)
+        items = api.get_latest_items_for_sellers(
+            ["alice"], category_id=619, limit=10, max_pages=4
+        )
+
+    assert len(items) == 40
+    search_stats = next(
+        stats
+        for endpoint, stats in transport.stats_snapshot().items()
+        if endpoint.endswith("/item_summary/search")
+    )
+    assert search_stats.rate_limited > 0
+    assert search_stats.server_errors > 0
+    assert search_stats.retries == search_stats.rate_limited + search_stats.server_errors
+
+
+@pytest.mark.parametrize(
+    ("engine", "parser"), [("sync", "model"), ("sync", "fast"), ("async", "fast")]
+)
+def test_fetch_updates_against_fake_server(temp_db, monkeypatch, engine, parser):
+    SellerRepository.add_seller("alice")
+    SellerRepository.add_seller("bob")
+    CategoryRepository.add_category(619)
+    CategoryRepository.add_category(33034)
+    monkeypatch.setattr(cli_main, "display_db_items", lambda items: None)
+
+    with FakeEbayServer(FakeEbayConfig(items_per_seller=15)) as server:
+        monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+        monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+        monkeypatch.setenv("EBAY_API_BASE_URL", server.base_url)
+        monkeypatch.setenv("ENABLE_NOTIFICATIONS", "0")
+
+        new_items = cli_main.fetch_updates(
+            limit=10, engine=engine, concurrency=2, parser=parser
+        )
+
+    assert new_items == {619: 30, 33034: 30}
+    assert Item.select().count() == 60
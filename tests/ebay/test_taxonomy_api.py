@@ -81,3 +81,77 @@ def test_get_category_suggestions_handles_empty_response():
     suggestions = api.get_category_suggestions("telecaster", marketplace_id="EBAY_GB")
 
     assert suggestions == []
+
+
+def _suggestions_payload(category_id: str, category_name: str) -> dict:
+    return {
+        "categorySuggestions": [
+            {"category": {"categoryId": category_id, "categoryName": category_name}}
+        ]
+    }
+
+
+def test_category_suggestions_are_cached_by_normalized_query_and_marketplace():
+    api = EbayAPI("id", "secret")
+    api.session = FakeSession(
+        [
+            FakeResponse(200, {"categoryTreeId": "3"}),
+            FakeResponse(200, _suggestions_payload("33034", "Electric Guitars")),
+            FakeResponse(200, _suggestions_payload("180014", "Synthesisers")),
+            FakeResponse(200, {"categoryTreeId": "0"}),
+            FakeResponse(200, _suggestions_payload("33034", "Electric Guitars")),
+        ]
+    )
+    api.authenticated = True
+
+    first = api.get_category_suggestions("Telecaster  Guitar", marketplace_id="EBAY_GB")
+    again = api.get_category_suggestions(" telecaster guitar ", marketplace_id="EBAY_GB")
+    _ = api.get_category_suggestions("synth", marketplace_id="EBAY_GB")
+    _ = api.get_category_suggestions("telecaster guitar", marketplace_id="EBAY_US")
+
+    assert again == first
+    assert api.session.responses == []
+    stats = api.cache_stats()
+    assert (stats["category_suggestions"].hits, stats["category_suggestions"].misses) == (1, 3)
+    assert (stats["category_tree_id"].hits, stats["category_tree_id"].misses) == (1, 2)
+    assert stats["category_suggestions"].size == 3
+
+
+def test_category_suggestion_cache_evicts_least_recently_used():
+    api = EbayAPI("id", "secret", suggestion_cache_size=1)
+    api.session = FakeSession(
+        [
+            FakeResponse(200, {"categoryTreeId": "3"}),
+            FakeResponse(200, _suggestions_payload("1", "Collectables")),
+            FakeResponse(200, _suggestions_payload("2", "Synthesisers")),
+            FakeResponse(200, _suggestions_payload("1", "Collectables")),
+        ]
+    )
+    api.authenticated = True
+
+    for query in ("collect", "synth", "collect"):
+        api.get_category_suggestions(query)
+
+    assert api.session.responses == []
+    assert api.cache_stats()["category_suggestions"].size == 1
+
+
+def test_category_tree_id_cache_expires(monkeypatch):
+    from ebay_watchlist.ebay import api as api_module
+
+    now = [1000.0]
+    monkeypatch.setattr(api_module, "monotonic", lambda: now[0])
+    api = EbayAPI("id", "secret")
+    api.session = FakeSession(
+        [
+            FakeResponse(200, {"categoryTreeId": "3"}),
+            FakeResponse(200, {"categoryTreeId": "4"}),
+        ]
+    )
+    api.authenticated = True
+
+    assert api.get_default_category_tree_id() == "3"
+    now[0] += api_module.CATEGORY_TREE_ID_TTL_SECONDS - 1
+    assert api.get_default_category_tree_id() == "3"
+    now[0] += 2
+    assert api.get_default_category_tree_id() == "4"
@@ -0,0 +1,197 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from ebay_watchlist.ebay.transport import (
+    RetryingTransport,
+    TokenBucket,
+    endpoint_name,
+    parse_retry_after,
+)
+
+SEARCH_URL = "https://api.ebay.com/buy/browse/v1/item_summary/search"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def make_transport(sleeps: list[float], max_retries: int = 3) -> RetryingTransport:
+    return RetryingTransport(
+        max_retries=max_retries,
+        sleep=sleeps.append,
+        rng=random.Random(0),
+        requests_per_second=1000,
+        burst=100,
+    )
+
+
+def test_send_retries_429_honouring_retry_after():
+    sleeps: list[float] = []
+    transport = make_transport(sleeps)
+    responses = [FakeResponse(429, {"Retry-After": "7"}), FakeResponse(200)]
+
+    response = transport.send(SEARCH_URL, lambda: responses.pop(0))
+
+    assert response.status_code == 200
+    assert sleeps == [7.0]
+    stats = transport.stats_snapshot()["api.ebay.com/buy/browse/v1/item_summary/search"]
+    assert (stats.attempts, stats.retries, stats.rate_limited) == (2, 1, 1)
+
+
+def test_send_returns_last_5xx_response_once_retries_run_out():
+    sleeps: list[float] = []
+    transport = make_transport(sleeps, max_retries=2)
+    calls = []
+
+    def send():
+        calls.append(1)
+        return FakeResponse(503)
+
+    response = transport.send(SEARCH_URL, send)
+
+    assert response.status_code == 503
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    # Full jitter keeps every delay under the exponential ceiling.
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+    assert transport.stats_snapshot()[endpoint_name(SEARCH_URL)].server_errors == 3
+
+
+def test_send_stops_retrying_once_the_retry_budget_is_spent():
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    transport = RetryingTransport(
+        max_retries=5,
+        retry_budget_seconds=10,
+        sleep=sleep,
+        clock=lambda: now[0],
+        requests_per_second=1000,
+        burst=100,
+    )
+    responses = [
+        FakeResponse(503, {"Retry-After": "4"}),
+        FakeResponse(429, {"Retry-After": "4"}),
+        FakeResponse(429, {"Retry-After": "4"}),
+    ]
+
+    response = transport.send(SEARCH_URL, lambda: responses.pop(0))
+
+    # A third wait would end 12s after the first attempt.
+    assert response.status_code == 429
+    assert sleeps == [4.0, 4.0]
+    assert responses == []
+
+    def refused():
+        raise requests.exceptions.ConnectionError("refused")
+
+    transport.retry_budget_seconds = 0
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.send(SEARCH_URL, refused)
+    assert sleeps == [4.0, 4.0]
+
+
+def test_send_throttles_on_the_injected_clock():
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    transport = RetryingTransport(
+        sleep=sleep, clock=lambda: now[0], requests_per_second=2, burst=1
+    )
+
+    for _ in range(3):
+        assert transport.send(SEARCH_URL, lambda: FakeResponse(200)).status_code == 200
+
+    assert sleeps == [0.5, 0.5]
+    assert transport.stats_snapshot()[endpoint_name(SEARCH_URL)].throttled_seconds == 1.0
+
+
+def test_send_retries_connection_errors_but_not_tls_errors():
+    sleeps: list[float] = []
+    transport = make_transport(sleeps)
+    outcomes: list = [requests.exceptions.ConnectionError("reset"), FakeResponse(200)]
+
+    def send():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert transport.send(SEARCH_URL, send).status_code == 200
+    assert len(sleeps) == 1
+
+    def tls_failure():
+        raise requests.exceptions.SSLError("handshake")
+
+    with pytest.raises(requests.exceptions.SSLError):
+        transport.send(SEARCH_URL, tls_failure)
+    assert len(sleeps) == 1
+
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate_per_second=2, burst=2, clock=lambda: now[0], sleep=sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert sleeps == [pytest.approx(0.5)]
+
+
+def test_token_bucket_async_acquire_waits_without_blocking_the_loop():
+    import asyncio
+
+    bucket = TokenBucket(rate_per_second=50, burst=1)
+
+    async def run():
+        waits = await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+        return sorted(waits)
+
+    waits = asyncio.run(run())
+
+    assert waits[0] == 0
+    assert waits[2] >= 0.03
+
+
+def test_parse_retry_after_supports_http_dates_and_reset_headers():
+    now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    assert parse_retry_after({"Retry-After": "Thu, 01 Jan 2026 12:00:30 GMT"}, now) == 30
+    assert parse_retry_after({"X-RateLimit-Reset": "12"}) == 12
+    # Reset headers may also carry the Unix time at which the window resets.
+    assert parse_retry_after({"RateLimit-Reset": str(now.timestamp() + 45)}, now) == 45
+    assert parse_retry_after({"X-RateLimit-Reset": str(now.timestamp() - 5)}, now) == 0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_endpoint_name_collapses_item_and_tree_ids():
+    assert (
+        endpoint_name("https://api.ebay.com/buy/browse/v1/item/v1%7C123%7C0")
+        == "api.ebay.com/buy/browse/v1/item/{item_id}"
+    )
+    assert (
+        endpoint_name(
+            "https://api.ebay.com/commerce/taxonomy/v1/category_tree/3/get_category_suggestions"
+        )
+        == "api.ebay.com/commerce/taxonomy/v1/category_tree/{category_tree_id}/get_category_suggestions"
+    )
@@ -0,0 +1,87 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from typer.testing import CliRunner
+
+from ebay_watchlist.cli.main import app
+from ebay_watchlist.db.repositories import CategoryScheduleRepository
+from ebay_watchlist.scheduler.service import PollScheduler
+
+runner = CliRunner()
+
+
+def make_scheduler(**kwargs) -> PollScheduler:
+    defaults = {
+        "min_interval_seconds": 60,
+        "max_interval_seconds": 3600,
+        "jitter_ratio": 0.0,
+        "rng": random.Random(0),
+    }
+    defaults.update(kwargs)
+    return PollScheduler(**defaults)
+
+
+def test_unscheduled_categories_are_due(temp_db):
+    scheduler = make_scheduler()
+    now = datetime(2026, 2, 10, 12, 0, 0)
+
+    assert scheduler.due_categories([619, 1249], now) == [619, 1249]
+    assert scheduler.seconds_until_next_poll([619, 1249], now) == 0.0
+
+
+def test_record_poll_learns_rate_and_persists_schedule(temp_db):
+    scheduler = make_scheduler(smoothing=1.0)
+    first_poll = datetime(2026, 2, 10, 12, 0, 0)
+
+    first = scheduler.record_poll(619, new_items_count=50, polled_at=first_poll)
+    assert first.interval_seconds == 60
+    assert first.new_items_per_hour == 0.0
+
+    # 10 new items in 30 minutes -> 20/hour -> 2 items every 6 minutes.
+    second_poll = first_poll + timedelta(minutes=30)
+    second = scheduler.record_poll(619, new_items_count=10, polled_at=second_poll)
+
+    assert second.new_items_per_hour == pytest.approx(20.0)
+    assert second.interval_seconds == 360
+    assert second.next_poll_at == second_poll + timedelta(seconds=360)
+
+    restarted = make_scheduler()
+    assert restarted.due_categories([619], second_poll + timedelta(minutes=5)) == []
+    assert restarted.due_categories([619], second_poll + timedelta(minutes=6)) == [619]
+
+
+def test_interval_is_clamped_to_bounds_and_jittered(temp_db):
+    scheduler = make_scheduler(jitter_ratio=0.1)
+
+    assert scheduler.next_interval_seconds(0.0) == 3600
+    assert scheduler.next_interval_seconds(10_000.0) == 60
+
+    start = datetime(2026, 2, 10, 12, 0, 0)
+    scheduler.record_poll(619, new_items_count=0, polled_at=start)
+    quiet = scheduler.record_poll(
+        619, new_items_count=0, polled_at=start + timedelta(hours=1)
+    )
+    assert 3240 <= quiet.interval_seconds <= 3600
+
+
+def test_scheduler_rejects_inverted_bounds():
+    with pytest.raises(ValueError, match="max_interval_seconds"):
+        PollScheduler(min_interval_seconds=600, max_interval_seconds=60)
+
+
+def test_show_schedule_command_lists_categories(temp_db):
+    polled_at = datetime(2026, 2, 10, 12, 0, 0)
+    CategoryScheduleRepository.save_schedule(
+        category_id=619,
+        new_items_per_hour=12.5,
+        interval_seconds=600,
+        last_polled_at=polled_at,
+        next_poll_at=polled_at + timedelta(minutes=10),
+    )
+
+    result = runner.invoke(app, ["show-schedule"])
+
+    assert result.exit_code == 0
+    assert "619" in result.stdout
+    assert "12.50" in result.stdout
@@ -0,0 +1,11 @@
+import pytest
+
+from ebay_watchlist.web import api_v1
+
+
+@pytest.fixture(autouse=True)
+def reset_ebay_clients():
+    # Workers keep their eBay client for the whole process; tests must not share one.
+    api_v1._ebay_clients.clear()
+    yield
+    api_v1._ebay_clients.clear()
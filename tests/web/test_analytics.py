@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 
 from freezegun import freeze_time
 
-from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.models import Category, Item, Seller
 from ebay_watchlist.db.repositories import ItemRepository
 from ebay_watchlist.web.app import create_app
 
@@ -20,9 +20,9 @@ def insert_item(
         title=title,
         scraped_category_id=619,
         category_id=619,
-        category_name=category_name,
+        category=Category.get_or_create(name=category_name)[0],
         image_url="https://img.example/item.jpg",
-        seller_name=seller_name,
+        seller=Seller.get_or_create(name=seller_name)[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
 import logging
 
-from ebay_watchlist.db.models import Item
+import requests
+
+from ebay_watchlist.db.models import Category, Item, Seller
 from ebay_watchlist.web.app import create_app
 
 
@@ -12,9 +14,9 @@ def insert_item(item_id: str):
         title="Item",
         scraped_category_id=619,
         category_id=619,
-        category_name="Electric Guitars",
+        category=Category.get_or_create(name="Electric Guitars")[0],
         image_url="https://img.example/item.jpg",
-        seller_name="alice",
+        seller=Seller.get_or_create(name="alice")[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -103,8 +105,16 @@ def test_refresh_item_updates_market_data(temp_db, monkeypatch):
     client = app.test_client()
 
     class FakeEbayAPI:
-        def __init__(self, client_id: str, client_secret: str, marketplace_id: str = "EBAY_GB"):
-            _ = client_id, client_secret, marketplace_id
+        def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            marketplace_id: str = "EBAY_GB",
+            token_store=None,
+            base_url=None,
+            transport=None,
+        ):
+            _ = client_id, client_secret, marketplace_id, token_store, base_url, transport
 
         def get_item_snapshot(self, item_id: str):
             assert item_id == "6"
@@ -156,8 +166,16 @@ def test_refresh_item_returns_404_when_item_not_found_on_ebay(temp_db, monkeypat
     client = app.test_client()
 
     class FakeEbayAPI:
-        def __init__(self, client_id: str, client_secret: str, marketplace_id: str = "EBAY_GB"):
-            _ = client_id, client_secret, marketplace_id
+        def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            marketplace_id: str = "EBAY_GB",
+            token_store=None,
+            base_url=None,
+            transport=None,
+        ):
+            _ = client_id, client_secret, marketplace_id, token_store, base_url, transport
 
         def get_item_snapshot(self, item_id: str):
             assert item_id == "8"
@@ -179,8 +197,16 @@ def test_refresh_item_logs_failure_details(temp_db, monkeypatch, caplog):
     client = app.test_client()
 
     class FakeEbayAPI:
-        def __init__(self, client_id: str, client_secret: str, marketplace_id: str = "EBAY_GB"):
-            _ = client_id, client_secret, marketplace_id
+        def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            marketplace_id: str = "EBAY_GB",
+            token_store=None,
+            base_url=None,
+            transport=None,
+        ):
+            _ = client_id, client_secret, marketplace_id, token_store, base_url, transport
 
         def get_item_snapshot(self, item_id: str):
             assert item_id == "9"
@@ -196,3 +222,134 @@ def test_refresh_item_logs_failure_details(temp_db, monkeypatch, caplog):
     assert response.status_code == 502
     assert response.get_json() == {"error": "refresh failed: could not fetch item from ebay"}
     assert any("Manual refresh failed for item_id=9" in message for message in caplog.messages)
+
+
+def test_refresh_item_returns_503_instead_of_waiting_out_rate_limits(temp_db, monkeypatch):
+    from ebay_watchlist.web import api_v1
+
+    insert_item("14")
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+
+    class RateLimitedSession:
+        headers = {}
+
+        def get(self, url, params=None, timeout=None):
+            response = requests.Response()
+            response.status_code = 429
+            response.headers["Retry-After"] = "60"
+            return response
+
+    api = api_v1._get_ebay_client()
+    assert api is not None
+    api.session = RateLimitedSession()
+    api.authenticated = True
+    api.access_token = "token-1"
+
+    response = create_app().test_client().post("/api/v1/items/14/refresh")
+
+    assert response.status_code == 503
+    assert response.get_json() == {"error": "refresh unavailable: ebay is busy, try again later"}
+    item_stats = api.transport.stats_snapshot()["api.ebay.com/buy/browse/v1/item/{item_id}"]
+    # Retry-After is past the retry budget, so it was neither waited for nor retried.
+    assert (item_stats.attempts, item_stats.retries) == (1, 0)
+
+
+def test_refresh_items_updates_many_items_with_one_batch_call(temp_db, monkeypatch):
+    insert_item("10")
+    insert_item("11")
+    insert_item("12")
+    batches = []
+
+    class FakeEbayAPI:
+        def __init__(self, **kwargs):
+            _ = kwargs
+
+        def get_item_snapshots(self, item_ids: list[str]):
+            batches.append(item_ids)
+            return {
+                "10": {"currentBidPrice": {"value": "20.00", "currency": "GBP"}, "bidCount": 4},
+                "11": {"price": {"value": "30.00", "currency": "GBP"}},
+                "12": None,
+            }
+
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setattr("ebay_watchlist.web.api_v1.EbayAPI", FakeEbayAPI)
+
+    client = create_app().test_client()
+    client.post("/api/v1/items/11/favorite", json={"value": True})
+    response = client.post(
+        "/api/v1/items/refresh", json={"item_ids": ["10", "11", "12", "missing", "10"]}
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert batches == [["10", "11", "12"]]
+    assert [item["item_id"] for item in payload["items"]] == ["10", "11"]
+    assert payload["items"][0]["price"] == 20.0
+    assert payload["items"][0]["bids"] == 4
+    assert payload["items"][1]["price"] == 30.0
+    assert payload["items"][1]["favorite"] is True
+    assert payload["errors"] == {"missing": "item not found", "12": "item not found on ebay"}
+    assert Item.get_by_id("11").price == 30
+
+
+def test_refresh_items_writes_only_market_data_and_its_fingerprint(temp_db, monkeypatch):
+    from ebay_watchlist.db.repositories import FINGERPRINT_FIELDS, ItemRepository
+
+    insert_item("15")
+
+    class FakeEbayAPI:
+        def __init__(self, **kwargs):
+            _ = kwargs
+
+        def get_item_snapshots(self, item_ids: list[str]):
+            # Hidden while the refresh was waiting on eBay.
+            ItemRepository.update_item_state("15", hidden=True)
+            return {"15": {"currentBidPrice": {"value": "25.00", "currency": "GBP"}}}
+
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setattr("ebay_watchlist.web.api_v1.EbayAPI", FakeEbayAPI)
+
+    response = create_app().test_client().post(
+        "/api/v1/items/refresh", json={"item_ids": ["15"]}
+    )
+
+    assert response.status_code == 200
+    item = Item.get_by_id("15")
+    assert item.current_bid_price == 25
+    assert item.hidden is True
+    assert item.content_fingerprint == ItemRepository._content_fingerprint(
+        {field_name: getattr(item, field_name) for field_name in FINGERPRINT_FIELDS}
+    )
+
+
+def test_refresh_items_validates_payload_and_reports_fetch_failures(temp_db, monkeypatch):
+    insert_item("13")
+
+    class FakeEbayAPI:
+        def __init__(self, **kwargs):
+            _ = kwargs
+
+        def get_item_snapshots(self, item_ids: list[str]):
+            raise RuntimeError("upstream boom")
+
+    client = create_app().test_client()
+    unconfigured = client.post("/api/v1/items/refresh", json={"item_ids": ["13"]})
+
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setattr("ebay_watchlist.web.api_v1.EbayAPI", FakeEbayAPI)
+    invalid = client.post("/api/v1/items/refresh", json={"item_ids": "13"})
+    too_many = client.post(
+        "/api/v1/items/refresh", json={"item_ids": [str(index) for index in range(201)]}
+    )
+    failed = client.post("/api/v1/items/refresh", json={"item_ids": ["13"]})
+
+    assert unconfigured.status_code == 503
+    assert invalid.status_code == 400
+    assert too_many.status_code == 400
+    assert failed.status_code == 502
+    assert failed.get_json() == {"error": "refresh failed: could not fetch items from ebay"}
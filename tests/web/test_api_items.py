@@ -2,8 +2,9 @@ from datetime import datetime, timedelta
 
 from freezegun import freeze_time
 
-from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.models import Category, Item, Seller
 from ebay_watchlist.db.repositories import ItemRepository
+from ebay_watchlist.web.api_v1 import SUPPORTED_SORTS
 from ebay_watchlist.web.app import create_app
 
 
@@ -24,9 +25,9 @@ def insert_item(
         title=title,
         scraped_category_id=scraped_category_id,
         category_id=scraped_category_id,
-        category_name=category_name,
+        category=Category.get_or_create(name=category_name)[0],
         image_url="https://img.example/item.jpg",
-        seller_name=seller_name,
+        seller=Seller.get_or_create(name=seller_name)[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -58,6 +59,8 @@ def test_items_api_returns_paginated_payload_shape(temp_db):
         "total_pages": 1,
         "has_next": False,
         "has_prev": False,
+        "next_cursor": None,
+        "prev_cursor": None,
         "sort": "newest",
     }
 
@@ -457,3 +460,193 @@ def test_items_api_price_sort_excludes_ended_by_default(temp_db):
         "ended-lowest",
         "active-expensive",
     ]
+
+
+@freeze_time("2025-01-01 12:00:00")
+def test_items_api_searches_titles_by_substring_or_ranked_words(temp_db):
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    for item_id, title, minutes_old in [
+        ("1", "Telecaster style guitar with telecaster pickups", 1),
+        ("2", "Fender Telecaster", 2),
+        ("3", "Stratocaster", 3),
+    ]:
+        insert_item(
+            item_id=item_id,
+            title=title,
+            seller_name="alice",
+            category_name="Electric Guitars",
+            scraped_category_id=619,
+            creation_date=base - timedelta(minutes=minutes_old),
+            end_date=base + timedelta(days=1),
+        )
+    client = create_app().test_client()
+
+    substring = client.get("/api/v1/items?q=caster").get_json()
+    words = client.get("/api/v1/items?q=tele&search_mode=words&sort=relevance").get_json()
+    unknown_mode = client.get("/api/v1/items?q=caster&search_mode=fuzzy").get_json()
+
+    assert [item["item_id"] for item in substring["items"]] == ["1", "2", "3"]
+    assert [item["item_id"] for item in words["items"]] == ["2", "1"]
+    assert words["sort"] == "relevance"
+    assert unknown_mode["total"] == 3
+
+
+def walk_cursor_pages(client, params: str, first_page: dict, key: str) -> list[dict]:
+    pages = [first_page]
+    while pages[-1][key]:
+        response = client.get(f"/api/v1/items?{params}&cursor={pages[-1][key]}")
+        assert response.status_code == 200
+        pages.append(response.get_json())
+    return pages
+
+
+@freeze_time("2025-01-01 12:00:00")
+def test_items_api_cursor_pages_match_offset_order_for_every_sort(temp_db):
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    # Duplicate dates, prices and bid counts so every sort needs its tiebreak.
+    for index in range(11):
+        insert_item(
+            item_id=f"{index:02d}",
+            title="Synth module" if index % 3 else "Synth module synth",
+            seller_name="alice",
+            category_name="Synthesizers",
+            scraped_category_id=619,
+            creation_date=base - timedelta(minutes=index % 4),
+            end_date=base + timedelta(hours=index % 3 + 1),
+            bid_count=index % 2,
+            current_bid_price=None if index % 3 else 25,
+            price=None if index % 5 == 0 else 10 + index % 2,
+        )
+    client = create_app().test_client()
+
+    for sort in sorted(SUPPORTED_SORTS):
+        params = f"sort={sort}&q=synth&search_mode=words"
+        expected = [
+            item["item_id"]
+            for item in client.get(f"/api/v1/items?{params}").get_json()["items"]
+        ]
+        params += "&page_size=3"
+        first_page = client.get(f"/api/v1/items?{params}").get_json()
+        forward = walk_cursor_pages(client, params, first_page, "next_cursor")
+        backward = walk_cursor_pages(client, params, forward[-1], "prev_cursor")
+
+        assert len(expected) == 11
+        assert [i["item_id"] for p in forward for i in p["items"]] == expected, sort
+        assert [
+            i["item_id"] for p in reversed(backward) for i in p["items"]
+        ] == expected, sort
+        assert first_page["prev_cursor"] is None
+        assert forward[-1]["has_next"] is False
+        assert backward[-1]["has_prev"] is False
+        assert [len(page["items"]) for page in backward] == [2, 3, 3, 3]
+
+
+@freeze_time("2025-01-01 12:00:00")
+def test_items_api_cursor_mode_keeps_page_mode_links_and_rejects_bad_cursors(temp_db):
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    for index in range(5):
+        insert_item(
+            item_id=str(index),
+            title=f"Guitar {index}",
+            seller_name="alice",
+            category_name="Electric Guitars",
+            scraped_category_id=619,
+            creation_date=base - timedelta(minutes=index),
+            end_date=base + timedelta(days=1),
+        )
+    client = create_app().test_client()
+
+    page_two = client.get("/api/v1/items?page=2&page_size=2").get_json()
+    after = client.get(
+        f"/api/v1/items?page=3&page_size=2&cursor={page_two['next_cursor']}"
+    ).get_json()
+    before = client.get(
+        f"/api/v1/items?page=1&page_size=2&cursor={page_two['prev_cursor']}"
+    ).get_json()
+    wrong_sort = client.get(
+        f"/api/v1/items?sort=price_low&cursor={page_two['next_cursor']}"
+    )
+    garbage = client.get("/api/v1/items?cursor=not-a-cursor")
+
+    assert [item["item_id"] for item in page_two["items"]] == ["2", "3"]
+    assert [item["item_id"] for item in after["items"]] == ["4"]
+    assert (after["page"], after["has_next"], after["next_cursor"]) == (3, False, None)
+    assert [item["item_id"] for item in before["items"]] == ["0", "1"]
+    assert (before["has_prev"], before["has_next"]) == (False, True)
+    assert wrong_sort.status_code == 400
+    assert garbage.status_code == 400
+    assert garbage.get_json() == {"error": "invalid cursor"}
+
+
+@freeze_time("2025-01-01 12:00:00")
+def test_items_api_can_skip_the_total_and_read_ahead_instead(temp_db):
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    for index in range(5):
+        insert_item(
+            item_id=str(index),
+            title=f"Guitar {index}",
+            seller_name="alice",
+            category_name="Electric Guitars",
+            scraped_category_id=619,
+            creation_date=base - timedelta(minutes=index),
+            end_date=base + timedelta(days=1),
+        )
+    client = create_app().test_client()
+
+    first = client.get("/api/v1/items?page_size=2&include_total=0").get_json()
+    last = client.get("/api/v1/items?page=3&page_size=2&include_total=0").get_json()
+    count = client.get("/api/v1/items/count?page_size=2&seller=alice").get_json()
+
+    assert [item["item_id"] for item in first["items"]] == ["0", "1"]
+    assert (first["total"], first["total_pages"], first["has_next"]) == (None, None, True)
+    assert [item["item_id"] for item in last["items"]] == ["4"]
+    assert (last["has_next"], last["has_prev"], last["next_cursor"]) == (False, True, None)
+    assert count == {"total": 5, "total_pages": 3}
+
+
+@freeze_time("2025-01-01 12:00:00")
+def test_items_api_caches_totals_until_items_change(temp_db, monkeypatch):
+    base = datetime(2025, 1, 1, 12, 0, 0)
+
+    def insert(item_id: str):
+        insert_item(
+            item_id=item_id,
+            title="Guitar",
+            seller_name="alice",
+            category_name="Electric Guitars",
+            scraped_category_id=619,
+            creation_date=base,
+            end_date=base + timedelta(days=1),
+        )
+
+    insert("1")
+    insert("2")
+    count_calls: list[dict] = []
+    count_filtered_items = ItemRepository.count_filtered_items
+
+    def counting(**kwargs):
+        count_calls.append(kwargs)
+        return count_filtered_items(**kwargs)
+
+    monkeypatch.setattr(ItemRepository, "count_filtered_items", counting)
+    client = create_app().test_client()
+
+    def total(query: str = "") -> int:
+        return client.get(f"/api/v1/items?{query}").get_json()["total"]
+
+    assert total() == 2
+    assert total("sort=price_low&page=1") == 2
+    assert client.get("/api/v1/items/count").get_json()["total"] == 2
+    assert len(count_calls) == 1
+
+    # Price and bid updates don't change which items match.
+    Item.update(price=99, bid_count=3).where(Item.item_id == "1").execute()
+    assert total() == 2
+    assert len(count_calls) == 1
+
+    ItemRepository.update_item_state("1", hidden=True)
+    assert total() == 1
+    insert("3")
+    assert total() == 2
+    assert total("show_hidden=1") == 3
+    assert len(count_calls) == 4
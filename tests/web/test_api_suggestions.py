@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.models import Category, Item, Seller
 from ebay_watchlist.web.app import create_app
 
 
@@ -16,9 +16,9 @@ def insert_item(
         title=f"{category_name} Item",
         scraped_category_id=scraped_category_id,
         category_id=scraped_category_id,
-        category_name=category_name,
+        category=Category.get_or_create(name=category_name)[0],
         image_url="https://img.example/item.jpg",
-        seller_name=seller_name,
+        seller=Seller.get_or_create(name=seller_name)[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -82,3 +82,16 @@ def test_category_suggestions_can_be_scoped_by_main_category(temp_db):
     assert response.get_json() == {
         "items": [{"value": "Electric Guitars", "label": "Electric Guitars"}]
     }
+
+
+def test_seller_suggestions_can_be_ranked_by_item_count(temp_db):
+    insert_item("1", "music_bob", "Electric Guitars", 619)
+    insert_item("2", "alice_music", "Electric Guitars", 619)
+    insert_item("3", "alice_music", "Keyboards", 619)
+
+    client = create_app().test_client()
+    by_name = client.get("/api/v1/suggestions/sellers?q=music").get_json()
+    by_count = client.get("/api/v1/suggestions/sellers?q=music&rank=count").get_json()
+
+    assert [item["value"] for item in by_name["items"]] == ["music_bob", "alice_music"]
+    assert [item["value"] for item in by_count["items"]] == ["alice_music", "music_bob"]
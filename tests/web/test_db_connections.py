@@ -0,0 +1,73 @@
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+from peewee import OperationalError
+
+from ebay_watchlist.db.config import database
+from ebay_watchlist.db.models import Category, Item, Seller
+from ebay_watchlist.db.utils import checkpoint_wal
+from ebay_watchlist.web.app import create_app
+from ebay_watchlist.web.db import connect_db
+
+
+def insert_item(item_id: str):
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    Item.create(
+        item_id=item_id,
+        title=f"Item {item_id}",
+        scraped_category_id=619,
+        category_id=619,
+        category=Category.get_or_create(name="Electric Guitars")[0],
+        seller=Seller.get_or_create(name="alice")[0],
+        web_url=f"https://www.ebay.com/itm/{item_id}",
+        origin_date=now,
+        creation_date=now,
+        end_date=datetime.now() + timedelta(days=1),
+    )
+
+
+def test_get_requests_use_a_read_only_connection(temp_db):
+    app = create_app()
+
+    with app.test_request_context("/api/v1/items", method="GET"):
+        connect_db()
+        assert database.is_read_only()
+        assert database.pragma("query_only") == 1
+        with pytest.raises(OperationalError):
+            insert_item("1")
+
+    with app.test_request_context("/api/v1/items/1/favorite", method="POST"):
+        connect_db()
+        assert not database.is_read_only()
+        insert_item("1")
+
+    assert Item.select().count() == 1
+
+
+def test_requests_switch_between_reader_and_writer_connections(temp_db):
+    insert_item("1")
+    client = create_app().test_client()
+
+    before = client.get("/api/v1/items")
+    favorite = client.post("/api/v1/items/1/favorite", json={"value": True})
+    after = client.get("/api/v1/items?favorite=1")
+
+    assert before.status_code == 200
+    assert favorite.status_code == 200
+    assert [item["item_id"] for item in after.get_json()["items"]] == ["1"]
+
+
+def test_read_only_connections_can_read_a_snapshot_copy(temp_db, tmp_path, monkeypatch):
+    insert_item("1")
+    checkpoint_wal("TRUNCATE")
+    snapshot_path = tmp_path / "snapshot.sqlite3"
+    shutil.copyfile(database.database, snapshot_path)
+    insert_item("2")
+    monkeypatch.setattr(database, "read_database", str(snapshot_path))
+    client = create_app().test_client()
+
+    response = client.get("/api/v1/items")
+
+    assert [item["item_id"] for item in response.get_json()["items"]] == ["1"]
+    assert Item.select().count() == 2
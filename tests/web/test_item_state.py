@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.models import Category, Item, Seller
 from ebay_watchlist.db.repositories import ItemRepository
 from ebay_watchlist.web.app import create_app
 
@@ -12,9 +12,9 @@ def insert_item(item_id: str, title: str) -> None:
         title=title,
         scraped_category_id=619,
         category_id=619,
-        category_name="Electric Guitars",
+        category=Category.get_or_create(name="Electric Guitars")[0],
         image_url="https://img.example/item.jpg",
-        seller_name="alice",
+        seller=Seller.get_or_create(name="alice")[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
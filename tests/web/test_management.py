@@ -120,3 +120,71 @@ def test_watchlist_category_suggestions_returns_json(temp_db, monkeypatch):
             }
         ]
     }
+
+
+def test_watchlist_category_suggestions_use_the_synced_category_tree(
+    temp_db, monkeypatch
+):
+    from ebay_watchlist.db.repositories import CategoryTreeRepository
+
+    CategoryTreeRepository.replace_tree(
+        "EBAY_GB",
+        "3",
+        "1",
+        [
+            {
+                "category_id": 619,
+                "name": "Musical Instruments & DJ Equipment",
+                "parent_id": None,
+                "level": 1,
+                "leaf": False,
+                "path": "Musical Instruments & DJ Equipment",
+            }
+        ],
+    )
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setattr("ebay_watchlist.web.api_v1.EbayAPI", None)
+
+    client = create_app().test_client()
+    response = client.get("/api/v1/watchlist/category-suggestions?q=music")
+
+    assert response.get_json() == {
+        "suggestions": [
+            {
+                "id": "619",
+                "name": "Musical Instruments & DJ Equipment",
+                "path": "Musical Instruments & DJ Equipment",
+            }
+        ]
+    }
+
+
+def test_watchlist_category_suggestions_reuse_one_ebay_client(temp_db, monkeypatch):
+    from ebay_watchlist.ebay.api import CacheStats
+
+    constructed = []
+
+    class FakeEbayAPI:
+        def __init__(self, **kwargs):
+            constructed.append(kwargs)
+
+        def get_category_suggestions(self, query, marketplace_id, limit):
+            return [{"id": "619", "name": "Musical Instruments", "path": query}]
+
+        def cache_stats(self):
+            return {"category_suggestions": CacheStats(hits=1, misses=1, size=1)}
+
+    monkeypatch.setenv("EBAY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("EBAY_CLIENT_SECRET", "client-secret")
+    monkeypatch.setattr("ebay_watchlist.web.api_v1.EbayAPI", FakeEbayAPI)
+
+    client = create_app().test_client()
+    client.get("/api/v1/watchlist/category-suggestions?q=music")
+    client.get("/api/v1/watchlist/category-suggestions?q=musical")
+    stats_response = client.get("/api/v1/ebay/cache-stats")
+
+    assert len(constructed) == 1
+    assert stats_response.get_json() == {
+        "caches": {"category_suggestions": {"hits": 1, "misses": 1, "size": 1}}
+    }
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 
-from ebay_watchlist.db.models import Item
+from ebay_watchlist.db.models import Category, Item, Seller
+from ebay_watchlist.db.repositories import CategoryTreeRepository
 from ebay_watchlist.web.app import create_app
 
 
@@ -18,9 +19,9 @@ def insert_item(
         title=title,
         scraped_category_id=scraped_category_id,
         category_id=category_id,
-        category_name=category_name,
+        category=Category.get_or_create(name=category_name)[0],
         image_url="https://img.example/item.jpg",
-        seller_name=seller_name,
+        seller=Seller.get_or_create(name=seller_name)[0],
         condition="Used",
         shipping_options=[],
         buying_options=["AUCTION"],
@@ -83,6 +84,40 @@ def test_main_category_route_redirects_by_category_name(temp_db):
     assert "main_category=Musical+Instruments" in response.location
 
 
+def test_main_category_route_resolves_leaf_categories_to_their_ancestor(temp_db):
+    CategoryTreeRepository.replace_tree(
+        "EBAY_GB",
+        "3",
+        "1",
+        [
+            {
+                "category_id": 619,
+                "name": "Musical Instruments & DJ Equipment",
+                "parent_id": None,
+                "level": 1,
+                "leaf": False,
+                "path": "Musical Instruments & DJ Equipment",
+            },
+            {
+                "category_id": 33034,
+                "name": "Electric Guitars",
+                "parent_id": 619,
+                "level": 2,
+                "leaf": True,
+                "path": "Musical Instruments & DJ Equipment > Electric Guitars",
+            },
+        ],
+    )
+    client = create_app().test_client()
+
+    response = client.get("/main_category/33034")
+    unknown_response = client.get("/main_category/1")
+
+    assert response.status_code == 302
+    assert "main_category=Musical+Instruments" in response.location
+    assert unknown_response.location.endswith("/")
+
+
 def test_manage_category_suggestions_route_redirects_to_api(temp_db):
     app = create_app()
     client = app.test_client()